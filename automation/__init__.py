@@ -1,12 +1,88 @@
 """Automation package exposing clients for external BPJS applications."""
 
+from .action_script import ActionPlan, ActionScriptError, PlanTrace, compile_script
 from .after import AfterClient
-from .barcode import BarcodeScanner, BarcodeScannerError
+from .app_client import AppClient
+from .barcode import (
+    BarcodeScanner,
+    BarcodeScannerError,
+    CameraStats,
+    FramePreprocessor,
+    ScanCancelledError,
+    ScanMetrics,
+    ScanTimeoutError,
+)
+from .camera import CameraHealth, CameraService, FrameLease
+from .decoders import (
+    BackendScore,
+    DecodedBarcode,
+    DecoderBackend,
+    OpenCVBarcodeBackend,
+    OpenCVQRBackend,
+    PyzbarBackend,
+    select_backend,
+)
+from .frame_gate import FrameGate, GateStats
+from .frame_source import CameraFrameSource, CaptureMode, FrameSource, RecordingFrameSource, ReplayFrameSource
 from .frista import FristaClient
+from .keyboard_wedge import KeyboardWedgeScanner, KeystrokeBurstDetector, WedgeStats
+from .roi import RoiStats, RoiTracker
+from .screen_state import ScreenStateDetector, ScreenStateError, StateMatch
+from .text_input import InjectionStats, TextInjectionError, TextInjector
+from .timing import TimingProfile, TimingProfileStore
+from .validation import ConsensusTracker, InvalidNumberError, classify_number, describe_accepted, validate_number
+from .wait import WaitEngine, WaitStats
 
 __all__ = [
     "AfterClient",
+    "AppClient",
     "FristaClient",
+    "ActionPlan",
+    "ActionScriptError",
+    "PlanTrace",
+    "compile_script",
     "BarcodeScanner",
     "BarcodeScannerError",
+    "CameraStats",
+    "ScanCancelledError",
+    "ScanTimeoutError",
+    "ScanMetrics",
+    "DecodedBarcode",
+    "FramePreprocessor",
+    "CameraHealth",
+    "CameraService",
+    "FrameLease",
+    "FrameGate",
+    "GateStats",
+    "RoiStats",
+    "RoiTracker",
+    "ScreenStateDetector",
+    "ScreenStateError",
+    "StateMatch",
+    "InjectionStats",
+    "TextInjectionError",
+    "TextInjector",
+    "TimingProfile",
+    "TimingProfileStore",
+    "FrameSource",
+    "CameraFrameSource",
+    "CaptureMode",
+    "RecordingFrameSource",
+    "ReplayFrameSource",
+    "KeyboardWedgeScanner",
+    "KeystrokeBurstDetector",
+    "WedgeStats",
+    "BackendScore",
+    "DecoderBackend",
+    "PyzbarBackend",
+    "OpenCVBarcodeBackend",
+    "OpenCVQRBackend",
+    "select_backend",
+    "ConsensusTracker",
+    "InvalidNumberError",
+    "classify_number",
+    "describe_accepted",
+    "validate_number",
+    "WaitEngine",
+    "WaitStats",
 ]
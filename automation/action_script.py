@@ -0,0 +1,339 @@
+"""Declarative key scripts for the login and booking flows.
+
+A script is a list of steps separated by ``;`` or new lines, for example::
+
+    focus; key shift+tab*3 ~; key ctrl+a; type {username}; key tab;
+    type {password}; key tab; submit {submit_key}; check login_failed
+
+``focus``
+    bring the application window to the front
+``type TEXT``
+    type text through the client's :class:`~automation.text_input.TextInjector`
+``key A+B*N ~``
+    press a key or key combination ``N`` times; ``~`` adds the profile's
+    ``field_pause`` after every press
+``pause`` / ``sleep SECONDS``
+    wait ``field_pause`` or a fixed number of seconds
+``submit KEY``
+    press ``KEY`` and wait until the window reacts (flow timeout)
+``wait``
+    wait until the application has processed all input
+``check STATE``
+    fail when the screen-state detector recognises ``STATE``
+
+Any step may end with ``@SECONDS``, its time budget. For ``submit`` and
+``wait`` the budget replaces the flow timeout; other steps that exceed it
+are flagged in the trace. ``{username}``, ``{password}``, ``{submit_key}``
+and ``{number}`` are filled in when the plan runs.
+
+:func:`compile_script` turns the steps into an :class:`ActionPlan`:
+consecutive key presses become one step, consecutive ``type`` steps are
+joined, and a ``focus`` is dropped while the window is still focused.
+"""
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+try:  # pragma: no cover - requires a desktop session
+    import pyautogui  # type: ignore
+except Exception:  # pragma: no cover - headless tooling
+    pyautogui = None  # type: ignore
+
+from . import utils
+from .screen_state import ScreenStateError
+from .text_input import read_focused_field
+
+KeyEvent = Tuple[str, bool]
+
+_BUDGET = re.compile(r"\s*@\s*(\d+(?:\.\d+)?)\s*$")
+_REPEAT = re.compile(r"^(.*?)\s*\*\s*(\d+)$")
+
+# Langkah yang bisa membuat aplikasi membuka jendela atau dialog lain.
+_FOCUS_BREAKING = {"submit", "wait", "sleep"}
+
+# Langkah yang mengirim tombol ke jendela yang sedang aktif.
+_INPUT_STEPS = {"type", "keys", "submit"}
+
+STATE_MESSAGES = {
+    "login_failed": "login ditolak aplikasi",
+    "booking_failed": "nomor ditolak aplikasi",
+}
+
+
+class ActionScriptError(ValueError):
+    """The script text could not be parsed."""
+
+
+@dataclass(frozen=True)
+class Action:
+    kind: str
+    text: str = ""
+    keys: Tuple[KeyEvent, ...] = ()
+    budget: Optional[float] = None
+    source: str = ""
+
+
+@dataclass
+class ActionPlan:
+    """Compiled steps plus what the compiler removed or merged."""
+
+    steps: List[Action]
+    merged: int = 0
+    dropped_focus: int = 0
+
+    def describe(self) -> List[str]:
+        return [step.source for step in self.steps]
+
+
+@dataclass
+class StepTrace:
+    step: str
+    elapsed: float
+    budget: Optional[float] = None
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.elapsed > self.budget
+
+
+@dataclass
+class PlanTrace:
+    """Time spent in every step of one run."""
+
+    steps: List[StepTrace] = field(default_factory=list)
+
+    @property
+    def total_time(self) -> float:
+        return sum(step.elapsed for step in self.steps)
+
+    def format(self) -> str:
+        lines = []
+        for step in self.steps:
+            flag = " (melebihi anggaran)" if step.over_budget else ""
+            lines.append(f"{step.elapsed * 1000:8.1f} ms  {step.step}{flag}")
+        lines.append(f"{self.total_time * 1000:8.1f} ms  total")
+        return "\n".join(lines)
+
+
+def parse_script(text: str) -> List[Action]:
+    actions: List[Action] = []
+    for raw in re.split(r"[;\n]", text):
+        step = raw.strip()
+        if not step:
+            continue
+        budget = None
+        found = _BUDGET.search(step)
+        if found:
+            budget = float(found.group(1))
+            step = step[: found.start()].strip()
+        kind, _, argument = step.partition(" ")
+        kind = kind.lower()
+        argument = argument.strip()
+
+        if kind in ("focus", "pause", "wait"):
+            actions.append(Action(kind, budget=budget, source=step))
+        elif kind == "type" and argument:
+            actions.append(Action("type", text=argument, budget=budget, source=step))
+        elif kind == "key" and argument:
+            actions.append(Action("keys", keys=_parse_keys(argument), budget=budget, source=step))
+        elif kind == "sleep" and argument:
+            try:
+                float(argument)
+            except ValueError:
+                raise ActionScriptError(f"Durasi sleep tidak valid: {step}") from None
+            actions.append(Action("sleep", text=argument, budget=budget, source=step))
+        elif kind in ("submit", "check") and argument:
+            actions.append(Action(kind, text=argument, budget=budget, source=step))
+        else:
+            raise ActionScriptError(f"Langkah skrip tidak dikenal: {step}")
+    return actions
+
+
+def _parse_keys(argument: str) -> Tuple[KeyEvent, ...]:
+    hop = argument.endswith("~")
+    spec = argument.rstrip("~").strip()
+    count = 1
+    repeated = _REPEAT.match(spec)
+    if repeated:
+        spec, count = repeated.group(1).strip(), int(repeated.group(2))
+    if not spec or count < 1:
+        raise ActionScriptError(f"Tombol tidak valid: {argument}")
+    return tuple((spec.lower(), hop) for _ in range(count))
+
+
+def compile_script(text: str) -> ActionPlan:
+    """Parse ``text`` and coalesce it into the smallest equivalent plan."""
+
+    plan = ActionPlan(steps=[])
+    focused = False
+    for action in parse_script(text):
+        previous = plan.steps[-1] if plan.steps else None
+        if action.kind == "focus":
+            if focused:
+                plan.dropped_focus += 1
+                continue
+            focused = True
+        elif action.kind in _FOCUS_BREAKING:
+            focused = False
+
+        if previous is not None and previous.kind == action.kind == "keys":
+            plan.steps[-1] = Action(
+                "keys",
+                keys=previous.keys + action.keys,
+                budget=_add_budgets(previous.budget, action.budget),
+                source=f"{previous.source}; {action.source}",
+            )
+            plan.merged += 1
+            continue
+        if previous is not None and previous.kind == "keys" and action.kind == "pause" and not previous.keys[-1][1]:
+            # Jeda setelah tombol cukup ditandai pada tombol terakhir.
+            keys = previous.keys[:-1] + ((previous.keys[-1][0], True),)
+            plan.steps[-1] = Action(
+                "keys",
+                keys=keys,
+                budget=_add_budgets(previous.budget, action.budget),
+                source=f"{previous.source}; {action.source}",
+            )
+            plan.merged += 1
+            continue
+        if previous is not None and previous.kind == action.kind == "type":
+            plan.steps[-1] = Action(
+                "type",
+                text=previous.text + action.text,
+                budget=_add_budgets(previous.budget, action.budget),
+                source=f"{previous.source}; {action.source}",
+            )
+            plan.merged += 1
+            continue
+        plan.steps.append(action)
+    return plan
+
+
+def _add_budgets(first: Optional[float], second: Optional[float]) -> Optional[float]:
+    if first is None and second is None:
+        return None
+    return (first or 0.0) + (second or 0.0)
+
+
+class PlanRunner:
+    """Execute an :class:`ActionPlan` against a Frista or After client.
+
+    The client provides ``settings``, ``injector``, ``waits``, ``timing``,
+    ``detect_state()``, ``app_name`` and ``confirm_key``.
+    """
+
+    def __init__(self, client: Any) -> None:
+        self.client = client
+
+    def run(
+        self,
+        plan: ActionPlan,
+        values: Mapping[str, str],
+        timeout: float,
+        trace: Optional[PlanTrace] = None,
+    ) -> PlanTrace:
+        """Run every step; ``trace`` is filled as the steps finish, even when one fails."""
+
+        trace = PlanTrace() if trace is None else trace
+        try:
+            for step in plan.steps:
+                started = time.perf_counter()
+                try:
+                    self._run_step(step, values, timeout)
+                finally:
+                    trace.steps.append(StepTrace(step.source, time.perf_counter() - started, step.budget))
+                if step.kind in _FOCUS_BREAKING:
+                    # Aplikasi mungkin membuka dialog; fokus berikutnya diperiksa lagi.
+                    utils.focus_tracker.release()
+        finally:
+            utils.focus_tracker.release()
+        return trace
+
+    def rehearse(self, plan: ActionPlan, values: Mapping[str, str], timeout: float) -> bool:
+        """Run ``plan`` up to its first ``submit`` and read back every typed field.
+
+        Each field is cleared again right after it is read, so nothing is
+        submitted. Fields typed from ``{password}`` usually refuse to be
+        copied; an empty read there only proves focus stayed in the app.
+        """
+
+        verified = True
+        try:
+            for step in plan.steps:
+                if step.kind == "submit":
+                    break
+                self._run_step(step, values, timeout)
+                if step.kind == "type":
+                    masked = "{password}" in step.text
+                    verified = self._read_back(step.text.format_map(_Values(values)), masked) and verified
+        finally:
+            utils.focus_tracker.release()
+        return verified
+
+    def _read_back(self, expected: str, masked: bool) -> bool:
+        text = read_focused_field()
+        pyautogui.hotkey("ctrl", "a")
+        pyautogui.press("backspace")
+        current = utils.foreground_title()
+        if current is not None and self.client.settings.window_title.lower() not in current.lower():
+            return False
+        if text is None or (masked and text == ""):
+            return True
+        return text == expected
+
+    def _run_step(self, step: Action, values: Mapping[str, str], timeout: float) -> None:
+        client = self.client
+        title = client.settings.window_title
+        timing = client.timing
+        if step.kind in _INPUT_STEPS:
+            # Jendela lain (mis. After yang sedang dibuka) bisa merebut fokus di tengah skrip.
+            utils.focus_tracker.confirm(title)
+        if step.kind == "focus":
+            utils.focus_tracker.acquire(title)
+        elif step.kind == "type":
+            client.injector.type_text(step.text.format_map(_Values(values)))
+        elif step.kind == "keys":
+            for combo, hop in step.keys:
+                keys = combo.format_map(_Values(values)).split("+")
+                # Jeda diatur sendiri di sini, bukan oleh pyautogui.PAUSE di setiap panggilan.
+                if len(keys) > 1:
+                    pyautogui.hotkey(*keys, _pause=False)
+                else:
+                    pyautogui.press(keys[0], _pause=False)
+                time.sleep(timing.key_pause + (timing.field_pause if hop else 0.0))
+        elif step.kind == "pause":
+            time.sleep(timing.field_pause)
+        elif step.kind == "sleep":
+            time.sleep(float(step.text))
+        elif step.kind == "submit":
+            snapshot = client.waits.snapshot(title)
+            pyautogui.press(step.text.format_map(_Values(values)), _pause=False)
+            client.waits.after_input(snapshot, title, timeout if step.budget is None else step.budget)
+        elif step.kind == "wait":
+            client.waits.for_responsive(title, timeout if step.budget is None else step.budget)
+        elif step.kind == "check":
+            match = client.detect_state()
+            if match is not None and match.state == step.text:
+                utils.dismiss_popup(client.confirm_key, timing.popup_delay)
+                message = STATE_MESSAGES.get(step.text, f"layar '{step.text}' muncul")
+                raise ScreenStateError(f"{client.app_name}: {message} (skor {match.score:.2f})")
+
+
+class _Values(Dict[str, str]):
+    def __missing__(self, key: str) -> str:
+        raise ActionScriptError(f"Nilai '{{{key}}}' tidak tersedia untuk skrip ini")
+
+
+__all__ = [
+    "Action",
+    "ActionPlan",
+    "ActionScriptError",
+    "PlanRunner",
+    "PlanTrace",
+    "StepTrace",
+    "compile_script",
+    "parse_script",
+]
@@ -1,59 +1,28 @@
 """Automation client for the After application."""
 from __future__ import annotations
 
-import time
 from dataclasses import dataclass
 
-import pyautogui
+from .app_client import AppClient
 
-from config.loader import ApplicationSettings
-from . import utils
-
-
-pyautogui.FAILSAFE = False
-pyautogui.PAUSE = 0.1
+# Urutan bawaan; dapat diganti lewat login_script/booking_script di config.conf.
+DEFAULT_LOGIN_SCRIPT = (
+    "focus; key shift+tab*3 ~; key ctrl+a; type {username}; key tab; "
+    "key ctrl+a; type {password}; key tab; submit {submit_key}; check login_failed"
+)
+DEFAULT_BOOKING_SCRIPT = "focus; type {number}; submit enter; check booking_failed"
 
 
 @dataclass
-class AfterClient:
-    settings: ApplicationSettings
-
-    def launch(self) -> None:
-        utils.launch_application(
-            self.settings.path,
-            self.settings.launch_delay,
-            self.settings.working_dir,
-        )
-        utils.ensure_window_focus(self.settings.window_title)
-
-    def login(self) -> None:
-        utils.ensure_window_focus(self.settings.window_title)
-
-        # Pastikan fokus berada pada input username sebelum mengetik.
-        for _ in range(3):
-            pyautogui.hotkey("shift", "tab")
-            time.sleep(0.05)
-
-        pyautogui.hotkey("ctrl", "a")
-        pyautogui.write(self.settings.username)
-        pyautogui.press("tab")
-
-        pyautogui.hotkey("ctrl", "a")
-        pyautogui.write(self.settings.password)
-        pyautogui.press("tab")
-
-        pyautogui.press(self.settings.submit_key or "enter")
-        time.sleep(1)
-
-    def enter_booking(self, booking_number: str) -> None:
-        utils.ensure_window_focus(self.settings.window_title)
-        pyautogui.write(booking_number)
-        pyautogui.press("enter")
-        time.sleep(0.5)
-
-    def dismiss_warning(self) -> None:
-        """Dismiss username/password popup using Enter."""
-        utils.dismiss_popup("enter")
+class AfterClient(AppClient):
+    """After confirms popups with Enter; its login form does not open on the username field."""
+
+    app_name = "After"
+    app_key = "after"
+    confirm_key = "enter"
+    default_submit_key = "enter"
+    default_login_script = DEFAULT_LOGIN_SCRIPT
+    default_booking_script = DEFAULT_BOOKING_SCRIPT
 
 
 __all__ = ["AfterClient"]
@@ -0,0 +1,191 @@
+"""Shared automation client for Frista and After.
+
+Both applications are driven the same way: launch or attach to the
+process, run the compiled login and booking scripts, and recognise the
+screen they show. :class:`AppClient` implements that once; the
+application modules only provide their defaults (scripts, confirmation
+key, timing profile key).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+try:  # pragma: no cover - requires a desktop session
+    import pyautogui  # type: ignore
+except Exception:  # pragma: no cover - headless tooling (replay/benchmark)
+    pyautogui = None  # type: ignore
+
+from config.loader import ApplicationSettings
+from . import utils
+from .action_script import ActionPlan, PlanRunner, PlanTrace, compile_script
+from .screen_state import POPUP_STATES, ScreenStateDetector, StateMatch
+from .text_input import TextInjector
+from .timing import TimingProfile, TimingProfileStore
+from .wait import WaitEngine
+
+
+if pyautogui is not None:
+    pyautogui.FAILSAFE = False
+
+# Template layar yang menandakan nomor sudah diproses dan aplikasi siap lagi.
+BOOKING_RESULT_STATE = "booking_ok"
+
+# Diketik sebagai pengganti kata sandi asli saat kalibrasi; tidak pernah dikirim.
+REHEARSAL_PASSWORD = "Uji#Kalibrasi1"
+
+
+@dataclass
+class AppClient:
+    settings: ApplicationSettings
+    injector: TextInjector = field(init=False)
+    waits: WaitEngine = field(init=False)
+    timing: TimingProfile = field(init=False)
+    screen: ScreenStateDetector = field(init=False)
+    login_plan: ActionPlan = field(init=False)
+    booking_plan: ActionPlan = field(init=False)
+    last_trace: Optional[PlanTrace] = field(init=False, default=None)
+    _runner: PlanRunner = field(init=False, repr=False)
+
+    # Diisi oleh FristaClient/AfterClient.
+    app_name = ""
+    app_key = ""
+    confirm_key = ""
+    default_submit_key = ""
+    default_login_script = ""
+    default_booking_script = ""
+
+    def __post_init__(self) -> None:
+        self.injector = TextInjector(self.settings.text_input)
+        self.waits = WaitEngine()
+        self.timing = TimingProfileStore(self.settings.timing_profile_path).load(self.app_key)
+        self.screen = ScreenStateDetector.from_settings(self.settings)
+        self.login_plan = compile_script(self.settings.login_script or self.default_login_script)
+        self.booking_plan = compile_script(self.settings.booking_script or self.default_booking_script)
+        self._runner = PlanRunner(self)
+
+    def launch(self) -> None:
+        self.start()
+        self.focus()
+
+    def start(self) -> None:
+        """Start the process and wait for its window without taking keyboard focus."""
+
+        utils.launch_application(self.settings.path, 0, self.settings.working_dir)
+        # launch_delay hanya dipakai bila jendela tidak dapat diamati di mesin ini.
+        self.waits.for_window(
+            self.settings.window_title,
+            self.settings.launch_timeout,
+            fallback=self.settings.launch_delay,
+        )
+
+    def focus(self) -> None:
+        utils.ensure_window_focus(self.settings.window_title)
+
+    def find_running(self) -> Optional[utils.RunningApp]:
+        return utils.find_running_app(self.settings.window_title, self.settings.path)
+
+    def attach(self, running: utils.RunningApp) -> None:
+        """Use an instance that is already running instead of launching a new one.
+
+        Like :meth:`start`, this does not take keyboard focus.
+        """
+
+        if running.hwnd is None:
+            # Proses ada tetapi jendelanya belum muncul (masih memuat).
+            self.waits.for_window(
+                self.settings.window_title,
+                self.settings.launch_timeout,
+                fallback=self.settings.launch_delay,
+            )
+
+    def shows_logged_in(self, running: utils.RunningApp) -> bool:
+        """True when the window title alone proves the session is logged in."""
+
+        marker = self.settings.logged_in_title
+        return bool(marker) and marker in running.title
+
+    def login(self) -> None:
+        self._apply_timing()
+        self.last_trace = PlanTrace()
+        self._runner.run(self.login_plan, self._script_values(), self.settings.login_timeout, self.last_trace)
+
+    def enter_booking(self, booking_number: str) -> None:
+        self._apply_timing()
+        self.last_trace = PlanTrace()
+        self._runner.run(
+            self.booking_plan,
+            self._script_values(number=booking_number),
+            self.settings.booking_timeout,
+            self.last_trace,
+        )
+        if self.screen.is_available:
+            # Peringatan yang bukan kegagalan ditutup agar aplikasi siap menerima nomor berikutnya.
+            self.dismiss_warning()
+
+    def rehearse_login(self) -> bool:
+        """Run :attr:`login_plan` up to its submit step with a test password and verify the fields.
+
+        Every typed field is read back and cleared; nothing is submitted.
+        Used by the timing calibration.
+        """
+
+        self._apply_timing()
+        values = self._script_values(password=REHEARSAL_PASSWORD)
+        return self._runner.rehearse(self.login_plan, values, self.settings.login_timeout)
+
+    def rehearse_booking(self, booking_number: str) -> bool:
+        """Run :attr:`booking_plan` with a test number without pressing its submit key."""
+
+        self._apply_timing()
+        values = self._script_values(number=booking_number)
+        return self._runner.rehearse(self.booking_plan, values, self.settings.booking_timeout)
+
+    def wait_for_booking_result(self, timeout: float) -> bool:
+        """Wait until the screen shows the ``booking_ok`` state.
+
+        Without a ``booking_ok`` template the result cannot be observed and
+        the full ``timeout`` is slept, as the fixed delay did before.
+        """
+
+        def shown() -> Optional[bool]:
+            if not self.screen.is_available or BOOKING_RESULT_STATE not in self.screen.states:
+                return None
+            match = self.detect_state()
+            return match is not None and match.state == BOOKING_RESULT_STATE
+
+        return self.waits.until("booking_result", shown, timeout)
+
+    def detect_state(self) -> Optional[StateMatch]:
+        return self.screen.detect(self.settings.window_title)
+
+    def dismiss_warning(self) -> bool:
+        """Dismiss an error popup with the application's confirmation key.
+
+        With screen templates configured the key is only sent when a popup
+        is actually showing; without them it is sent blindly as before.
+        """
+        if self.screen.is_available:
+            match = self.detect_state()
+            if match is None or match.state not in POPUP_STATES:
+                return False
+        utils.dismiss_popup(self.confirm_key, self.timing.popup_delay)
+        return True
+
+    # ------------------------------------------------------------------
+    def _apply_timing(self) -> None:
+        # PAUSE berlaku global di pyautogui; pengetikan ke Frista/After tidak pernah berjalan bersamaan.
+        if pyautogui is not None:
+            pyautogui.PAUSE = self.timing.key_pause
+
+    def _script_values(self, **extra: str) -> Dict[str, str]:
+        values = {
+            "username": self.settings.username,
+            "password": self.settings.password,
+            "submit_key": self.settings.submit_key or self.default_submit_key,
+        }
+        values.update(extra)
+        return values
+
+
+__all__ = ["AppClient"]
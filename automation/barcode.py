@@ -1,43 +1,372 @@
 """Utility class for scanning BPJS barcodes via a USB camera."""
 from __future__ import annotations
 
+import queue
+import threading
 import time
-from typing import Optional
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
 try:  # pragma: no cover - optional heavy dependency
     import cv2  # type: ignore
 except Exception:  # pragma: no cover - runtime only
     cv2 = None  # type: ignore
 
-try:  # pragma: no cover - optional heavy dependency
-    from pyzbar import pyzbar  # type: ignore
-except Exception:  # pragma: no cover - runtime only
-    pyzbar = None  # type: ignore
+from config.loader import ScannerSettings
+from .camera import CameraHealth, CameraService
+from .decoders import AUTO, BackendScore, DecodedBarcode, DecoderBackend, PyzbarBackend, select_backend
+from .frame_gate import FrameGate, GateStats
+from .frame_source import CameraFrameSource, CaptureMode, FrameSource, RecordingFrameSource, ReplayFrameSource
+from .roi import Rect, RoiStats, RoiTracker, pad_rect
+from .validation import NUMBER_KINDS, ConsensusTracker, classify_number, describe_accepted
 
 
 class BarcodeScannerError(RuntimeError):
     """Base error for barcode scanner failures."""
 
 
+class ScanTimeoutError(BarcodeScannerError):
+    """No acceptable barcode was read before ``scan_timeout`` expired."""
+
+
+class ScanCancelledError(BarcodeScannerError):
+    """The operator (or the application) cancelled a running scan."""
+
+
+PREPROCESS_STAGES = ("grayscale", "contrast", "downscale", "region_retry")
+
+
+@dataclass
+class ScanMetrics:
+    """Timing information collected for a single ``scan()`` call."""
+
+    camera_warm: bool
+    camera_id: Optional[int] = None
+    time_to_first_frame: Optional[float] = None
+    time_to_decode: Optional[float] = None
+    frames_decoded: int = 0
+    frames_captured: int = 0
+    frames_dropped: int = 0
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    gate_stats: Optional[GateStats] = None
+    roi_stats: Optional[RoiStats] = None
+    rejected_reads: int = 0
+
+    def add_stage_time(self, stage: str, elapsed: float) -> None:
+        self.stage_timings[stage] = self.stage_timings.get(stage, 0.0) + elapsed
+
+    @property
+    def skip_ratio(self) -> float:
+        """Share of frames the gate kept away from the decoder."""
+
+        return self.gate_stats.skip_ratio if self.gate_stats is not None else 0.0
+
+    def per_frame_timings(self) -> Dict[str, float]:
+        """Average seconds spent per decoded frame in every pipeline stage."""
+
+        if not self.frames_decoded:
+            return {}
+        return {stage: total / self.frames_decoded for stage, total in self.stage_timings.items()}
+
+
+class FramePreprocessor:
+    """Prepare camera frames for decoding in configurable stages.
+
+    ``grayscale`` drops colour before anything else touches the frame,
+    ``contrast`` applies CLAHE when the frame is dim, ``downscale`` decodes a
+    reduced copy first and ``region_retry`` decodes the full-resolution crop
+    around the most barcode-like area when the reduced pass misses.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[str] = PREPROCESS_STAGES,
+        downscale_width: int = 640,
+        low_light_threshold: float = 70.0,
+        backend: Optional[DecoderBackend] = None,
+    ) -> None:
+        unknown = [stage for stage in stages if stage not in PREPROCESS_STAGES]
+        if unknown:
+            raise ValueError(f"Tahap praproses tidak dikenal: {', '.join(unknown)}")
+        self.stages = frozenset(stages)
+        self.downscale_width = downscale_width
+        self.low_light_threshold = low_light_threshold
+        self.backend = backend or PyzbarBackend()
+        self._clahe: Any = None
+
+    def clone(self) -> "FramePreprocessor":
+        """Return a copy with the same settings and its own decoder instance.
+
+        Decoder objects are not shared between camera threads.
+        """
+
+        return FramePreprocessor(
+            stages=tuple(self.stages),
+            downscale_width=self.downscale_width,
+            low_light_threshold=self.low_light_threshold,
+            backend=type(self.backend)(),
+        )
+
+    def decode(self, frame: Any, metrics: ScanMetrics) -> List[DecodedBarcode]:
+        image = frame
+        if "grayscale" in self.stages and image.ndim == 3:
+            started = time.perf_counter()
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            metrics.add_stage_time("grayscale", time.perf_counter() - started)
+
+        if "contrast" in self.stages and image.ndim == 2:
+            started = time.perf_counter()
+            if float(image.mean()) < self.low_light_threshold:
+                if self._clahe is None:
+                    self._clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+                image = self._clahe.apply(image)
+            metrics.add_stage_time("contrast", time.perf_counter() - started)
+
+        width = image.shape[1]
+        if "downscale" not in self.stages or width <= self.downscale_width:
+            return self._timed_decode(image, metrics, "decode")
+
+        started = time.perf_counter()
+        scale = self.downscale_width / float(width)
+        small = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        metrics.add_stage_time("downscale", time.perf_counter() - started)
+
+        hits = self._timed_decode(small, metrics, "decode_small")
+        if hits:
+            return [DecodedBarcode(hit.data, _scale_rect(hit.rect, 1.0 / scale)) for hit in hits]
+        if "region_retry" not in self.stages:
+            return []
+
+        started = time.perf_counter()
+        region = _find_candidate_region(small)
+        metrics.add_stage_time("region_search", time.perf_counter() - started)
+        if region is None:
+            return []
+        x, y, w, h = pad_rect(_scale_rect(region, 1.0 / scale), 0.15, image.shape)
+        hits = self._timed_decode(image[y : y + h, x : x + w], metrics, "region_retry")
+        return [DecodedBarcode(hit.data, _offset_rect(hit.rect, x, y)) for hit in hits]
+
+    def _timed_decode(self, image: Any, metrics: ScanMetrics, stage: str) -> List[DecodedBarcode]:
+        started = time.perf_counter()
+        hits = self.backend.decode(image)
+        metrics.add_stage_time(stage, time.perf_counter() - started)
+        return hits
+
+
+def _find_candidate_region(gray: Any) -> Optional[Rect]:
+    """Locate the area with the strongest bar-like gradient structure."""
+
+    if gray.ndim == 3:
+        gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+    grad_x = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=-1)
+    grad_y = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=-1)
+    gradient = cv2.convertScaleAbs(cv2.absdiff(cv2.convertScaleAbs(grad_x), cv2.convertScaleAbs(grad_y)))
+    blurred = cv2.blur(gradient, (9, 9))
+    _, thresh = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (21, 7))
+    closed = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+    closed = cv2.dilate(cv2.erode(closed, None, iterations=4), None, iterations=4)
+    contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return None
+    largest = max(contours, key=cv2.contourArea)
+    x, y, w, h = cv2.boundingRect(largest)
+    if w * h < 0.01 * gray.shape[0] * gray.shape[1]:
+        return None
+    return x, y, w, h
+
+
+def _scale_rect(rect: Rect, factor: float) -> Rect:
+    x, y, w, h = rect
+    return int(x * factor), int(y * factor), int(round(w * factor)), int(round(h * factor))
+
+
+def _offset_rect(rect: Rect, dx: int, dy: int) -> Rect:
+    x, y, w, h = rect
+    return x + dx, y + dy, w, h
+
+
+@dataclass
+class CameraStats:
+    """Per-camera counters showing which camera delivers the accepted reads."""
+
+    camera_id: int
+    scans: int = 0
+    hits: int = 0
+    frames_decoded: int = 0
+    decode_time: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.scans if self.scans else 0.0
+
+    @property
+    def average_decode_time(self) -> float:
+        return self.decode_time / self.hits if self.hits else 0.0
+
+
+class _CameraPipeline:
+    """One camera together with the decode state that belongs to its stream."""
+
+    def __init__(
+        self,
+        camera: CameraService,
+        preprocessor: FramePreprocessor,
+        frame_gate: Optional[FrameGate],
+        roi_tracker: Optional[RoiTracker],
+        confirm_frames: int,
+    ) -> None:
+        self.camera = camera
+        self.preprocessor = preprocessor
+        self.frame_gate = frame_gate
+        self.roi_tracker = roi_tracker
+        self.consensus = ConsensusTracker(confirm_frames)
+        self.stats = CameraStats(camera.camera_id)
+        self.metrics = ScanMetrics(camera_warm=False, camera_id=camera.camera_id)
+
+    @property
+    def camera_id(self) -> int:
+        return self.camera.camera_id
+
+
 class BarcodeScanner:
-    """Simple OpenCV-based barcode reader for BPJS cards."""
+    """Simple OpenCV-based barcode reader for BPJS cards.
 
-    def __init__(self, camera_id: int, scan_timeout: float, window_title: str) -> None:
-        self.camera_id = camera_id
+    With more than one entry in ``camera_ids`` every camera is captured and
+    decoded in its own thread; the first validated read wins and the other
+    cameras stop at their next frame.
+    """
+
+    def __init__(
+        self,
+        camera_id: int,
+        scan_timeout: float,
+        window_title: str,
+        keep_warm: bool = True,
+        frame_timeout: float = 3.0,
+        preprocessor: Optional[FramePreprocessor] = None,
+        frame_buffers: int = 3,
+        frame_gate: Optional[FrameGate] = None,
+        roi_tracker: Optional[RoiTracker] = None,
+        source_factory: Optional[Callable[[int], FrameSource]] = None,
+        decoder_scores: Optional[List[BackendScore]] = None,
+        accepted_formats: Sequence[str] = NUMBER_KINDS,
+        confirm_frames: int = 2,
+        camera_ids: Optional[Sequence[int]] = None,
+        scanning: Optional[threading.Event] = None,
+    ) -> None:
+        self.camera_ids: List[int] = list(dict.fromkeys(camera_ids or [camera_id]))
+        self.camera_id = self.camera_ids[0]
         self.scan_timeout = scan_timeout
         self.window_title = window_title
+        self.keep_warm = keep_warm
+        self.frame_timeout = frame_timeout
+        self.preprocessor = preprocessor or FramePreprocessor()
+        self.frame_gate = frame_gate
+        self.roi_tracker = roi_tracker
+        self.decoder_scores: List[BackendScore] = list(decoder_scores or [])
+        self.accepted_formats = tuple(accepted_formats)
+        # Menyala selama scan() berjalan; perekaman sesi hanya menulis frame saat itu.
+        self.scanning = scanning or threading.Event()
+        # Satu event per pemindaian yang berjalan; cancel() tidak hilang karena scan berikutnya.
+        self._active_cancels: Set[threading.Event] = set()
+        self._cancel_lock = threading.Lock()
+        self._winner_lock = threading.Lock()
+        self.last_metrics: Optional[ScanMetrics] = None
+
+        self._pipelines: List[_CameraPipeline] = []
+        for index, cid in enumerate(self.camera_ids):
+            factory = (lambda cid=cid: source_factory(cid)) if source_factory is not None else None
+            camera = CameraService(cid, ring_size=frame_buffers, source_factory=factory)
+            if index == 0:
+                pipeline = _CameraPipeline(camera, self.preprocessor, frame_gate, roi_tracker, confirm_frames)
+            else:
+                # Setiap kamera punya gate, ROI dan dekoder sendiri karena posisinya berbeda.
+                pipeline = _CameraPipeline(
+                    camera,
+                    self.preprocessor.clone(),
+                    (
+                        FrameGate(
+                            frame_gate.min_sharpness,
+                            frame_gate.min_change,
+                            frame_gate.thumbnail_width,
+                            frame_gate.force_every,
+                        )
+                        if frame_gate is not None
+                        else None
+                    ),
+                    RoiTracker(padding=roi_tracker.padding) if roi_tracker is not None else None,
+                    confirm_frames,
+                )
+            self._pipelines.append(pipeline)
+
         self._availability_error: Optional[str] = None
         missing: list[str] = []
         if cv2 is None:
             missing.append("opencv-python")
-        if pyzbar is None:
-            missing.append("pyzbar")
+        backend = self.preprocessor.backend
         if missing:
+            if not backend.is_available and backend.package not in missing:
+                missing.append(backend.package)
             self._availability_error = (
                 "Fitur pemindaian barcode membutuhkan paket "
                 + ", ".join(missing)
                 + ". Jalankan 'pip install -r requirements.txt'."
             )
+        elif self.decoder_scores and not any(score.accuracy > 0 for score in self.decoder_scores):
+            self._availability_error = (
+                "Tidak ada dekoder terpasang yang dapat membaca barcode uji ("
+                + ", ".join(score.name for score in self.decoder_scores)
+                + "). Pasang pyzbar dengan 'pip install -r requirements.txt'."
+            )
+        elif not backend.is_available:
+            # Dekoder yang dipilih eksplisit tidak diganti diam-diam dengan dekoder lain.
+            self._availability_error = (
+                f"Dekoder '{backend.name}' pada konfigurasi tidak tersedia di komputer ini "
+                f"(paket {backend.package}). Pasang paketnya atau ubah opsi decoder."
+            )
+
+    @classmethod
+    def from_settings(cls, settings: ScannerSettings) -> "BarcodeScanner":
+        backend: Optional[DecoderBackend] = None
+        scores: List[BackendScore] = []
+        if cv2 is not None or settings.decoder != AUTO:
+            # Mode 'auto' membandingkan backend terpasang pada korpus bawaan saat aplikasi dimulai.
+            backend, scores = select_backend(settings.decoder)
+        # Rekaman hanya berisi satu aliran frame, jadi pemutaran ulang memakai satu kamera.
+        camera_ids = [settings.camera_id] if settings.replay_path else settings.camera_ids
+        scanning = threading.Event()
+        return cls(
+            camera_id=settings.camera_id,
+            scan_timeout=settings.scan_timeout,
+            window_title=settings.window_title,
+            keep_warm=settings.keep_warm,
+            frame_timeout=settings.frame_timeout,
+            preprocessor=FramePreprocessor(
+                stages=settings.preprocess_stages,
+                downscale_width=settings.downscale_width,
+                low_light_threshold=settings.low_light_threshold,
+                backend=backend,
+            ),
+            frame_buffers=settings.frame_buffers,
+            frame_gate=(
+                FrameGate(
+                    min_sharpness=settings.min_sharpness,
+                    min_change=settings.min_change,
+                    force_every=settings.gate_force_every,
+                )
+                if settings.gate_enabled
+                else None
+            ),
+            roi_tracker=RoiTracker(padding=settings.roi_padding) if settings.roi_tracking else None,
+            source_factory=_source_factory(settings, scanning),
+            decoder_scores=scores,
+            accepted_formats=settings.accepted_formats,
+            confirm_frames=settings.confirm_frames,
+            camera_ids=camera_ids,
+            scanning=scanning,
+        )
 
     # ------------------------------------------------------------------
     @property
@@ -48,49 +377,380 @@ class BarcodeScanner:
     def unavailable_reason(self) -> Optional[str]:
         return self._availability_error
 
+    @property
+    def decoder_name(self) -> str:
+        return self.preprocessor.backend.name
+
+    @property
+    def decoder_warning(self) -> Optional[str]:
+        """Describe decoders ``auto`` skipped and a selected decoder that misses part of the test corpus."""
+
+        if not self.is_available:
+            return None
+        messages: List[str] = []
+        rejected = [score.name for score in self.decoder_scores if score.accuracy <= 0]
+        if rejected:
+            messages.append(f"Dekoder {', '.join(rejected)} tidak dapat membaca barcode uji dan tidak dipakai.")
+        for score in self.decoder_scores:
+            if score.name == self.decoder_name and score.accuracy < 1.0:
+                # Mis. opencv_qr hanya membaca QR, bukan Code 128 pada kartu BPJS.
+                messages.append(
+                    f"Dekoder {score.name} hanya membaca {score.accuracy:.0%} barcode uji; "
+                    "pasang pyzbar agar semua jenis kartu terbaca."
+                )
+        return " ".join(messages) or None
+
+    @property
+    def camera_stats(self) -> List[CameraStats]:
+        """Hit statistics per camera, in the order of ``camera_ids``."""
+
+        return [pipeline.stats for pipeline in self._pipelines]
+
+    # Camera lifecycle -------------------------------------------------
+    def start(self) -> None:
+        """Open the cameras in the background so the first scan is warm."""
+
+        if self.is_available:
+            for pipeline in self._pipelines:
+                pipeline.camera.start()
+
+    def stop(self) -> None:
+        for pipeline in self._pipelines:
+            pipeline.camera.stop()
+
+    def health(self) -> CameraHealth:
+        """Health of the primary (first) camera."""
+
+        return self._pipelines[0].camera.health()
+
+    def camera_health(self) -> Dict[int, CameraHealth]:
+        return {pipeline.camera_id: pipeline.camera.health() for pipeline in self._pipelines}
+
+    def cancel(self) -> None:
+        """Ask every running :meth:`scan` to stop at the next frame.
+
+        A scan started afterwards is not affected; callers that must stop a
+        scan that has not started yet pass their own ``stop_event`` to it.
+        """
+
+        with self._cancel_lock:
+            for cancelled in self._active_cancels:
+                cancelled.set()
+
+    def preview_frame(self, max_width: int) -> Any:
+        """Return a downscaled copy of the primary camera's newest frame, or ``None``.
+
+        The copy is made while the frame is leased, so previewing never
+        blocks capture and never counts as a consumed frame.
+        """
+
+        lease = self._pipelines[0].camera.acquire_latest(0, timeout=0, consume=False)
+        if lease is None:
+            return None
+        with lease:
+            frame = lease.frame
+            width = frame.shape[1]
+            if width <= max_width:
+                return frame.copy()
+            scale = max_width / float(width)
+            return cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
     # ------------------------------------------------------------------
-    def scan(self) -> str:
-        """Scan barcode data from the configured camera."""
+    def scan(self, stop_event: Optional[threading.Event] = None) -> str:
+        """Scan barcode data from the configured camera(s).
+
+        The scan stops with :class:`ScanCancelledError` after :meth:`cancel`
+        or once ``stop_event`` is set, even if it was set before the call.
+        """
 
         if not self.is_available:
             raise BarcodeScannerError(self._availability_error or "Scanner tidak tersedia")
 
-        cap = cv2.VideoCapture(self.camera_id)  # type: ignore[arg-type]
-        if not cap.isOpened():
-            raise BarcodeScannerError(
-                "Kamera barcode tidak dapat dibuka. Pastikan kamera terhubung dan ID sudah benar."
-            )
+        started = time.perf_counter()
+        cancelled = threading.Event()
+        cancel_events = (cancelled,) if stop_event is None else (cancelled, stop_event)
+        finished = threading.Event()
+        with self._cancel_lock:
+            self._active_cancels.add(cancelled)
+            self.scanning.set()
+        try:
+            if len(self._pipelines) == 1:
+                pipeline = self._pipelines[0]
+                try:
+                    return self._scan_camera(pipeline, started, finished, cancel_events)
+                finally:
+                    self.last_metrics = pipeline.metrics
+            return self._scan_concurrently(started, finished, cancel_events)
+        finally:
+            with self._cancel_lock:
+                self._active_cancels.discard(cancelled)
+                if not self._active_cancels:
+                    self.scanning.clear()
 
-        deadline = time.time() + max(self.scan_timeout, 1)
-        last_frame_time = time.time()
+    def decode_image(self, frame: Any) -> Optional[str]:
+        """Run a single still image through the full decode pipeline.
+
+        Gate, ROI, preprocessing and format validation apply exactly as in
+        :meth:`scan`; the image counts as one frame towards ``confirm_frames``.
+        """
+
+        if not self.is_available:
+            raise BarcodeScannerError(self._availability_error or "Scanner tidak tersedia")
+        pipeline = self._pipelines[0]
+        metrics = self._begin_metrics(pipeline, camera_warm=True)
+        self.last_metrics = metrics
+        return self._process_frame(pipeline, frame, metrics, time.perf_counter())
+
+    def scan_source(self, source: FrameSource) -> str:
+        """Decode every frame of ``source`` in order until a barcode is read.
+
+        Unlike :meth:`scan` no frame is dropped and nothing is displayed, which
+        makes recorded sessions reproducible benchmarks.
+        """
+
+        if not self.is_available:
+            raise BarcodeScannerError(self._availability_error or "Scanner tidak tersedia")
+        if not source.open():
+            raise BarcodeScannerError(f"Sumber frame tidak dapat dibuka: {source.description}")
+
+        started = time.perf_counter()
+        pipeline = self._pipelines[0]
+        metrics = self._begin_metrics(pipeline, camera_warm=True)
+        self.last_metrics = metrics
         try:
             while True:
-                ok, frame = cap.read()
-                if not ok:
-                    if time.time() - last_frame_time > 1:
-                        raise BarcodeScannerError("Tidak ada frame dari kamera. Periksa koneksi kamera.")
+                ok, frame = source.read()
+                if not ok or frame is None:
+                    if source.exhausted:
+                        raise BarcodeScannerError(f"Barcode tidak ditemukan pada {source.description}.")
                     continue
-                last_frame_time = time.time()
+                metrics.frames_captured += 1
+                if metrics.time_to_first_frame is None:
+                    metrics.time_to_first_frame = time.perf_counter() - started
+                data = self._process_frame(pipeline, frame, metrics, started)
+                if data:
+                    return data
+        finally:
+            source.release()
 
-                barcodes = pyzbar.decode(frame)
-                if barcodes:
-                    data = barcodes[0].data.decode("utf-8").strip()
-                    if data:
-                        cv2.destroyAllWindows()
-                        return data
+    # ------------------------------------------------------------------
+    def _scan_concurrently(
+        self,
+        started: float,
+        finished: threading.Event,
+        cancel_events: Tuple[threading.Event, ...],
+    ) -> str:
+        results: "queue.Queue[tuple[_CameraPipeline, str, Optional[BaseException]]]" = queue.Queue()
+
+        def worker(pipeline: _CameraPipeline) -> None:
+            try:
+                results.put((pipeline, self._scan_camera(pipeline, started, finished, cancel_events), None))
+            except BaseException as exc:  # diteruskan ke thread pemanggil
+                results.put((pipeline, "", exc))
 
-                cv2.imshow(self.window_title, frame)
-                if cv2.waitKey(1) & 0xFF == ord("q"):
-                    raise BarcodeScannerError("Pemindaian dibatalkan oleh operator (tombol Q).")
+        threads = [
+            threading.Thread(target=worker, args=(pipeline,), name=f"scan-camera-{pipeline.camera_id}", daemon=True)
+            for pipeline in self._pipelines
+        ]
+        for thread in threads:
+            thread.start()
 
-                if time.time() > deadline:
-                    raise BarcodeScannerError("Waktu pemindaian habis. Coba dekatkan barcode dan ulangi.")
+        failures: List[tuple[_CameraPipeline, BaseException]] = []
+        try:
+            for _ in threads:
+                pipeline, data, error = results.get()
+                if error is None:
+                    self.last_metrics = pipeline.metrics
+                    return data
+                failures.append((pipeline, error))
         finally:
-            cap.release()
-            try:
-                cv2.destroyAllWindows()
-            except Exception:  # pragma: no cover - OpenCV cleanup
-                pass
+            finished.set()
+            for thread in threads:
+                thread.join()
+
+        pipeline, error = min(failures, key=lambda item: _failure_rank(item[1]))
+        self.last_metrics = pipeline.metrics
+        raise error
+
+    def _scan_camera(
+        self,
+        pipeline: _CameraPipeline,
+        started: float,
+        finished: threading.Event,
+        cancel_events: Tuple[threading.Event, ...],
+    ) -> str:
+        camera = pipeline.camera
+        baseline = camera.health()
+        metrics = self._begin_metrics(pipeline, camera_warm=baseline.connected)
+        pipeline.stats.scans += 1
+        camera.start()
+
+        deadline = time.monotonic() + max(self.scan_timeout, 1)
+        last_frame_time = time.monotonic()
+        seq = 0
+        try:
+            while True:
+                self._check_cancelled(finished, cancel_events)
+                lease = camera.acquire_latest(seq, timeout=0.1)
+                if lease is None:
+                    if time.monotonic() - last_frame_time > self.frame_timeout:
+                        health = camera.health()
+                        raise BarcodeScannerError(
+                            health.last_error or "Tidak ada frame dari kamera. Periksa koneksi kamera."
+                        )
+                    if time.monotonic() > deadline:
+                        raise self._timeout_error(metrics)
+                    continue
+                last_frame_time = time.monotonic()
+                if metrics.time_to_first_frame is None:
+                    metrics.time_to_first_frame = time.perf_counter() - started
+
+                with lease:
+                    seq = lease.seq
+                    data = self._process_frame(pipeline, lease.frame, metrics, started)
+                if data:
+                    with self._winner_lock:
+                        # Dua kamera bisa mengonfirmasi bersamaan; hanya yang pertama dihitung menang.
+                        self._check_cancelled(finished, cancel_events)
+                        finished.set()
+                        pipeline.stats.hits += 1
+                        pipeline.stats.decode_time += metrics.time_to_decode or 0.0
+                    return data
+
+                if time.monotonic() > deadline:
+                    raise self._timeout_error(metrics)
+        finally:
+            health = camera.health()
+            metrics.frames_captured = health.frames_captured - baseline.frames_captured
+            metrics.frames_dropped = health.frames_dropped - baseline.frames_dropped
+            pipeline.stats.frames_decoded += metrics.frames_decoded
+            if not self.keep_warm:
+                camera.stop()
+
+    def _check_cancelled(self, finished: threading.Event, cancel_events: Tuple[threading.Event, ...]) -> None:
+        if any(event.is_set() for event in cancel_events):
+            raise ScanCancelledError("Pemindaian dibatalkan oleh operator.")
+        if finished.is_set():
+            raise ScanCancelledError("Barcode sudah terbaca oleh kamera lain.")
+
+    def _begin_metrics(self, pipeline: _CameraPipeline, camera_warm: bool) -> ScanMetrics:
+        metrics = ScanMetrics(camera_warm=camera_warm, camera_id=pipeline.camera_id)
+        pipeline.metrics = metrics
+        pipeline.consensus.reset()
+        if pipeline.frame_gate is not None:
+            pipeline.frame_gate.reset()
+            metrics.gate_stats = pipeline.frame_gate.stats
+        if pipeline.roi_tracker is not None:
+            metrics.roi_stats = pipeline.roi_tracker.stats
+        return metrics
+
+    def _process_frame(
+        self, pipeline: _CameraPipeline, frame: Any, metrics: ScanMetrics, started: float
+    ) -> Optional[str]:
+        if not self._passes_gate(pipeline, frame, metrics):
+            return None
+        barcodes = self._decode_frame(pipeline, frame, metrics)
+        metrics.frames_decoded += 1
+        for barcode in barcodes:
+            if self.accepted_formats and classify_number(barcode.data, self.accepted_formats) is None:
+                # Bacaan yang mustahil ditolak di sini agar tidak memicu pengiriman yang pasti gagal.
+                metrics.rejected_reads += 1
+                continue
+            confirmed = pipeline.consensus.feed(barcode.data)
+            if confirmed is not None:
+                metrics.time_to_decode = time.perf_counter() - started
+                return confirmed
+        return None
+
+    def _timeout_error(self, metrics: ScanMetrics) -> ScanTimeoutError:
+        if metrics.rejected_reads:
+            return ScanTimeoutError(
+                f"Barcode terbaca tetapi bukan {describe_accepted(self.accepted_formats)} yang valid."
+            )
+        return ScanTimeoutError("Waktu pemindaian habis. Coba dekatkan barcode dan ulangi.")
+
+    def _decode_frame(self, pipeline: _CameraPipeline, frame: Any, metrics: ScanMetrics) -> List[DecodedBarcode]:
+        """Decode the remembered ROI first and fall back to the full frame."""
+
+        preprocessor = pipeline.preprocessor
+        tracker = pipeline.roi_tracker
+        if tracker is None:
+            return preprocessor.decode(frame, metrics)
+
+        stats = tracker.stats
+        region = tracker.search_region(frame.shape)
+        if region is not None:
+            x, y, w, h = region
+            started = time.perf_counter()
+            hits = preprocessor.decode(frame[y : y + h, x : x + w], metrics)
+            stats.attempts += 1
+            stats.roi_time += time.perf_counter() - started
+            if hits:
+                stats.hits += 1
+                hits = [DecodedBarcode(hit.data, _offset_rect(hit.rect, x, y)) for hit in hits]
+                tracker.update(hits[0].rect)
+                return hits
+
+        started = time.perf_counter()
+        hits = preprocessor.decode(frame, metrics)
+        stats.full_decodes += 1
+        stats.full_time += time.perf_counter() - started
+        if hits:
+            tracker.update(hits[0].rect)
+        return hits
+
+    def _passes_gate(self, pipeline: _CameraPipeline, frame: Any, metrics: ScanMetrics) -> bool:
+        if pipeline.frame_gate is None:
+            return True
+        started = time.perf_counter()
+        passed = pipeline.frame_gate.should_decode(frame, allow_static=pipeline.consensus.pending)
+        metrics.add_stage_time("gate", time.perf_counter() - started)
+        return passed
+
+
+def _failure_rank(error: BaseException) -> int:
+    """Order camera failures so the most useful one is reported to the operator."""
+
+    if isinstance(error, ScanCancelledError):
+        return 0
+    if isinstance(error, ScanTimeoutError):
+        return 1
+    if isinstance(error, BarcodeScannerError):
+        return 2
+    return 3
+
+
+def _source_factory(
+    settings: ScannerSettings,
+    scanning: Optional[threading.Event] = None,
+) -> Optional[Callable[[int], FrameSource]]:
+    if settings.replay_path:
+        replay_path = settings.replay_path
+        return lambda camera_id: ReplayFrameSource(replay_path, realtime=True)
+    mode = CaptureMode.from_settings(settings)
+    if settings.record_path:
+        record_dir = Path(settings.record_path)
+
+        def recording_source(camera_id: int) -> FrameSource:
+            # Setiap sambungan kamera direkam ke berkas baru agar sesi tidak saling menimpa.
+            name = time.strftime(f"scanner-cam{camera_id}-%Y%m%d-%H%M%S.avi")
+            # Kamera yang tetap hangat hanya direkam selama pemindaian agar berkas tidak terus membesar.
+            return RecordingFrameSource(CameraFrameSource(camera_id, mode), record_dir / name, active=scanning)
+
+        return recording_source
+    if not mode.is_default:
+        return lambda camera_id: CameraFrameSource(camera_id, mode)
+    return None
 
 
-__all__ = ["BarcodeScanner", "BarcodeScannerError"]
+__all__ = [
+    "BarcodeScanner",
+    "BarcodeScannerError",
+    "CameraStats",
+    "ScanCancelledError",
+    "ScanTimeoutError",
+    "DecodedBarcode",
+    "FramePreprocessor",
+    "PREPROCESS_STAGES",
+    "ScanMetrics",
+]
@@ -0,0 +1,248 @@
+"""Long-lived camera capture service used by the barcode scanner."""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+try:  # pragma: no cover - optional heavy dependency
+    import cv2  # type: ignore
+except Exception:  # pragma: no cover - runtime only
+    cv2 = None  # type: ignore
+
+from .frame_source import CameraFrameSource, FrameSource
+
+
+@dataclass
+class CameraHealth:
+    """Snapshot of the capture service state for diagnostics."""
+
+    running: bool
+    connected: bool
+    frames_captured: int
+    reconnects: int
+    last_frame_age: Optional[float]
+    last_error: Optional[str]
+    frames_consumed: int = 0
+    frames_dropped: int = 0
+
+
+class FrameLease:
+    """A frame buffer lent to a consumer until :meth:`release` is called.
+
+    The capture thread never writes into a leased slot, so the frame stays
+    intact while it is decoded or displayed.
+    """
+
+    def __init__(self, service: "CameraService", slot: int, seq: int, frame: Any) -> None:
+        self.slot = slot
+        self.seq = seq
+        self.frame = frame
+        self._service = service
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._service._release_slot(self.slot)
+
+    def __enter__(self) -> "FrameLease":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.release()
+
+
+class CameraService:
+    """Keep a camera open and warm in a background thread.
+
+    Opening a USB camera costs seconds of auto-exposure settling, so the
+    service opens the device once, keeps reading frames and exposes the
+    newest one. When the device disappears the thread releases it and keeps
+    retrying until it comes back.
+
+    Frames are captured into a small ring of preallocated buffers with
+    ``cap.read(image)``. Consumers always lease the newest frame; frames that
+    are overwritten before anyone leased them are counted as dropped.
+    """
+
+    def __init__(
+        self,
+        camera_id: int,
+        reconnect_delay: float = 1.0,
+        stale_timeout: float = 1.0,
+        ring_size: int = 3,
+        source_factory: Optional[Callable[[], FrameSource]] = None,
+    ) -> None:
+        self.camera_id = camera_id
+        self.source_factory = source_factory or (lambda: CameraFrameSource(camera_id))
+        self.reconnect_delay = reconnect_delay
+        self.stale_timeout = stale_timeout
+        # Satu slot untuk frame terbaru, satu untuk konsumen, sisanya untuk penulisan berikutnya.
+        self.ring_size = max(ring_size, 3)
+
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        self._buffers: list[Any] = [None] * self.ring_size
+        self._leases = [0] * self.ring_size
+        self._latest_slot: Optional[int] = None
+        self._latest_consumed = True
+        self._frame_seq = 0
+        self._frame_time: Optional[float] = None
+        self._frames_consumed = 0
+        self._frames_dropped = 0
+        self._connected = False
+        self._reconnects = 0
+        self._last_error: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the capture thread if it is not running yet."""
+
+        if cv2 is None:
+            raise RuntimeError("opencv-python diperlukan untuk layanan kamera")
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="camera-service", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the capture thread and release the device."""
+
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    def health(self) -> CameraHealth:
+        with self._condition:
+            age = None if self._frame_time is None else time.monotonic() - self._frame_time
+            return CameraHealth(
+                running=self.is_running,
+                connected=self._connected,
+                frames_captured=self._frame_seq,
+                reconnects=self._reconnects,
+                last_frame_age=age,
+                last_error=self._last_error,
+                frames_consumed=self._frames_consumed,
+                frames_dropped=self._frames_dropped,
+            )
+
+    def acquire_latest(
+        self,
+        after_seq: int = 0,
+        timeout: float = 1.0,
+        consume: bool = True,
+    ) -> Optional[FrameLease]:
+        """Lease the newest fresh frame newer than ``after_seq``.
+
+        Frames older than ``stale_timeout`` are ignored so a scan never
+        decodes an image captured before the camera was unplugged. The
+        returned lease must be released (or used as a context manager).
+        Observers such as the preview pass ``consume=False`` so they do not
+        affect the consumed/dropped counters.
+        """
+
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                slot = self._latest_slot
+                if slot is not None and self._frame_seq > after_seq and self._frame_time is not None:
+                    if time.monotonic() - self._frame_time <= self.stale_timeout:
+                        self._leases[slot] += 1
+                        if consume and not self._latest_consumed:
+                            self._latest_consumed = True
+                            self._frames_consumed += 1
+                        return FrameLease(self, slot, self._frame_seq, self._buffers[slot])
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stop_event.is_set():
+                    return None
+                self._condition.wait(remaining)
+
+    def _release_slot(self, slot: int) -> None:
+        with self._condition:
+            self._leases[slot] = max(self._leases[slot] - 1, 0)
+            self._condition.notify_all()
+
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            source = self.source_factory()
+            if not source.open():
+                source.release()
+                self._set_disconnected("Kamera barcode tidak dapat dibuka. Pastikan kamera terhubung dan ID sudah benar.")
+                self._stop_event.wait(self.reconnect_delay)
+                continue
+
+            with self._condition:
+                self._connected = True
+                self._last_error = None
+            try:
+                self._read_loop(source)
+            finally:
+                source.release()
+
+            if source.exhausted:
+                self._set_disconnected("Rekaman sudah selesai diputar.")
+                break
+            if not self._stop_event.is_set():
+                with self._condition:
+                    self._reconnects += 1
+                self._stop_event.wait(self.reconnect_delay)
+
+        with self._condition:
+            self._connected = False
+            self._condition.notify_all()
+
+    def _read_loop(self, source: FrameSource) -> None:
+        last_ok = time.monotonic()
+        while not self._stop_event.is_set():
+            slot = self._free_slot()
+            ok, frame = source.read(self._buffers[slot])
+            now = time.monotonic()
+            if not ok or frame is None:
+                if source.exhausted or now - last_ok > self.stale_timeout:
+                    self._set_disconnected("Tidak ada frame dari kamera. Periksa koneksi kamera.")
+                    return
+                time.sleep(0.01)
+                continue
+            last_ok = now
+            with self._condition:
+                # OpenCV mengalokasikan ulang bila ukuran frame berubah; simpan buffer barunya.
+                self._buffers[slot] = frame
+                if not self._latest_consumed:
+                    self._frames_dropped += 1
+                self._latest_slot = slot
+                self._latest_consumed = False
+                self._frame_seq += 1
+                self._frame_time = now
+                self._condition.notify_all()
+
+    def _free_slot(self) -> int:
+        with self._condition:
+            while True:
+                for slot in range(self.ring_size):
+                    if slot != self._latest_slot and not self._leases[slot]:
+                        return slot
+                # Semua slot sedang dipinjam konsumen; tunggu salah satunya dilepas.
+                self._condition.wait(0.01)
+
+    def _set_disconnected(self, message: str) -> None:
+        with self._condition:
+            self._connected = False
+            self._last_error = message
+            self._condition.notify_all()
+
+
+__all__ = ["CameraHealth", "CameraService", "FrameLease"]
@@ -0,0 +1,214 @@
+"""Autotune the camera capture mode against a test card.
+
+Each candidate mode is opened on the real camera, given a moment for
+exposure to settle, and then captured and decoded for a fixed duration.
+The mode with the most successful decodes per second of wall time wins:
+a high-resolution mode that only delivers 5 fps can lose to a smaller
+MJPG mode that delivers 30.
+
+    python -m automation.camera_tuning --camera 0 --write
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+try:  # pragma: no cover - optional heavy dependency
+    import cv2  # type: ignore
+except Exception:  # pragma: no cover - runtime only
+    cv2 = None  # type: ignore
+
+from .frame_source import CameraFrameSource, CaptureMode
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .barcode import BarcodeScanner
+
+
+DEFAULT_CANDIDATES = (
+    CaptureMode(),
+    CaptureMode(width=640, height=480, fps=30, fourcc="MJPG"),
+    CaptureMode(width=1280, height=720, fps=30, fourcc="MJPG"),
+    CaptureMode(width=1920, height=1080, fps=30, fourcc="MJPG"),
+    CaptureMode(width=640, height=480, fps=30, fourcc="YUY2"),
+    CaptureMode(width=1280, height=720, fps=10, fourcc="YUY2"),
+)
+
+
+@dataclass
+class ModeResult:
+    """Measured throughput of one capture mode."""
+
+    mode: CaptureMode
+    negotiated: Optional[CaptureMode] = None
+    frames: int = 0
+    decoded: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def capture_fps(self) -> float:
+        return self.frames / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def decode_rate(self) -> float:
+        """Successful decodes per second, capture and decode combined."""
+
+        return self.decoded / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def measure_mode(
+    camera_id: int,
+    mode: CaptureMode,
+    scanner: "BarcodeScanner",
+    duration: float = 4.0,
+    warmup: float = 1.0,
+    expected: Optional[str] = None,
+) -> ModeResult:
+    """Capture and decode for ``duration`` seconds in ``mode``.
+
+    Without ``expected`` any read that passes the scanner's format
+    validation counts as a success.
+    """
+
+    result = ModeResult(mode=mode)
+    source = CameraFrameSource(camera_id, mode)
+    if not source.open():
+        source.release()
+        result.error = f"Kamera {camera_id} tidak dapat dibuka pada mode {mode.label}."
+        return result
+    try:
+        result.negotiated = source.negotiated
+        settle_until = time.monotonic() + warmup
+        while time.monotonic() < settle_until:
+            source.read()
+
+        started = time.perf_counter()
+        deadline = started + duration
+        while time.perf_counter() < deadline:
+            ok, frame = source.read()
+            if not ok or frame is None:
+                continue
+            result.frames += 1
+            data = scanner.decode_image(frame)
+            if data and (expected is None or data == expected):
+                result.decoded += 1
+        result.elapsed = time.perf_counter() - started
+        if not result.frames:
+            result.error = "Kamera tidak mengirim frame pada mode ini."
+    finally:
+        source.release()
+    return result
+
+
+def autotune(
+    camera_id: int,
+    scanner: "BarcodeScanner",
+    candidates: Sequence[CaptureMode] = DEFAULT_CANDIDATES,
+    duration: float = 4.0,
+    expected: Optional[str] = None,
+) -> List[ModeResult]:
+    return [measure_mode(camera_id, mode, scanner, duration=duration, expected=expected) for mode in candidates]
+
+
+def best_result(results: Sequence[ModeResult]) -> Optional[ModeResult]:
+    usable = [result for result in results if result.error is None and result.decoded]
+    if not usable:
+        return None
+    return max(usable, key=lambda result: (result.decode_rate, result.capture_fps))
+
+
+# Command line ---------------------------------------------------------
+def _print_card(path: Path, number: str) -> None:
+    from .synthetic import place_on_card, render_code128
+
+    card = place_on_card(render_code128(number, module_width=3), frame_size=(400, 900))
+    cv2.imwrite(str(path), card)
+    print(f"Kartu uji {number} disimpan ke {path}. Cetak dan arahkan ke kamera selama autotune.")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from config.loader import load_config, update_config
+    from .barcode import BarcodeScanner
+
+    parser = argparse.ArgumentParser(description="Cari mode tangkap kamera dengan laju dekode efektif terbaik.")
+    parser.add_argument("--config", type=Path, default=Path("config.conf"))
+    parser.add_argument("--camera", type=int, help="ID kamera (default: camera_id pada [Scanner])")
+    parser.add_argument("--duration", type=float, default=4.0, help="Lama pengukuran per mode (detik)")
+    parser.add_argument("--expect", help="Nomor pada kartu uji; bila kosong, bacaan valid apa pun dihitung")
+    parser.add_argument("--card", type=Path, help="Simpan gambar kartu uji untuk dicetak lalu keluar")
+    parser.add_argument("--write", action="store_true", help="Simpan mode terbaik ke bagian [Scanner]")
+    args = parser.parse_args(argv)
+
+    if cv2 is None:
+        print("opencv-python diperlukan untuk autotune kamera.")
+        return 1
+    if args.card:
+        from .synthetic import SAMPLE_NUMBERS
+
+        _print_card(args.card, args.expect or SAMPLE_NUMBERS[0])
+        return 0
+
+    settings = load_config(args.config).scanner
+    camera_id = settings.camera_id if args.camera is None else args.camera
+    # Setiap frame dinilai sendiri: tanpa konsensus, gate, maupun ROI lintas frame.
+    scanner = BarcodeScanner.from_settings(
+        dataclasses.replace(
+            settings,
+            confirm_frames=1,
+            gate_enabled=False,
+            roi_tracking=False,
+            replay_path=None,
+            record_path=None,
+        )
+    )
+    if not scanner.is_available:
+        print(scanner.unavailable_reason)
+        return 1
+
+    current = CaptureMode.from_settings(settings)
+    # Fokus dan eksposur yang sudah diatur operator ikut dipakai pada setiap kandidat.
+    candidates = [
+        dataclasses.replace(
+            mode,
+            autofocus=current.autofocus,
+            focus=current.focus,
+            auto_exposure=current.auto_exposure,
+            exposure=current.exposure,
+        )
+        for mode in DEFAULT_CANDIDATES
+    ]
+    if current not in candidates:
+        candidates.insert(0, current)
+
+    print(f"Kamera {camera_id}, dekoder {scanner.decoder_name}")
+    print(f"{'mode':<26} {'hasil':<22} {'fps':>6} {'dekode/dtk':>11}")
+    results = []
+    for mode in candidates:
+        result = measure_mode(camera_id, mode, scanner, duration=args.duration, expected=args.expect)
+        results.append(result)
+        negotiated = result.negotiated.label if result.negotiated else "-"
+        if result.error:
+            print(f"{mode.label:<26} {result.error}")
+        else:
+            print(f"{mode.label:<26} {negotiated:<22} {result.capture_fps:6.1f} {result.decode_rate:11.1f}")
+
+    best = best_result(results)
+    if best is None:
+        print("Tidak ada mode yang berhasil membaca kartu uji. Periksa posisi kartu dan pencahayaan.")
+        return 1
+    print(f"Mode terbaik: {best.mode.label} ({best.decode_rate:.1f} dekode/dtk)")
+    if args.write:
+        update_config(args.config, "Scanner", best.mode.as_config())
+        print(f"Disimpan ke {args.config}")
+    return 0
+
+
+__all__ = ["DEFAULT_CANDIDATES", "ModeResult", "autotune", "best_result", "measure_mode"]
+
+
+if __name__ == "__main__":  # pragma: no cover - manual tool
+    raise SystemExit(main())
@@ -0,0 +1,112 @@
+"""Cheap frame scoring used to skip frames that are unlikely to decode."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+try:  # pragma: no cover - optional heavy dependency
+    import cv2  # type: ignore
+except Exception:  # pragma: no cover - runtime only
+    cv2 = None  # type: ignore
+
+
+@dataclass
+class GateStats:
+    """Counters describing how many frames the gate let through."""
+
+    frames_seen: int = 0
+    passed: int = 0
+    skipped_blur: int = 0
+    skipped_static: int = 0
+    forced: int = 0
+
+    @property
+    def skip_ratio(self) -> float:
+        if not self.frames_seen:
+            return 0.0
+        return (self.skipped_blur + self.skipped_static) / self.frames_seen
+
+
+class FrameGate:
+    """Decide whether a frame is worth handing to the barcode decoder.
+
+    Every frame is reduced to a small grayscale thumbnail. Frames whose
+    Laplacian variance is below ``min_sharpness`` are motion blur, and
+    frames whose mean absolute difference to the last decoded frame is
+    below ``min_change`` show the same scene that already failed to decode.
+    After ``force_every`` skipped frames in a row the next frame is decoded
+    anyway, so a card held perfectly still (or a camera that never reaches
+    ``min_sharpness``) cannot stall the scan; ``0`` disables this.
+    """
+
+    def __init__(
+        self,
+        min_sharpness: float = 60.0,
+        min_change: float = 2.0,
+        thumbnail_width: int = 320,
+        force_every: int = 10,
+    ) -> None:
+        self.min_sharpness = min_sharpness
+        self.min_change = min_change
+        self.thumbnail_width = thumbnail_width
+        self.force_every = force_every
+        self.stats = GateStats()
+        self.last_sharpness: Optional[float] = None
+        self.last_change: Optional[float] = None
+        self._last_decoded: Any = None
+        self._skipped_in_row = 0
+
+    def reset(self) -> None:
+        self.stats = GateStats()
+        self._last_decoded = None
+        self._skipped_in_row = 0
+
+    def should_decode(self, frame: Any, allow_static: bool = False) -> bool:
+        """Score ``frame``; ``allow_static`` skips the scene-change check.
+
+        The scanner sets ``allow_static`` while a read is waiting for
+        confirmation, because the confirming frame is by definition similar.
+        """
+
+        self.stats.frames_seen += 1
+        thumb = self._thumbnail(frame)
+
+        if self.force_every and self._skipped_in_row >= self.force_every:
+            self.stats.forced += 1
+            return self._accept(thumb)
+
+        sharpness = float(cv2.Laplacian(thumb, cv2.CV_32F).var())
+        self.last_sharpness = sharpness
+        if sharpness < self.min_sharpness:
+            self.stats.skipped_blur += 1
+            self._skipped_in_row += 1
+            return False
+
+        if not allow_static and self._last_decoded is not None and self._last_decoded.shape == thumb.shape:
+            change = float(cv2.absdiff(thumb, self._last_decoded).mean())
+            self.last_change = change
+            if change < self.min_change:
+                self.stats.skipped_static += 1
+                self._skipped_in_row += 1
+                return False
+
+        return self._accept(thumb)
+
+    def _accept(self, thumb: Any) -> bool:
+        # Thumbnail bisa berupa frame asli dari ring buffer kamera; simpan salinannya.
+        self._last_decoded = thumb.copy()
+        self._skipped_in_row = 0
+        self.stats.passed += 1
+        return True
+
+    def _thumbnail(self, frame: Any) -> Any:
+        width = frame.shape[1]
+        if width > self.thumbnail_width:
+            scale = self.thumbnail_width / float(width)
+            frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        if frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return frame
+
+
+__all__ = ["FrameGate", "GateStats"]
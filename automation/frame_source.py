@@ -0,0 +1,413 @@
+"""Frame sources for the barcode pipeline: live cameras and recorded sessions."""
+from __future__ import annotations
+
+import abc
+import argparse
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, TextIO, Tuple
+
+try:  # pragma: no cover - optional heavy dependency
+    import cv2  # type: ignore
+except Exception:  # pragma: no cover - runtime only
+    cv2 = None  # type: ignore
+
+from config.loader import ScannerSettings
+
+TIMESTAMP_SUFFIX = ".timestamps"
+
+
+def timestamps_path(video_path: Path | str) -> Path:
+    path = Path(video_path)
+    return path.with_name(path.name + TIMESTAMP_SUFFIX)
+
+
+@dataclass(frozen=True)
+class CaptureMode:
+    """Capture properties requested from the camera driver.
+
+    Zero, empty and ``None`` values leave the driver default untouched.
+    ``fourcc`` matters most: uncompressed YUYV over USB 2 limits larger
+    resolutions to a handful of frames per second, MJPG does not.
+    """
+
+    width: int = 0
+    height: int = 0
+    fps: float = 0.0
+    fourcc: str = ""
+    buffer_size: int = 0
+    autofocus: Optional[bool] = None
+    focus: Optional[float] = None
+    auto_exposure: Optional[bool] = None
+    exposure: Optional[float] = None
+
+    @classmethod
+    def from_settings(cls, settings: ScannerSettings) -> "CaptureMode":
+        return cls(
+            width=settings.frame_width,
+            height=settings.frame_height,
+            fps=settings.capture_fps,
+            fourcc=settings.fourcc,
+            buffer_size=settings.capture_buffer_size,
+            autofocus=settings.autofocus,
+            focus=settings.focus,
+            auto_exposure=settings.auto_exposure,
+            exposure=settings.exposure,
+        )
+
+    @property
+    def is_default(self) -> bool:
+        return self == CaptureMode()
+
+    @property
+    def label(self) -> str:
+        if self.is_default:
+            return "default driver"
+        size = f"{self.width}x{self.height}" if self.width and self.height else "ukuran default"
+        fps = f"@{self.fps:g}" if self.fps else ""
+        return f"{self.fourcc or 'format default'} {size}{fps}"
+
+    def apply(self, cap: Any) -> None:
+        # FOURCC harus diatur sebelum resolusi; sebagian driver menolak ukuran besar pada YUYV.
+        if self.fourcc:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc[:4].ljust(4)))
+        if self.width:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        if self.height:
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if self.fps:
+            cap.set(cv2.CAP_PROP_FPS, self.fps)
+        if self.buffer_size:
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+        if self.autofocus is not None:
+            cap.set(cv2.CAP_PROP_AUTOFOCUS, 1 if self.autofocus else 0)
+        if self.focus is not None:
+            cap.set(cv2.CAP_PROP_FOCUS, self.focus)
+        if self.auto_exposure is not None:
+            # Konvensi DirectShow/OpenCV: 0.75 = otomatis, 0.25 = manual.
+            cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, 0.75 if self.auto_exposure else 0.25)
+        if self.exposure is not None:
+            cap.set(cv2.CAP_PROP_EXPOSURE, self.exposure)
+
+    @classmethod
+    def read_back(cls, cap: Any) -> "CaptureMode":
+        """Return the mode the driver actually negotiated."""
+
+        code = int(cap.get(cv2.CAP_PROP_FOURCC))
+        fourcc = "".join(chr((code >> (8 * index)) & 0xFF) for index in range(4)).strip("\x00 ")
+        return cls(
+            width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=float(cap.get(cv2.CAP_PROP_FPS)),
+            fourcc=fourcc if fourcc.isprintable() else "",
+            buffer_size=int(cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+        )
+
+    def as_config(self) -> dict[str, str]:
+        """Values for the ``[Scanner]`` section of ``config.conf``."""
+
+        def optional(value: Any) -> str:
+            if value is None:
+                return ""
+            if isinstance(value, bool):
+                return "true" if value else "false"
+            return f"{value:g}"
+
+        return {
+            "frame_width": str(self.width),
+            "frame_height": str(self.height),
+            "capture_fps": f"{self.fps:g}",
+            "fourcc": self.fourcc,
+            "capture_buffer_size": str(self.buffer_size),
+            "autofocus": optional(self.autofocus),
+            "focus": optional(self.focus),
+            "auto_exposure": optional(self.auto_exposure),
+            "exposure": optional(self.exposure),
+        }
+
+
+class FrameSource(abc.ABC):
+    """Minimal ``cv2.VideoCapture``-like interface used by :class:`CameraService`."""
+
+    description = "frame source"
+
+    @abc.abstractmethod
+    def open(self) -> bool:
+        ...
+
+    @abc.abstractmethod
+    def read(self, image: Any = None) -> Tuple[bool, Any]:
+        ...
+
+    def release(self) -> None:
+        pass
+
+    @property
+    def exhausted(self) -> bool:
+        """True when the source will never produce another frame."""
+
+        return False
+
+
+class CameraFrameSource(FrameSource):
+    """Live USB camera opened through OpenCV."""
+
+    def __init__(self, camera_id: int, mode: Optional[CaptureMode] = None) -> None:
+        self.camera_id = camera_id
+        self.mode = mode or CaptureMode()
+        self.description = f"kamera {camera_id}"
+        self.negotiated: Optional[CaptureMode] = None
+        self._cap: Any = None
+
+    def open(self) -> bool:
+        self._cap = cv2.VideoCapture(self.camera_id)  # type: ignore[union-attr]
+        if not self._cap.isOpened():
+            return False
+        if not self.mode.is_default:
+            self.mode.apply(self._cap)
+            self.negotiated = CaptureMode.read_back(self._cap)
+            self.description = f"kamera {self.camera_id} ({self.negotiated.label})"
+        return True
+
+    def read(self, image: Any = None) -> Tuple[bool, Any]:
+        if image is not None:
+            return self._cap.read(image)
+        return self._cap.read()
+
+    def release(self) -> None:
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+
+class RecordingFrameSource(FrameSource):
+    """Wrap another source and write every frame to an MJPG video file.
+
+    Capture offsets (seconds since the first frame) are stored one per line
+    in a ``.timestamps`` sidecar so replays keep the original pacing. With
+    ``active`` only frames read while the event is set are written, and the
+    idle time in between is left out of the offsets; a camera kept warm
+    between scans then records the scans only.
+    """
+
+    def __init__(
+        self,
+        inner: FrameSource,
+        path: Path | str,
+        fps: float = 15.0,
+        active: Optional[threading.Event] = None,
+    ) -> None:
+        self.inner = inner
+        self.path = Path(path)
+        self.fps = fps
+        self.active = active
+        self.description = f"{inner.description} (direkam ke {self.path.name})"
+        self._writer: Any = None
+        self._timestamps: Optional[TextIO] = None
+        self._first_frame: Optional[float] = None
+        self._idle_since: Optional[float] = None
+
+    def open(self) -> bool:
+        return self.inner.open()
+
+    def read(self, image: Any = None) -> Tuple[bool, Any]:
+        ok, frame = self.inner.read(image)
+        if self.active is not None and not self.active.is_set():
+            if self._idle_since is None:
+                self._idle_since = time.monotonic()
+            return ok, frame
+        if ok and frame is not None:
+            self._write(frame)
+        return ok, frame
+
+    def release(self) -> None:
+        self.inner.release()
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+        if self._timestamps is not None:
+            self._timestamps.close()
+            self._timestamps = None
+
+    @property
+    def exhausted(self) -> bool:
+        return self.inner.exhausted
+
+    def _write(self, frame: Any) -> None:
+        now = time.monotonic()
+        if self._idle_since is not None:
+            if self._first_frame is not None:
+                # Waktu tanpa pemindaian tidak ikut diputar ulang.
+                self._first_frame += now - self._idle_since
+            self._idle_since = None
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            height, width = frame.shape[:2]
+            fourcc = cv2.VideoWriter_fourcc(*"MJPG")
+            self._writer = cv2.VideoWriter(str(self.path), fourcc, self.fps, (width, height))
+            self._timestamps = timestamps_path(self.path).open("w", encoding="utf-8")
+            self._first_frame = now
+        self._writer.write(frame)
+        assert self._timestamps is not None and self._first_frame is not None
+        self._timestamps.write(f"{now - self._first_frame:.4f}\n")
+
+
+class ReplayFrameSource(FrameSource):
+    """Play back a recorded session in real time or as fast as possible."""
+
+    def __init__(self, path: Path | str, realtime: bool = True, loop: bool = False) -> None:
+        self.path = Path(path)
+        self.realtime = realtime
+        self.loop = loop
+        self.description = f"rekaman {self.path.name}"
+        self._cap: Any = None
+        self._offsets: List[float] = []
+        self._index = 0
+        self._started: Optional[float] = None
+        self._exhausted = False
+
+    def open(self) -> bool:
+        if not self.path.exists():
+            return False
+        self._cap = cv2.VideoCapture(str(self.path))  # type: ignore[union-attr]
+        if not self._cap.isOpened():
+            return False
+        self._offsets = _load_offsets(self.path, self._cap)
+        self._index = 0
+        self._started = None
+        self._exhausted = False
+        return True
+
+    def read(self, image: Any = None) -> Tuple[bool, Any]:
+        if self._cap is None or self._exhausted:
+            return False, None
+        ok, frame = self._cap.read(image) if image is not None else self._cap.read()
+        if not ok:
+            if not self.loop:
+                self._exhausted = True
+                return False, None
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self._index = 0
+            self._started = None
+            ok, frame = self._cap.read(image) if image is not None else self._cap.read()
+            if not ok:
+                self._exhausted = True
+                return False, None
+
+        if self.realtime:
+            offset = self._offset(self._index)
+            if self._started is None:
+                self._started = time.monotonic() - offset
+            delay = self._started + offset - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        self._index += 1
+        return True, frame
+
+    def release(self) -> None:
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+    @property
+    def exhausted(self) -> bool:
+        return self._exhausted
+
+    def _offset(self, index: int) -> float:
+        if index < len(self._offsets):
+            return self._offsets[index]
+        if len(self._offsets) >= 2:
+            step = self._offsets[-1] / (len(self._offsets) - 1)
+            return self._offsets[-1] + step * (index - len(self._offsets) + 1)
+        return 0.0
+
+
+def _load_offsets(video_path: Path, cap: Any) -> List[float]:
+    sidecar = timestamps_path(video_path)
+    if sidecar.exists():
+        with sidecar.open(encoding="utf-8") as handle:
+            return [float(line) for line in handle if line.strip()]
+    # Tanpa berkas timestamp, gunakan FPS video sebagai tempo pemutaran.
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    step = 1.0 / fps if fps and fps > 0 else 1.0 / 15.0
+    return [index * step for index in range(max(frame_count, 0))]
+
+
+# Command line ---------------------------------------------------------
+def _record(args: argparse.Namespace) -> int:
+    source = RecordingFrameSource(CameraFrameSource(args.camera), args.output, fps=args.fps)
+    if not source.open():
+        print(f"Kamera {args.camera} tidak dapat dibuka.")
+        return 1
+    deadline = time.monotonic() + args.duration
+    frames = 0
+    try:
+        while time.monotonic() < deadline:
+            ok, _ = source.read()
+            if ok:
+                frames += 1
+    finally:
+        source.release()
+    print(f"{frames} frame direkam ke {args.output}")
+    return 0
+
+
+def _replay(args: argparse.Namespace) -> int:
+    from config.loader import load_config
+    from .barcode import BarcodeScanner, BarcodeScannerError
+
+    scanner = BarcodeScanner.from_settings(load_config(args.config).scanner)
+    source = ReplayFrameSource(args.recording, realtime=args.realtime)
+    started = time.perf_counter()
+    try:
+        data: Optional[str] = scanner.scan_source(source)
+    except BarcodeScannerError as exc:
+        data = None
+        print(f"Tidak terbaca: {exc}")
+    elapsed = time.perf_counter() - started
+    metrics = scanner.last_metrics
+    print(f"Hasil: {data}")
+    print(f"Waktu total: {elapsed:.3f} dtk")
+    if metrics is not None:
+        print(f"Frame didekode: {metrics.frames_decoded}")
+        for stage, seconds in sorted(metrics.per_frame_timings().items()):
+            print(f"  {stage:<14} {seconds * 1000:8.2f} ms/frame")
+    return 0 if data else 1
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rekam atau putar ulang sesi kamera pemindai barcode.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Rekam sesi kamera ke berkas video")
+    record.add_argument("output", type=Path)
+    record.add_argument("--camera", type=int, default=0)
+    record.add_argument("--duration", type=float, default=30.0)
+    record.add_argument("--fps", type=float, default=15.0)
+    record.set_defaults(handler=_record)
+
+    replay = commands.add_parser("replay", help="Putar ulang rekaman melalui pipeline dekode")
+    replay.add_argument("recording", type=Path)
+    replay.add_argument("--config", type=Path, default=Path("config.conf"))
+    replay.add_argument("--realtime", action="store_true", help="Ikuti tempo rekaman asli")
+    replay.set_defaults(handler=_replay)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+__all__ = [
+    "CaptureMode",
+    "FrameSource",
+    "CameraFrameSource",
+    "RecordingFrameSource",
+    "ReplayFrameSource",
+    "timestamps_path",
+]
+
+
+if __name__ == "__main__":  # pragma: no cover - manual tool
+    raise SystemExit(main())
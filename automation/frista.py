@@ -1,49 +1,25 @@
 """Automation client for the Frista application."""
 from __future__ import annotations
 
-import time
 from dataclasses import dataclass
 
-import pyautogui
+from .app_client import AppClient
 
-from config.loader import ApplicationSettings
-from . import utils
-
-
-pyautogui.FAILSAFE = False
-pyautogui.PAUSE = 0.1
+# Urutan bawaan; dapat diganti lewat login_script/booking_script di config.conf.
+DEFAULT_LOGIN_SCRIPT = "focus; type {username}; key tab; type {password}; key tab; submit {submit_key}; check login_failed"
+DEFAULT_BOOKING_SCRIPT = "focus; type {number}; submit enter; check booking_failed"
 
 
 @dataclass
-class FristaClient:
-    settings: ApplicationSettings
-
-    def launch(self) -> None:
-        utils.launch_application(
-            self.settings.path,
-            self.settings.launch_delay,
-            self.settings.working_dir,
-        )
-        utils.ensure_window_focus(self.settings.window_title)
-
-    def login(self) -> None:
-        utils.ensure_window_focus(self.settings.window_title)
-        pyautogui.write(self.settings.username)
-        pyautogui.press("tab")
-        pyautogui.write(self.settings.password)
-        pyautogui.press("tab")
-        pyautogui.press(self.settings.submit_key or "space")
-        time.sleep(1)
-
-    def enter_booking(self, booking_number: str) -> None:
-        utils.ensure_window_focus(self.settings.window_title)
-        pyautogui.write(booking_number)
-        pyautogui.press("enter")
-        time.sleep(0.5)
-
-    def dismiss_warning(self) -> None:
-        """Dismiss error popup using space as Frista's confirmation key."""
-        utils.dismiss_popup("space")
+class FristaClient(AppClient):
+    """Frista confirms popups with space and opens on the username field."""
+
+    app_name = "Frista"
+    app_key = "frista"
+    confirm_key = "space"
+    default_submit_key = "space"
+    default_login_script = DEFAULT_LOGIN_SCRIPT
+    default_booking_script = DEFAULT_BOOKING_SCRIPT
 
 
 __all__ = ["FristaClient"]
@@ -0,0 +1,380 @@
+"""Input path for handheld USB barcode scanners that act as a keyboard.
+
+A keyboard-wedge scanner "types" the barcode followed by Enter, far faster
+than any person can. :class:`KeystrokeBurstDetector` tells the two apart by
+inter-key timing only, so it can be driven by Tk key events, by a
+low-level Windows keyboard hook, by a dedicated input device, or by a
+simulated keystroke stream.
+"""
+from __future__ import annotations
+
+import ctypes
+import select
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+try:  # pragma: no cover - optional dependency (Linux only)
+    import evdev  # type: ignore
+except Exception:  # pragma: no cover - runtime only
+    evdev = None  # type: ignore
+
+from config.loader import WedgeSettings
+from .validation import NUMBER_KINDS, classify_number, describe_accepted
+
+TERMINATORS = {"enter": "\n", "tab": "\t", "none": ""}
+
+_WH_KEYBOARD_LL = 13
+_WM_KEYDOWN = 0x0100
+_WM_SYSKEYDOWN = 0x0104
+_WM_QUIT = 0x0012
+_LLKHF_INJECTED = 0x10
+
+
+@dataclass
+class WedgeStats:
+    """Counters for keystroke bursts seen by the detector."""
+
+    bursts: int = 0
+    accepted: int = 0
+    rejected_format: int = 0
+    human_sequences: int = 0
+    burst_time: float = 0.0
+
+    @property
+    def average_burst_time(self) -> float:
+        return self.burst_time / self.bursts if self.bursts else 0.0
+
+
+class KeystrokeBurstDetector:
+    """Collect keystrokes and report the ones that arrived as a scanner burst.
+
+    A sequence counts as a burst when it has at least ``min_length``
+    characters and no gap between consecutive keys exceeds ``max_interval``
+    seconds. The burst ends at ``terminator`` or, when the terminator is
+    empty, once :meth:`flush` is called after the keyboard went quiet.
+
+    A key pressed by hand shortly before a burst can still fall within
+    ``max_interval``. Scanners type at a steady rate, so leading keys whose
+    gap is far slower than the rest of the burst are dropped from it.
+    """
+
+    def __init__(self, max_interval: float = 0.05, min_length: int = 8, terminator: str = "\n") -> None:
+        self.max_interval = max_interval
+        self.min_length = max(min_length, 1)
+        self.terminator = terminator
+        self.stats = WedgeStats()
+        self._chars: List[str] = []
+        self._times: List[float] = []
+
+    def reset(self) -> None:
+        self._chars = []
+        self._times = []
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._chars)
+
+    def feed(self, char: str, timestamp: float) -> Optional[str]:
+        """Add one keystroke; return the burst text when ``char`` completes one."""
+
+        if self._times and timestamp - self._times[-1] > self.max_interval:
+            # Jeda terlalu panjang: yang terkumpul sejauh ini adalah ketikan manusia.
+            if not self.terminator and len(self._chars) >= self.min_length:
+                burst = self._finish()
+                self._chars, self._times = [char], [timestamp]
+                return burst
+            self._discard()
+
+        if self.terminator and char == self.terminator:
+            self._trim_leading()
+            if len(self._chars) >= self.min_length:
+                return self._finish()
+            # Enter setelah ketikan biasa: operator mengetik sendiri.
+            self.stats.human_sequences += 1
+            self._discard()
+            return None
+
+        if len(char) != 1 or not char.isprintable():
+            self._discard()
+            return None
+        self._chars.append(char)
+        self._times.append(timestamp)
+        return None
+
+    def flush(self) -> Optional[str]:
+        """End the current sequence; used when the scanner sends no terminator."""
+
+        self._trim_leading()
+        if not self.terminator and len(self._chars) >= self.min_length:
+            return self._finish()
+        self._discard()
+        return None
+
+    # ------------------------------------------------------------------
+    def _trim_leading(self) -> None:
+        gaps = [later - earlier for earlier, later in zip(self._times, self._times[1:])]
+        if len(gaps) < 2:
+            return
+        cadence = sorted(gaps[1:])[len(gaps[1:]) // 2]
+        limit = max(3 * cadence, self.max_interval / 2)
+        while len(self._chars) > self.min_length and gaps and gaps[0] > limit:
+            # Tombol manusia tepat sebelum scanner mulai mengetik.
+            del self._chars[0], self._times[0], gaps[0]
+
+    def _finish(self) -> str:
+        text = "".join(self._chars)
+        self.stats.bursts += 1
+        self.stats.burst_time += self._times[-1] - self._times[0]
+        self.reset()
+        return text
+
+    def _discard(self) -> None:
+        self.reset()
+
+
+class KeyboardWedgeScanner:
+    """Second scanner type next to :class:`BarcodeScanner` for HID scanners.
+
+    Key events are pushed in with :meth:`feed_key`. On Windows :meth:`start`
+    installs a low-level keyboard hook so scans are seen while Frista or
+    After has focus; the digits still reach the focused window. Elsewhere
+    the UI feeds Tk key events, and when ``device`` names an evdev input
+    device the scanner reads it in a background thread and grabs it
+    exclusively, so scanned digits never leak into Frista or After.
+    """
+
+    def __init__(
+        self,
+        max_interval: float = 0.05,
+        min_length: int = 8,
+        terminator: str = "\n",
+        accepted_formats: Sequence[str] = NUMBER_KINDS,
+        device: Optional[str] = None,
+    ) -> None:
+        self.detector = KeystrokeBurstDetector(max_interval, min_length, terminator)
+        self.accepted_formats = tuple(accepted_formats)
+        self.device = device
+        self._scan_callback: Callable[[str], None] = lambda number: None
+        self._rejected_callback: Callable[[str], None] = lambda message: None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._hook_thread_id: Optional[int] = None
+        self._hook_ready = threading.Event()
+        self._hook_error: Optional[str] = None
+        self._flush_timer: Optional[threading.Timer] = None
+
+    @classmethod
+    def from_settings(
+        cls, settings: WedgeSettings, accepted_formats: Sequence[str] = NUMBER_KINDS
+    ) -> "KeyboardWedgeScanner":
+        return cls(
+            max_interval=settings.max_interval,
+            min_length=settings.min_length,
+            terminator=TERMINATORS.get(settings.terminator, "\n"),
+            accepted_formats=accepted_formats,
+            device=settings.device,
+        )
+
+    @property
+    def stats(self) -> WedgeStats:
+        return self.detector.stats
+
+    @property
+    def captures_globally(self) -> bool:
+        """True while keys are read by the hook or device thread instead of the UI."""
+
+        return self._thread is not None and self._thread.is_alive()
+
+    # Callback setters -------------------------------------------------
+    def set_scan_callback(self, callback: Callable[[str], None]) -> None:
+        self._scan_callback = callback
+
+    def set_rejected_callback(self, callback: Callable[[str], None]) -> None:
+        self._rejected_callback = callback
+
+    # Public API ------------------------------------------------------
+    def feed_key(self, char: str, timestamp: float) -> Optional[str]:
+        """Feed one keystroke; returns the validated number when a scan completes."""
+
+        with self._lock:
+            burst = self.detector.feed(char, timestamp)
+        return self._handle_burst(burst)
+
+    def flush(self) -> Optional[str]:
+        with self._lock:
+            burst = self.detector.flush()
+        return self._handle_burst(burst)
+
+    def start(self) -> None:
+        """Start the keyboard hook on Windows, or read the configured input device.
+
+        Raises :class:`RuntimeError` when the hook or device cannot be used;
+        the UI then keeps reading keys from its own window.
+        """
+
+        if self.captures_globally:
+            return
+        if sys.platform == "win32":
+            self._start_thread(self._run_hook, "wedge-hook")
+            self._hook_ready.wait(timeout=2.0)
+            if self._hook_error is not None:
+                self._thread = None
+                raise RuntimeError(self._hook_error)
+            return
+        if not self.device:
+            return
+        if evdev is None:
+            raise RuntimeError("Paket evdev diperlukan untuk membaca perangkat scanner secara langsung")
+        self._start_thread(self._read_device, "wedge-device")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._hook_thread_id is not None:
+            ctypes.windll.user32.PostThreadMessageW(self._hook_thread_id, _WM_QUIT, 0, 0)  # type: ignore[attr-defined]
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    def _start_thread(self, target: Callable[[], None], name: str) -> None:
+        self._stop_event.clear()
+        self._hook_ready.clear()
+        self._hook_error = None
+        self._thread = threading.Thread(target=target, name=name, daemon=True)
+        self._thread.start()
+
+    def _feed_captured(self, char: str, timestamp: float) -> None:
+        """Feed a key read outside Tk; without a terminator the burst is flushed after a quiet gap."""
+
+        self.feed_key(char, timestamp)
+        if self.detector.terminator:
+            return
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        self._flush_timer = threading.Timer(self.detector.max_interval + 0.02, self.flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _handle_burst(self, burst: Optional[str]) -> Optional[str]:
+        if burst is None:
+            return None
+        number = burst.strip()
+        if self.accepted_formats and classify_number(number, self.accepted_formats) is None:
+            self.stats.rejected_format += 1
+            self._rejected_callback(
+                f"Barcode terbaca dari scanner genggam tetapi bukan {describe_accepted(self.accepted_formats)} yang valid."
+            )
+            return None
+        self.stats.accepted += 1
+        self._scan_callback(number)
+        return number
+
+    def _read_device(self) -> None:  # pragma: no cover - hardware only
+        device = evdev.InputDevice(self.device)
+        device.grab()
+        try:
+            while not self._stop_event.is_set():
+                ready, _, _ = select.select([device.fd], [], [], 0.2)
+                if not ready:
+                    continue
+                for event in device.read():
+                    if event.type != evdev.ecodes.EV_KEY or event.value != 1:
+                        continue
+                    char = _evdev_char(evdev.ecodes.KEY.get(event.code))
+                    if char is not None:
+                        self._feed_captured(char, event.timestamp())
+        finally:
+            device.ungrab()
+            device.close()
+
+    def _run_hook(self) -> None:  # pragma: no cover - Windows only
+        from ctypes import wintypes
+
+        user32 = ctypes.WinDLL("user32", use_last_error=True)  # type: ignore[attr-defined]
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)  # type: ignore[attr-defined]
+
+        class KBDLLHOOKSTRUCT(ctypes.Structure):
+            _fields_ = [
+                ("vkCode", wintypes.DWORD),
+                ("scanCode", wintypes.DWORD),
+                ("flags", wintypes.DWORD),
+                ("time", wintypes.DWORD),
+                ("dwExtraInfo", wintypes.WPARAM),
+            ]
+
+        hook_proc_type = ctypes.WINFUNCTYPE(wintypes.LPARAM, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+        user32.SetWindowsHookExW.argtypes = [ctypes.c_int, hook_proc_type, wintypes.HINSTANCE, wintypes.DWORD]
+        user32.SetWindowsHookExW.restype = wintypes.HHOOK
+        user32.CallNextHookEx.argtypes = [wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM]
+        user32.CallNextHookEx.restype = wintypes.LPARAM
+        user32.UnhookWindowsHookEx.argtypes = [wintypes.HHOOK]
+        kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+
+        def on_key(code: int, message: int, data: int) -> int:
+            if code == 0 and message in (_WM_KEYDOWN, _WM_SYSKEYDOWN):
+                info = ctypes.cast(data, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents
+                # Ketikan pyautogui/SendInput dari helper sendiri bukan hasil scanner.
+                if not info.flags & _LLKHF_INJECTED:
+                    char = _virtual_key_char(info.vkCode)
+                    if char is not None:
+                        # Sama dengan event.time Tk: GetTickCount dalam milidetik.
+                        self._feed_captured(char, info.time / 1000.0)
+            return user32.CallNextHookEx(None, code, message, data)
+
+        # Referensi callback harus hidup selama hook terpasang.
+        callback = hook_proc_type(on_key)
+        hook = user32.SetWindowsHookExW(_WH_KEYBOARD_LL, callback, kernel32.GetModuleHandleW(None), 0)
+        if not hook:
+            self._hook_error = f"Hook keyboard Windows tidak dapat dipasang (kode {ctypes.get_last_error()})"
+            self._hook_ready.set()
+            return
+        self._hook_thread_id = kernel32.GetCurrentThreadId()
+        self._hook_ready.set()
+        try:
+            message = wintypes.MSG()
+            while user32.GetMessageW(ctypes.byref(message), None, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(message))
+                user32.DispatchMessageW(ctypes.byref(message))
+        finally:
+            user32.UnhookWindowsHookEx(hook)
+            self._hook_thread_id = None
+
+
+def _virtual_key_char(code: int) -> Optional[str]:
+    if code == 0x0D:
+        return "\n"
+    if code == 0x09:
+        return "\t"
+    if 0x30 <= code <= 0x39:
+        return chr(code)
+    if 0x60 <= code <= 0x69:
+        # Angka pada numpad.
+        return chr(code - 0x30)
+    if 0x41 <= code <= 0x5A:
+        return chr(code).lower()
+    return None
+
+
+def _evdev_char(name: object) -> Optional[str]:
+    if isinstance(name, list):
+        name = name[0]
+    if not isinstance(name, str) or not name.startswith("KEY_"):
+        return None
+    key = name[4:]
+    if key in ("ENTER", "KPENTER"):
+        return "\n"
+    if key == "TAB":
+        return "\t"
+    if key.startswith("KP") and key[2:].isdigit():
+        key = key[2:]
+    if len(key) == 1 and key.isalnum():
+        return key.lower() if key.isalpha() else key
+    return None
+
+
+__all__ = ["KeyboardWedgeScanner", "KeystrokeBurstDetector", "TERMINATORS", "WedgeStats"]
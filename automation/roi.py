@@ -0,0 +1,76 @@
+"""Region-of-interest tracking based on previous barcode locations."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+Rect = Tuple[int, int, int, int]
+
+
+@dataclass
+class RoiStats:
+    """Hit counters and decode timings for ROI-first searching."""
+
+    attempts: int = 0
+    hits: int = 0
+    roi_time: float = 0.0
+    full_decodes: int = 0
+    full_time: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.attempts if self.attempts else 0.0
+
+    @property
+    def estimated_savings(self) -> float:
+        """Seconds saved by ROI hits compared to decoding the full frame."""
+
+        if not self.hits or not self.full_decodes:
+            return 0.0
+        average_full = self.full_time / self.full_decodes
+        average_roi = self.roi_time / self.attempts
+        return max(average_full - average_roi, 0.0) * self.hits
+
+
+class RoiTracker:
+    """Remember where the last barcode was found and suggest a padded crop.
+
+    The tracker outlives individual scans: at a fixed kiosk patients hold the
+    card in roughly the same spot, so the previous location is a good first
+    guess for the next patient too. ``stats`` accumulates over the lifetime
+    of the tracker so the hit rate reflects the kiosk, not a single scan.
+    """
+
+    def __init__(self, padding: float = 0.5) -> None:
+        self.padding = padding
+        self.last_rect: Optional[Rect] = None
+        self.stats = RoiStats()
+
+    def update(self, rect: Rect) -> None:
+        self.last_rect = rect
+
+    def forget(self) -> None:
+        self.last_rect = None
+
+    def search_region(self, shape: Sequence[int]) -> Optional[Rect]:
+        """Return the padded ROI clipped to a frame of ``shape``."""
+
+        if self.last_rect is None:
+            return None
+        region = pad_rect(self.last_rect, self.padding, shape)
+        if region[2] <= 0 or region[3] <= 0:
+            return None
+        return region
+
+
+def pad_rect(rect: Rect, ratio: float, shape: Sequence[int]) -> Rect:
+    """Grow ``rect`` by ``ratio`` of its size on every side, clipped to ``shape``."""
+
+    x, y, w, h = rect
+    pad_x, pad_y = int(w * ratio), int(h * ratio)
+    left, top = max(x - pad_x, 0), max(y - pad_y, 0)
+    right, bottom = min(x + w + pad_x, shape[1]), min(y + h + pad_y, shape[0])
+    return left, top, right - left, bottom - top
+
+
+__all__ = ["Rect", "RoiStats", "RoiTracker", "pad_rect"]
@@ -0,0 +1,80 @@
+"""Check screen-state templates against saved screenshots or the live window.
+
+    python -m automation.screen_check --app frista --save layar.png
+    python -m automation.screen_check --templates templates/frista layar1.png layar2.png
+
+``--save`` stores a capture of the whole application window; crop the
+part that identifies a state from it and save it as ``<state>.png`` in
+the template folder.
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Optional, Sequence
+
+try:  # pragma: no cover - optional heavy dependency
+    import cv2  # type: ignore
+except Exception:  # pragma: no cover - runtime only
+    cv2 = None  # type: ignore
+
+from . import utils
+from .screen_state import ScreenStateDetector
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from config.loader import load_config
+
+    parser = argparse.ArgumentParser(description="Kenali status layar Frista/After dari tangkapan layar.")
+    parser.add_argument("screenshots", nargs="*", type=Path, help="Tangkapan layar seluruh jendela aplikasi")
+    parser.add_argument("--config", type=Path, default=Path("config.conf"))
+    parser.add_argument("--app", choices=("frista", "after"), default="frista")
+    parser.add_argument("--templates", type=Path, help="Folder template (default: state_templates aplikasi)")
+    parser.add_argument("--save", type=Path, help="Simpan tangkapan jendela aplikasi yang sedang terbuka")
+    args = parser.parse_args(argv)
+
+    if cv2 is None:
+        print("opencv-python diperlukan untuk mengenali status layar.")
+        return 1
+    app_settings = getattr(load_config(args.config), args.app)
+    detector = ScreenStateDetector.from_settings(app_settings)
+    if args.templates:
+        detector = ScreenStateDetector(args.templates, detector.region, detector.scale, detector.threshold)
+
+    if args.save:
+        # Bahan template: potong area status dari gambar ini lalu simpan sebagai <status>.png.
+        window = utils.find_window(app_settings.window_title)
+        if window is None:
+            print(f"Jendela '{app_settings.window_title}' tidak ditemukan.")
+            return 1
+        full = ScreenStateDetector(region=None).capture(window)
+        if full is None:
+            print("Tangkapan layar tidak tersedia.")
+            return 1
+        cv2.imwrite(str(args.save), full)
+        print(f"Tangkapan jendela disimpan ke {args.save}")
+
+    if not args.screenshots:
+        return 0
+    if not detector.is_available:
+        print("Tidak ada template status layar yang bisa dimuat.")
+        return 1
+    print(f"Status dikenal: {', '.join(detector.states)}")
+    for path in args.screenshots:
+        image = cv2.imread(str(path))
+        if image is None:
+            print(f"{path}: gambar tidak dapat dibaca")
+            continue
+        match = detector.detect_image(image)
+        if match is None:
+            print(f"{path}: tidak dikenali")
+        else:
+            print(f"{path}: {match.state} (skor {match.score:.2f}, {match.elapsed * 1000:.1f} ms)")
+    return 0
+
+
+__all__ = ["main"]
+
+
+if __name__ == "__main__":  # pragma: no cover - manual tool
+    raise SystemExit(main())
@@ -0,0 +1,183 @@
+"""Recognise what Frista or After is showing from a small part of its window.
+
+Only a configured region of the window is captured. It is converted to
+grayscale, downscaled, and compared with stored template images using
+``cv2.matchTemplate``, which takes tens of milliseconds. Templates live in
+one directory per application; the file name is the state name
+(``login_failed.png``, ``popup.png``, ``booking_ok.png``). Variants of the
+same state use a dotted suffix (``popup.wide.png``).
+
+Saved screenshots can be checked without the application running:
+
+    python -m automation.screen_check --templates templates/frista layar1.png layar2.png
+"""
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple
+
+try:  # pragma: no cover - optional heavy dependency
+    import cv2  # type: ignore
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - runtime only
+    cv2 = None  # type: ignore
+    np = None  # type: ignore
+
+from config.loader import ApplicationSettings
+from . import utils
+
+Region = Tuple[int, int, int, int]
+
+# Status yang berupa popup dan harus ditutup dengan tombol konfirmasi aplikasi.
+POPUP_STATES = ("popup", "login_failed", "booking_failed")
+
+
+class ScreenStateError(RuntimeError):
+    """The application showed a screen that means the action failed."""
+
+
+@dataclass(frozen=True)
+class StateMatch:
+    state: str
+    score: float
+    elapsed: float
+
+
+@dataclass
+class DetectorStats:
+    detections: int = 0
+    matched: int = 0
+    total_time: float = 0.0
+
+    @property
+    def average_time(self) -> float:
+        return self.total_time / self.detections if self.detections else 0.0
+
+
+class ScreenStateDetector:
+    """Match a window region against the templates in ``templates_dir``.
+
+    ``region`` is ``(x, y, width, height)`` relative to the window's top
+    left corner; ``None`` uses the whole window. Templates are cropped from
+    full-size screenshots of the same region and downscaled by ``scale``
+    together with every capture.
+    """
+
+    def __init__(
+        self,
+        templates_dir: Optional[Path | str] = None,
+        region: Optional[Sequence[int]] = None,
+        scale: float = 0.5,
+        threshold: float = 0.85,
+    ) -> None:
+        self.region: Optional[Region] = tuple(region) if region else None  # type: ignore[assignment]
+        self.scale = scale
+        self.threshold = threshold
+        self.stats = DetectorStats()
+        self.templates: List[Tuple[str, Any]] = self._load_templates(Path(templates_dir)) if templates_dir else []
+
+    @classmethod
+    def from_settings(cls, settings: ApplicationSettings) -> "ScreenStateDetector":
+        return cls(
+            templates_dir=settings.state_templates,
+            region=settings.state_region,
+            scale=settings.state_scale,
+            threshold=settings.state_threshold,
+        )
+
+    @property
+    def is_available(self) -> bool:
+        return cv2 is not None and bool(self.templates)
+
+    @property
+    def states(self) -> List[str]:
+        return sorted({state for state, _ in self.templates})
+
+    # Public API ------------------------------------------------------
+    def detect(self, window_title: str) -> Optional[StateMatch]:
+        """Capture the region of the window titled ``window_title`` and recognise it."""
+
+        if not self.is_available:
+            return None
+        window = utils.find_window(window_title)
+        if window is None:
+            return None
+        image = self.capture(window)
+        if image is None:
+            return None
+        return self.detect_image(image, cropped=True)
+
+    def detect_image(self, image: Any, cropped: bool = False) -> Optional[StateMatch]:
+        """Recognise a screenshot of the whole window (or of the region when ``cropped``)."""
+
+        if not self.is_available:
+            return None
+        started = time.perf_counter()
+        if not cropped and self.region is not None:
+            x, y, width, height = self.region
+            image = image[y : y + height, x : x + width]
+        prepared = self._prepare(image)
+
+        best: Optional[Tuple[str, float]] = None
+        for state, template in self.templates:
+            if template.shape[0] > prepared.shape[0] or template.shape[1] > prepared.shape[1]:
+                continue
+            result = cv2.matchTemplate(prepared, template, cv2.TM_CCOEFF_NORMED)
+            score = float(cv2.minMaxLoc(result)[1])
+            if math.isfinite(score) and (best is None or score > best[1]):
+                best = (state, score)
+
+        elapsed = time.perf_counter() - started
+        self.stats.detections += 1
+        self.stats.total_time += elapsed
+        if best is None or best[1] < self.threshold:
+            return None
+        self.stats.matched += 1
+        return StateMatch(best[0], best[1], elapsed)
+
+    # ------------------------------------------------------------------
+    def _prepare(self, image: Any) -> Any:
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        if self.scale != 1.0:
+            width = max(int(image.shape[1] * self.scale), 1)
+            height = max(int(image.shape[0] * self.scale), 1)
+            image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+        return image
+
+    def _load_templates(self, directory: Path) -> List[Tuple[str, Any]]:
+        if cv2 is None or not directory.is_dir():
+            return []
+        templates = []
+        for path in sorted(directory.glob("*.png")):
+            image = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+            if image is None:
+                continue
+            templates.append((path.name.split(".")[0], self._prepare(image)))
+        return templates
+
+    def capture(self, window: Any) -> Any:
+        try:
+            import pyautogui
+        except Exception:  # pragma: no cover - runtime dependency
+            return None
+        try:
+            left, top = int(window.left), int(window.top)
+            if self.region is not None:
+                x, y, width, height = self.region
+                region = (left + x, top + y, width, height)
+            else:
+                region = (left, top, int(window.width), int(window.height))
+            if region[2] <= 0 or region[3] <= 0:
+                return None
+            # Hanya area kecil yang diambil; jauh lebih cepat daripada tangkapan layar penuh.
+            image = pyautogui.screenshot(region=region)
+        except Exception:
+            return None
+        return np.asarray(image.convert("L"))
+
+
+__all__ = ["POPUP_STATES", "DetectorStats", "ScreenStateDetector", "ScreenStateError", "StateMatch"]
@@ -0,0 +1,111 @@
+"""Synthetic BPJS/NIK barcode images for benchmarks and backend selection."""
+from __future__ import annotations
+
+from typing import Any, List, Sequence
+
+try:  # pragma: no cover - optional heavy dependency
+    import cv2  # type: ignore
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - runtime only
+    cv2 = None  # type: ignore
+    np = None  # type: ignore
+
+
+# Lebar bar/spasi Code 128 untuk nilai 0-106 (106 = stop).
+_CODE128_PATTERNS = (
+    "212222", "222122", "222221", "121223", "121322", "131222", "122213", "122312", "132212", "221213",
+    "221312", "231212", "112232", "122132", "122231", "113222", "123122", "123221", "223211", "221132",
+    "221231", "213212", "223112", "312131", "311222", "321122", "321221", "312212", "322112", "322211",
+    "212123", "212321", "232121", "111323", "131123", "131321", "112313", "132113", "132311", "211313",
+    "231113", "231311", "112133", "112331", "132131", "113123", "113321", "133121", "313121", "211331",
+    "231131", "213113", "213311", "213131", "311123", "311321", "331121", "312113", "312311", "332111",
+    "314111", "221411", "431111", "111224", "111422", "121124", "121421", "141122", "141221", "112214",
+    "112412", "122114", "122411", "142112", "142211", "241211", "221114", "413111", "241112", "134111",
+    "111242", "121142", "121241", "114212", "124112", "124211", "411212", "421112", "421211", "212141",
+    "214121", "412121", "111143", "111341", "131141", "114113", "114311", "411113", "411311", "113141",
+    "114131", "311141", "411131", "211412", "211214", "211232", "2331112",
+)
+_START_B = 104
+_START_C = 105
+_CODE_C = 99
+_STOP = 106
+
+SAMPLE_NUMBERS = ("0001234567890", "0002876543219", "3273012501900001", "3174046208850003")
+
+
+def code128_values(data: str) -> List[int]:
+    """Encode a digit string as Code 128 symbol values including check and stop."""
+
+    if not data.isdigit():
+        raise ValueError("Generator sintetis hanya mendukung nomor berisi angka")
+    values: List[int] = []
+    digits = data
+    if len(digits) % 2:
+        # Digit pertama dikodekan di set B agar sisanya bisa dipasangkan di set C.
+        values.extend([_START_B, ord(digits[0]) - 32, _CODE_C])
+        digits = digits[1:]
+    else:
+        values.append(_START_C)
+    values.extend(int(digits[index : index + 2]) for index in range(0, len(digits), 2))
+    checksum = values[0] + sum(position * value for position, value in enumerate(values[1:], start=1))
+    values.extend([checksum % 103, _STOP])
+    return values
+
+
+def render_code128(data: str, module_width: int = 3, height: int = 120, quiet_zone: int = 10) -> Any:
+    """Render ``data`` as a grayscale Code 128 image (white background)."""
+
+    modules: List[int] = [0] * quiet_zone
+    for value in code128_values(data):
+        for index, width in enumerate(_CODE128_PATTERNS[value]):
+            modules.extend([1 if index % 2 == 0 else 0] * int(width))
+    modules.extend([0] * quiet_zone)
+    row = np.where(np.array(modules, dtype=np.uint8) == 1, 0, 255).astype(np.uint8)
+    row = np.repeat(row, module_width)
+    return np.tile(row, (height, 1))
+
+
+def render_qr(data: str, module_size: int = 8, quiet_zone: int = 4) -> Any:
+    """Render ``data`` as a grayscale QR code image."""
+
+    encoded = cv2.QRCodeEncoder.create().encode(data)
+    bordered = cv2.copyMakeBorder(
+        encoded, quiet_zone, quiet_zone, quiet_zone, quiet_zone, cv2.BORDER_CONSTANT, value=255
+    )
+    return cv2.resize(bordered, None, fx=module_size, fy=module_size, interpolation=cv2.INTER_NEAREST)
+
+
+def place_on_card(symbol: Any, frame_size: Sequence[int] = (480, 640), offset: Sequence[int] = (0, 0)) -> Any:
+    """Paste ``symbol`` onto a light-grey BGR frame, centred plus ``offset``."""
+
+    height, width = frame_size
+    canvas = np.full((height, width), 215, dtype=np.uint8)
+    symbol_h, symbol_w = symbol.shape[:2]
+    if symbol_w > width or symbol_h > height:
+        scale = min(width / symbol_w, height / symbol_h) * 0.9
+        symbol = cv2.resize(symbol, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        symbol_h, symbol_w = symbol.shape[:2]
+    top = min(max((height - symbol_h) // 2 + int(offset[0]), 0), height - symbol_h)
+    left = min(max((width - symbol_w) // 2 + int(offset[1]), 0), width - symbol_w)
+    canvas[top : top + symbol_h, left : left + symbol_w] = symbol
+    return cv2.cvtColor(canvas, cv2.COLOR_GRAY2BGR)
+
+
+def builtin_corpus() -> List[tuple[str, Any]]:
+    """Small fixed set of ``(expected, frame)`` pairs used to rank decoders."""
+
+    corpus: List[tuple[str, Any]] = []
+    for number in SAMPLE_NUMBERS:
+        corpus.append((number, place_on_card(render_code128(number))))
+        corpus.append((number, place_on_card(render_qr(number, module_size=6))))
+    return corpus
+
+
+__all__ = [
+    "SAMPLE_NUMBERS",
+    "builtin_corpus",
+    "code128_values",
+    "place_on_card",
+    "render_code128",
+    "render_qr",
+]
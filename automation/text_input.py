@@ -0,0 +1,352 @@
+"""Text injection backends for typing into Frista and After.
+
+``keys`` types one key event per character through pyautogui (the
+original behaviour), ``paste`` puts the text on the clipboard and sends
+Ctrl+V, and ``sendinput`` submits every character as Unicode key events in
+a single Win32 ``SendInput`` call. :class:`TextInjector` tries the
+configured backends in order and falls back when one fails before any
+input reached the target window.
+"""
+from __future__ import annotations
+
+import abc
+import ctypes
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+try:  # pragma: no cover - requires a desktop session
+    import pyautogui  # type: ignore
+except Exception:  # pragma: no cover - headless tooling
+    pyautogui = None  # type: ignore
+
+
+class TextInjectionError(RuntimeError):
+    """A backend could not deliver the text to the focused window.
+
+    ``sent`` is True when some input may already have reached the window;
+    typing the text again with another backend could then duplicate it.
+    """
+
+    def __init__(self, message: str, sent: bool = False) -> None:
+        super().__init__(message)
+        self.sent = sent
+
+
+class InjectionBackend(abc.ABC):
+    """Base class for one way of delivering text to the focused window.
+
+    A backend raises :class:`TextInjectionError` with ``sent=False`` only
+    when nothing was sent; any other exception counts as possibly sent.
+    """
+
+    name = ""
+
+    @property
+    def is_available(self) -> bool:
+        return False
+
+    @abc.abstractmethod
+    def type_text(self, text: str) -> None:
+        ...
+
+
+class KeystrokeBackend(InjectionBackend):
+    """One key event per character through ``pyautogui.write``."""
+
+    name = "keys"
+
+    @property
+    def is_available(self) -> bool:
+        return pyautogui is not None
+
+    def type_text(self, text: str) -> None:
+        pyautogui.write(text)
+
+
+class ClipboardBackend(InjectionBackend):
+    """Paste the text with Ctrl+V and restore the previous clipboard text.
+
+    The clipboard is restored after ``restore_delay`` so the target app has
+    read it; passwords therefore never stay on the clipboard. The paste is
+    handled asynchronously by the target, so a short delay would let it
+    paste the restored text instead.
+    """
+
+    name = "paste"
+
+    def __init__(self, restore_delay: float = 0.3) -> None:
+        self.restore_delay = restore_delay
+
+    @property
+    def is_available(self) -> bool:
+        return sys.platform == "win32" and pyautogui is not None
+
+    def type_text(self, text: str) -> None:
+        previous = _get_clipboard_text()
+        _set_clipboard_text(text)
+        try:
+            pyautogui.hotkey("ctrl", "v")
+            time.sleep(self.restore_delay)
+        finally:
+            try:
+                _set_clipboard_text(previous or "")
+            except TextInjectionError as exc:
+                # Ctrl+V sudah terkirim; teks tidak boleh diketik ulang oleh backend lain.
+                raise TextInjectionError(f"clipboard tidak dapat dipulihkan: {exc}", sent=True) from exc
+
+
+class SendInputBackend(InjectionBackend):
+    """Submit all characters as ``KEYEVENTF_UNICODE`` events in one ``SendInput`` call."""
+
+    name = "sendinput"
+
+    @property
+    def is_available(self) -> bool:
+        return sys.platform == "win32"
+
+    def type_text(self, text: str) -> None:
+        _send_unicode(text)
+
+
+BACKENDS = {
+    KeystrokeBackend.name: KeystrokeBackend,
+    ClipboardBackend.name: ClipboardBackend,
+    SendInputBackend.name: SendInputBackend,
+}
+
+
+@dataclass
+class InjectionStats:
+    """Timing of text injection per backend, including fallbacks."""
+
+    calls: int = 0
+    characters: int = 0
+    total_time: float = 0.0
+    last_time: float = 0.0
+    last_backend: Optional[str] = None
+    fallbacks: int = 0
+    failures: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def average_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def describe(self) -> str:
+        text = (
+            f"input teks {self.last_backend or '-'}: {self.calls} kali, "
+            f"{self.average_time * 1000:.1f} ms rata-rata, {self.fallbacks} fallback"
+        )
+        if self.failures:
+            text += " (gagal: " + ", ".join(f"{name} {count}" for name, count in sorted(self.failures.items())) + ")"
+        return text
+
+
+class TextInjector:
+    """Type text with the first backend in ``backends`` that succeeds."""
+
+    def __init__(self, backends: Sequence[str] = ("keys",)) -> None:
+        unknown = [name for name in backends if name not in BACKENDS]
+        if unknown:
+            raise ValueError(f"Metode input teks tidak dikenal: {', '.join(unknown)}")
+        self.backends: List[InjectionBackend] = [BACKENDS[name]() for name in backends]
+        if not any(backend.name == KeystrokeBackend.name for backend in self.backends):
+            # Pengetikan per tombol selalu menjadi jalan terakhir.
+            self.backends.append(KeystrokeBackend())
+        self.stats = InjectionStats()
+
+    def type_text(self, text: str) -> None:
+        if not text:
+            return
+        started = time.perf_counter()
+        errors: List[str] = []
+        for index, backend in enumerate(self.backends):
+            if not backend.is_available:
+                continue
+            try:
+                backend.type_text(text)
+            except Exception as exc:
+                self.stats.failures[backend.name] = self.stats.failures.get(backend.name, 0) + 1
+                errors.append(f"{backend.name}: {exc}")
+                if not isinstance(exc, TextInjectionError) or exc.sent:
+                    # Sebagian teks mungkin sudah masuk ke kolom; fallback akan menggandakannya.
+                    raise TextInjectionError(
+                        "Teks mungkin sudah sebagian terkirim ke aplikasi (" + "; ".join(errors) + ")",
+                        sent=True,
+                    ) from exc
+                continue
+            elapsed = time.perf_counter() - started
+            self.stats.calls += 1
+            self.stats.characters += len(text)
+            self.stats.total_time += elapsed
+            self.stats.last_time = elapsed
+            self.stats.last_backend = backend.name
+            if errors:
+                self.stats.fallbacks += 1
+            return
+        raise TextInjectionError(
+            "Teks tidak dapat dikirim ke aplikasi" + (f" ({'; '.join(errors)})" if errors else ".")
+        )
+
+
+def read_focused_field() -> Optional[str]:
+    """Text of the focused input field via Ctrl+A/Ctrl+C, or ``None`` when it cannot be read.
+
+    The previous clipboard text is restored afterwards.
+    """
+
+    if sys.platform != "win32" or pyautogui is None:
+        return None
+    try:
+        previous = _get_clipboard_text()
+        _set_clipboard_text("")
+        try:
+            pyautogui.hotkey("ctrl", "a")
+            pyautogui.hotkey("ctrl", "c")
+            time.sleep(0.05)
+            return _get_clipboard_text() or ""
+        finally:
+            _set_clipboard_text(previous or "")
+    except TextInjectionError:
+        return None
+
+
+# Win32 helpers --------------------------------------------------------
+_INPUT_KEYBOARD = 1
+_KEYEVENTF_KEYUP = 0x0002
+_KEYEVENTF_UNICODE = 0x0004
+_CF_UNICODETEXT = 13
+_GMEM_MOVEABLE = 0x0002
+
+_win32: Dict[str, Any] = {}
+
+
+def _user32() -> Any:
+    if "user32" not in _win32:
+        from ctypes import wintypes
+
+        user32 = ctypes.WinDLL("user32", use_last_error=True)  # type: ignore[attr-defined]
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)  # type: ignore[attr-defined]
+        user32.OpenClipboard.argtypes = [wintypes.HWND]
+        user32.GetClipboardData.restype = wintypes.HANDLE
+        user32.SetClipboardData.argtypes = [wintypes.UINT, wintypes.HANDLE]
+        user32.SetClipboardData.restype = wintypes.HANDLE
+        kernel32.GlobalAlloc.argtypes = [wintypes.UINT, ctypes.c_size_t]
+        kernel32.GlobalAlloc.restype = wintypes.HGLOBAL
+        kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]
+        kernel32.GlobalLock.restype = ctypes.c_void_p
+        kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+        _win32["user32"] = user32
+        _win32["kernel32"] = kernel32
+        _win32["input"] = _input_structure(wintypes)
+    return _win32["user32"]
+
+
+def _input_structure(wintypes: Any) -> Any:
+    class KEYBDINPUT(ctypes.Structure):
+        _fields_ = [
+            ("wVk", wintypes.WORD),
+            ("wScan", wintypes.WORD),
+            ("dwFlags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", wintypes.WPARAM),
+        ]
+
+    class MOUSEINPUT(ctypes.Structure):
+        _fields_ = [
+            ("dx", wintypes.LONG),
+            ("dy", wintypes.LONG),
+            ("mouseData", wintypes.DWORD),
+            ("dwFlags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", wintypes.WPARAM),
+        ]
+
+    class _UNION(ctypes.Union):
+        # MOUSEINPUT ikut didefinisikan agar ukuran INPUT sama dengan yang diharapkan Windows.
+        _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT)]
+
+    class INPUT(ctypes.Structure):
+        _fields_ = [("type", wintypes.DWORD), ("union", _UNION)]
+
+    return INPUT
+
+
+def _send_unicode(text: str) -> None:
+    user32 = _user32()
+    input_type = _win32["input"]
+    encoded = text.encode("utf-16-le")
+    units = [int.from_bytes(encoded[index : index + 2], "little") for index in range(0, len(encoded), 2)]
+    events = (input_type * (len(units) * 2))()
+    for index, unit in enumerate(units):
+        for offset, flags in enumerate((_KEYEVENTF_UNICODE, _KEYEVENTF_UNICODE | _KEYEVENTF_KEYUP)):
+            event = events[index * 2 + offset]
+            event.type = _INPUT_KEYBOARD
+            event.union.ki.wScan = unit
+            event.union.ki.dwFlags = flags
+    sent = user32.SendInput(len(events), events, ctypes.sizeof(input_type))
+    if sent != len(events):
+        # Input diblokir thread lain. Blokir UIPI (aplikasi tujuan berjalan sebagai administrator)
+        # tidak terlihat di sini: SendInput tetap melaporkan semua event terkirim.
+        raise TextInjectionError(
+            f"SendInput hanya mengirim {sent} dari {len(events)} event (kode {ctypes.get_last_error()})",
+            sent=sent > 0,
+        )
+
+
+def _open_clipboard(user32: Any) -> None:
+    for _ in range(10):
+        if user32.OpenClipboard(None):
+            return
+        time.sleep(0.01)
+    raise TextInjectionError("Clipboard sedang dipakai aplikasi lain")
+
+
+def _get_clipboard_text() -> Optional[str]:
+    user32 = _user32()
+    kernel32 = _win32["kernel32"]
+    _open_clipboard(user32)
+    try:
+        handle = user32.GetClipboardData(_CF_UNICODETEXT)
+        if not handle:
+            return None
+        pointer = kernel32.GlobalLock(handle)
+        if not pointer:
+            return None
+        try:
+            return ctypes.wstring_at(pointer)
+        finally:
+            kernel32.GlobalUnlock(handle)
+    finally:
+        user32.CloseClipboard()
+
+
+def _set_clipboard_text(text: str) -> None:
+    user32 = _user32()
+    kernel32 = _win32["kernel32"]
+    data = text.encode("utf-16-le") + b"\x00\x00"
+    _open_clipboard(user32)
+    try:
+        user32.EmptyClipboard()
+        handle = kernel32.GlobalAlloc(_GMEM_MOVEABLE, len(data))
+        pointer = kernel32.GlobalLock(handle)
+        ctypes.memmove(pointer, data, len(data))
+        kernel32.GlobalUnlock(handle)
+        if not user32.SetClipboardData(_CF_UNICODETEXT, handle):
+            raise TextInjectionError("Gagal menyalin teks ke clipboard")
+    finally:
+        user32.CloseClipboard()
+
+
+__all__ = [
+    "BACKENDS",
+    "ClipboardBackend",
+    "InjectionBackend",
+    "InjectionStats",
+    "KeystrokeBackend",
+    "SendInputBackend",
+    "TextInjectionError",
+    "TextInjector",
+    "read_focused_field",
+]
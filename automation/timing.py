@@ -0,0 +1,89 @@
+"""Keystroke timing profiles per application and per machine.
+
+The pauses between automated key events used to be global constants
+(``pyautogui.PAUSE = 0.1`` and a few fixed sleeps) guessed once for every
+PC. A :class:`TimingProfile` holds those values for one app, and
+:class:`TimingProfileStore` keeps calibrated profiles in a JSON file keyed
+by host name, so each kiosk uses the fastest timing it proved reliable
+(see :mod:`automation.timing_calibration`).
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True)
+class TimingProfile:
+    """Pauses used while typing into one application; defaults match the old constants."""
+
+    key_pause: float = 0.1
+    field_pause: float = 0.05
+    popup_delay: float = 0.2
+    calibrated_at: Optional[str] = None
+
+    def scaled(self, factor: float) -> "TimingProfile":
+        """Shorter (or longer) key and field pauses; ``popup_delay`` is not calibrated."""
+
+        return TimingProfile(
+            key_pause=round(self.key_pause * factor, 4),
+            field_pause=round(self.field_pause * factor, 4),
+            popup_delay=self.popup_delay,
+        )
+
+    @property
+    def label(self) -> str:
+        return f"tombol {self.key_pause * 1000:.0f} ms, pindah kolom {self.field_pause * 1000:.0f} ms"
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TimingProfile":
+        known = {item.name for item in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+
+def machine_name() -> str:
+    return socket.gethostname().lower()
+
+
+class TimingProfileStore:
+    """JSON file ``{host: {app: profile}}``; ``path=None`` always yields the defaults."""
+
+    def __init__(self, path: Optional[Path | str]) -> None:
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+
+    def load(self, app: str, host: Optional[str] = None) -> TimingProfile:
+        entry = self._read().get(host or machine_name(), {}).get(app)
+        if not isinstance(entry, dict):
+            return TimingProfile()
+        try:
+            return TimingProfile.from_dict(entry)
+        except (TypeError, ValueError):
+            return TimingProfile()
+
+    def save(self, app: str, profile: TimingProfile, host: Optional[str] = None) -> None:
+        if self.path is None:
+            raise ValueError("Lokasi profil timing belum diatur (timing_profile_path)")
+        with self._lock:
+            data = self._read()
+            data.setdefault(host or machine_name(), {})[app] = asdict(profile)
+            temporary = self.path.with_name(self.path.name + ".tmp")
+            temporary.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            os.replace(temporary, self.path)
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        if self.path is None or not self.path.exists():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+
+__all__ = ["TimingProfile", "TimingProfileStore", "machine_name"]
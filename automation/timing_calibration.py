@@ -0,0 +1,149 @@
+"""Find the shortest reliable keystroke timing for Frista or After on this PC.
+
+The compiled login or booking script is rehearsed with progressively
+shorter pauses between key events. Each rehearsal runs the real script up
+to its submit step, with a test password or test number, reads every
+typed field back and clears it again without submitting anything. The
+shortest pauses that pass every repetition are saved as the timing
+profile for this app and this machine.
+
+    python -m automation.timing_calibration --app after --flow login --write
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+from .timing import TimingProfile
+
+# Faktor pengali terhadap profil awal, dari paling aman ke paling cepat.
+DEFAULT_SCALES = (1.0, 0.7, 0.5, 0.3, 0.2, 0.1, 0.0)
+
+
+@dataclass
+class CalibrationStep:
+    """Outcome of the rehearsals with one candidate profile."""
+
+    profile: TimingProfile
+    passed: int = 0
+    failed: int = 0
+    elapsed: List[float] = field(default_factory=list)
+
+    @property
+    def reliable(self) -> bool:
+        return self.failed == 0 and self.passed > 0
+
+    @property
+    def average_time(self) -> float:
+        return sum(self.elapsed) / len(self.elapsed) if self.elapsed else 0.0
+
+
+def calibrate(
+    rehearse: Callable[[TimingProfile], bool],
+    base: TimingProfile = TimingProfile(),
+    repeats: int = 3,
+    scales: Sequence[float] = DEFAULT_SCALES,
+) -> List[CalibrationStep]:
+    """Rehearse every scaled profile ``repeats`` times, stopping at the first unreliable one.
+
+    ``rehearse`` applies the profile, runs the sequence and reports whether
+    the result could be verified.
+    """
+
+    steps: List[CalibrationStep] = []
+    for scale in scales:
+        step = CalibrationStep(base.scaled(scale))
+        steps.append(step)
+        for _ in range(max(repeats, 1)):
+            started = time.perf_counter()
+            try:
+                ok = rehearse(step.profile)
+            except Exception:
+                ok = False
+            step.elapsed.append(time.perf_counter() - started)
+            if ok:
+                step.passed += 1
+            else:
+                step.failed += 1
+                break
+        if not step.reliable:
+            # Jeda yang lebih pendek tidak akan lebih andal; berhenti di sini.
+            break
+    return steps
+
+
+def fastest_reliable(steps: Sequence[CalibrationStep]) -> Optional[TimingProfile]:
+    reliable = [step for step in steps if step.reliable]
+    if not reliable:
+        return None
+    return min(reliable, key=lambda step: (step.profile.key_pause, step.profile.field_pause)).profile
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from config.loader import load_config
+    from .after import AfterClient
+    from .frista import FristaClient
+    from .synthetic import SAMPLE_NUMBERS
+    from .timing import TimingProfileStore
+
+    parser = argparse.ArgumentParser(description="Kalibrasi jeda pengetikan Frista/After untuk PC ini.")
+    parser.add_argument("--config", type=Path, default=Path("config.conf"))
+    parser.add_argument("--app", choices=("frista", "after"), required=True)
+    parser.add_argument(
+        "--flow",
+        choices=("login", "booking"),
+        default="login",
+        help="login: aplikasi harus di layar login; booking: sudah login, kolom nomor aktif",
+    )
+    parser.add_argument("--number", default=SAMPLE_NUMBERS[0], help="Nomor uji untuk alur booking (tidak dikirim)")
+    parser.add_argument("--repeats", type=int, default=3, help="Jumlah pengulangan per kandidat")
+    parser.add_argument("--write", action="store_true", help="Simpan profil tercepat untuk PC ini")
+    args = parser.parse_args(argv)
+
+    if sys.platform != "win32":
+        print("Kalibrasi membutuhkan Windows: hasil ketikan dibaca kembali lewat clipboard.")
+        return 1
+
+    settings = load_config(args.config)
+    app_settings = settings.frista if args.app == "frista" else settings.after
+    client = FristaClient(app_settings) if args.app == "frista" else AfterClient(app_settings)
+    base = client.timing
+
+    def rehearse(profile: TimingProfile) -> bool:
+        client.timing = profile
+        if args.flow == "login":
+            return client.rehearse_login()
+        return client.rehearse_booking(args.number)
+
+    print(f"Kalibrasi {args.app} ({args.flow}), profil awal: {base.label}")
+    steps = calibrate(rehearse, base=TimingProfile(popup_delay=base.popup_delay), repeats=args.repeats)
+    for step in steps:
+        status = "andal" if step.reliable else "gagal"
+        print(f"{step.profile.label:<36} {status:<6} {step.average_time * 1000:8.0f} ms/percobaan")
+    client.timing = base
+
+    best = fastest_reliable(steps)
+    if best is None:
+        print("Tidak ada profil yang andal. Pastikan jendela aplikasi berada di layar yang benar.")
+        return 1
+    best = dataclasses.replace(best, calibrated_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+    print(f"Tercepat yang andal: {best.label}")
+    if args.write:
+        if not app_settings.timing_profile_path:
+            print("Isi timing_profile_path pada konfigurasi untuk menyimpan profil.")
+            return 1
+        TimingProfileStore(app_settings.timing_profile_path).save(args.app, best)
+        print(f"Profil disimpan ke {app_settings.timing_profile_path}")
+    return 0
+
+
+__all__ = ["CalibrationStep", "DEFAULT_SCALES", "calibrate", "fastest_reliable"]
+
+
+if __name__ == "__main__":  # pragma: no cover - manual tool
+    raise SystemExit(main())
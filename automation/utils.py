@@ -3,10 +3,14 @@ from __future__ import annotations
 
 import os
 import socket
+import sys
+import threading
 import time
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
 
-from contextlib import closing
+from contextlib import closing, contextmanager
 
 try:
     import pygetwindow as gw  # type: ignore
@@ -14,6 +18,14 @@ except ImportError:  # pragma: no cover - optional dependency
     gw = None  # type: ignore
 
 
+_WM_NULL = 0x0000
+_SMTO_ABORTIFHUNG = 0x0002
+
+
+class FocusLostError(RuntimeError):
+    """Another window took the keyboard and the target could not be focused again."""
+
+
 class NetworkUnavailableError(ConnectionError):
     """Error raised when the required network connection is unavailable."""
 
@@ -53,6 +65,98 @@ def launch_application(executable_path: str, delay: float, working_dir: str | No
         time.sleep(delay)
 
 
+@dataclass
+class RegistryStats:
+    """Lookup counters of :class:`WindowRegistry`."""
+
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    enumeration_time: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class WindowRegistry:
+    """Cache of resolved window objects per ``window_title``.
+
+    ``gw.getWindowsWithTitle`` enumerates every top-level window on the
+    desktop. The registry keeps the window found last time and only checks
+    that its handle still exists (``IsWindow``) and that its title still
+    matches; a full enumeration happens only when the cached window is gone.
+    The title match is a case-insensitive substring match, so the helper's
+    own windows (whose title names both apps) are never returned.
+    """
+
+    def __init__(self) -> None:
+        self.stats = RegistryStats()
+        self._windows: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, title: str) -> Any:
+        """Return the cached window for ``title`` or resolve it again."""
+
+        if not title or gw is None:
+            return None
+        with self._lock:
+            window = self._windows.get(title)
+        if window is not None:
+            if _window_still_valid(window, title):
+                self.stats.hits += 1
+                return window
+            self.invalidate(title)
+        return self._resolve(title)
+
+    def remember(self, title: str, window: Any) -> None:
+        with self._lock:
+            self._windows[title] = window
+
+    def invalidate(self, title: str) -> None:
+        with self._lock:
+            if self._windows.pop(title, None) is not None:
+                self.stats.invalidations += 1
+
+    def enumerate(self, title: str) -> List[Any]:
+        self.stats.misses += 1
+        started = time.perf_counter()
+        try:
+            return [window for window in gw.getWindowsWithTitle(title) if not _is_own_window(window)]
+        finally:
+            self.stats.enumeration_time += time.perf_counter() - started
+
+    def _resolve(self, title: str) -> Any:
+        windows = self.enumerate(title)
+        if not windows:
+            return None
+        self.remember(title, windows[0])
+        return windows[0]
+
+
+def _is_own_window(window: Any) -> bool:
+    # Judul helper "APM BPJS - Otomasi Frista & After" memuat judul kedua aplikasi.
+    return window_process_id(window) == os.getpid()
+
+
+def _window_still_valid(window: Any, title: str) -> bool:
+    hwnd = getattr(window, "_hWnd", None)
+    try:
+        if hwnd is not None and sys.platform == "win32":
+            import ctypes
+
+            if not ctypes.windll.user32.IsWindow(hwnd):  # type: ignore[attr-defined]
+                return False
+        # Handle Windows dapat dipakai ulang oleh jendela lain; judulnya harus tetap cocok.
+        return title in window.title
+    except Exception:
+        return False
+
+
+window_registry = WindowRegistry()
+
+
 def focus_window(title: str) -> bool:
     """Attempt to focus a window by its title."""
     if not title:
@@ -60,26 +164,289 @@ def focus_window(title: str) -> bool:
     if gw is None:
         return False
 
-    windows = gw.getWindowsWithTitle(title)
-    for window in windows:
-        try:
-            if window.isMinimized:
-                window.restore()
-            window.activate()
+    cached = window_registry.lookup(title)
+    if cached is not None and _activate(cached):
+        return True
+
+    # Jendela tersimpan tidak bisa diaktifkan: coba semua jendela yang cocok seperti sebelumnya.
+    window_registry.invalidate(title)
+    for window in window_registry.enumerate(title):
+        if _activate(window):
+            window_registry.remember(title, window)
             return True
-        except Exception:
-            continue
     return False
 
 
-def ensure_window_focus(title: str, timeout: float = 5.0, poll_interval: float = 0.5) -> bool:
-    """Repeatedly try to focus a window until timeout."""
-    end = time.time() + timeout
-    while time.time() < end:
-        if focus_window(title):
+def _activate(window: Any) -> bool:
+    try:
+        if window.isMinimized:
+            window.restore()
+        window.activate()
+        return True
+    except Exception:
+        return False
+
+
+def find_window(title: str) -> Any:
+    """Return the first top-level window whose title contains ``title``, or ``None``."""
+
+    return window_registry.lookup(title)
+
+
+@dataclass
+class RunningApp:
+    """An application instance that is already running on this machine."""
+
+    pid: Optional[int]
+    hwnd: Optional[int]
+    title: str = ""
+
+
+def window_process_id(window: Any) -> Optional[int]:
+    hwnd = getattr(window, "_hWnd", None)
+    if hwnd is None or sys.platform != "win32":
+        return None
+    import ctypes
+    from ctypes import wintypes
+
+    pid = wintypes.DWORD()
+    ctypes.windll.user32.GetWindowThreadProcessId(wintypes.HWND(hwnd), ctypes.byref(pid))  # type: ignore[attr-defined]
+    return int(pid.value) or None
+
+
+def find_process(executable_path: str) -> Optional[int]:
+    """PID of a running process started from ``executable_path`` (matched by file name)."""
+
+    if sys.platform != "win32":
+        return None
+    import csv
+    import subprocess
+
+    image = Path(os.path.expandvars(executable_path)).name
+    try:
+        output = subprocess.run(
+            ["tasklist", "/FI", f"IMAGENAME eq {image}", "/NH", "/FO", "CSV"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    for row in csv.reader(output.splitlines()):
+        if len(row) > 1 and row[0].lower() == image.lower() and row[1].isdigit():
+            return int(row[1])
+    return None
+
+
+def find_running_app(window_title: str, executable_path: str) -> Optional[RunningApp]:
+    """Detect an instance by its window first, then by its process."""
+
+    window = find_window(window_title)
+    if window is not None:
+        return RunningApp(
+            pid=window_process_id(window),
+            hwnd=getattr(window, "_hWnd", None),
+            title=str(getattr(window, "title", "")),
+        )
+    pid = find_process(executable_path)
+    if pid is not None:
+        return RunningApp(pid=pid, hwnd=None)
+    return None
+
+
+def foreground_title() -> Optional[str]:
+    """Title of the current foreground window, or ``None`` when it cannot be read.
+
+    The helper's own windows yield ``""``: they must never count as Frista or After.
+    """
+
+    if gw is None:
+        return None
+    try:
+        window = gw.getActiveWindow()
+    except Exception:
+        return None
+    if window is None or _is_own_window(window):
+        return ""
+    return window.title
+
+
+def is_window_responsive(window: Any, timeout: float = 0.1) -> Optional[bool]:
+    """Ask the window's UI thread to process ``WM_NULL``.
+
+    The call only returns once the application has handled all earlier
+    input, so a ``True`` result means it finished reacting to our keys.
+    Returns ``None`` outside Windows.
+    """
+
+    hwnd = getattr(window, "_hWnd", None)
+    if hwnd is None or sys.platform != "win32":
+        return None
+    import ctypes
+    from ctypes import wintypes
+
+    result = wintypes.DWORD()
+    sent = ctypes.windll.user32.SendMessageTimeoutW(  # type: ignore[attr-defined]
+        wintypes.HWND(hwnd),
+        _WM_NULL,
+        0,
+        0,
+        _SMTO_ABORTIFHUNG,
+        int(timeout * 1000),
+        ctypes.byref(result),
+    )
+    return bool(sent)
+
+
+def capture_window(window: Any) -> Any:
+    """Screenshot of the window area as a small grayscale array, or ``None``."""
+
+    try:
+        import pyautogui
+        import numpy as np  # type: ignore
+    except Exception:  # pragma: no cover - runtime dependency
+        return None
+    try:
+        region = (int(window.left), int(window.top), int(window.width), int(window.height))
+        if region[2] <= 0 or region[3] <= 0:
+            return None
+        image = pyautogui.screenshot(region=region)
+    except Exception:
+        return None
+    # Perkecil 4x: cukup untuk mendeteksi perubahan layar dan jauh lebih murah dibandingkan.
+    return np.asarray(image.convert("L").reduce(4), dtype=np.int16)
+
+
+@dataclass
+class FocusStats:
+    """Counters of :class:`FocusTracker`."""
+
+    requests: int = 0
+    switches: int = 0
+    already_focused: int = 0
+    batched: int = 0
+    stolen: int = 0
+    switch_time: float = 0.0
+
+    @property
+    def avoided(self) -> int:
+        """Focus requests answered without enumerating or activating any window."""
+
+        return self.already_focused + self.batched
+
+
+class FocusTracker:
+    """Skip focus switches when the target window already has the keyboard.
+
+    :meth:`ensure` first compares the foreground window handle with the
+    window cached in the registry, which costs microseconds, and only calls
+    ``activate()`` when another window is in front. Inside :meth:`batch`
+    (or after :meth:`acquire`) repeated requests for the same title return
+    immediately until :meth:`release` is called, for example after a key
+    that may open a dialog.
+
+    A batch opened with ``verify=True`` is for moments when another app may
+    bring up its window, such as a parallel launch; :meth:`confirm` then
+    checks the foreground window before every input step.
+    """
+
+    def __init__(self, registry: WindowRegistry) -> None:
+        self.registry = registry
+        self.stats = FocusStats()
+        self._held: Optional[str] = None
+        self._verify = False
+
+    def ensure(self, title: str, timeout: float = 5.0, poll_interval: float = 0.5) -> bool:
+        self.stats.requests += 1
+        if title and self._held == title:
+            self.stats.batched += 1
             return True
-        time.sleep(poll_interval)
-    return False
+        if self.is_foreground(title):
+            self.stats.already_focused += 1
+            return True
+
+        self._held = None
+        started = time.perf_counter()
+        end = time.time() + timeout
+        try:
+            while time.time() < end:
+                if focus_window(title):
+                    self.stats.switches += 1
+                    return True
+                time.sleep(poll_interval)
+            return False
+        finally:
+            self.stats.switch_time += time.perf_counter() - started
+
+    def is_foreground(self, title: str) -> bool:
+        if not title or gw is None:
+            return False
+        foreground = _foreground_hwnd()
+        window = self.registry.lookup(title)
+        if foreground is not None and window is not None and getattr(window, "_hWnd", None) is not None:
+            return window._hWnd == foreground
+        if foreground is not None and window is None:
+            # Aplikasi belum punya jendela; apa pun yang di depan bukan aplikasi tersebut.
+            return False
+        current = foreground_title()
+        return current is not None and title in current
+
+    def acquire(self, title: str) -> bool:
+        """Focus ``title`` once and treat later requests for it as satisfied."""
+
+        if not self.ensure(title):
+            return False
+        self._held = title
+        return True
+
+    def confirm(self, title: str) -> None:
+        """Make sure ``title`` still has the keyboard before input is sent to it.
+
+        Only checks inside a ``verify=True`` batch; a window that took the
+        focus is pushed back behind ``title`` once. Raises
+        :class:`FocusLostError` when that fails.
+        """
+
+        if not self._verify or not title or self.is_foreground(title):
+            return
+        self.stats.stolen += 1
+        held = self._held
+        self._held = None
+        if not self.ensure(title):
+            raise FocusLostError(f"Jendela '{title}' kehilangan fokus keyboard dan tidak dapat diaktifkan lagi")
+        self._held = held
+
+    def release(self) -> None:
+        self._held = None
+
+    @contextmanager
+    def batch(self, title: str, verify: bool = False) -> Iterator[bool]:
+        """Run several operations against one app under a single focus acquisition."""
+
+        self._verify = verify
+        try:
+            yield self.acquire(title)
+        finally:
+            self._verify = False
+            self.release()
+
+
+def _foreground_hwnd() -> Optional[int]:
+    if sys.platform != "win32":
+        return None
+    import ctypes
+
+    return ctypes.windll.user32.GetForegroundWindow() or None  # type: ignore[attr-defined]
+
+
+focus_tracker = FocusTracker(window_registry)
+
+
+def ensure_window_focus(title: str, timeout: float = 5.0, poll_interval: float = 0.5) -> bool:
+    """Repeatedly try to focus a window until timeout; no-op when it is already in front."""
+
+    return focus_tracker.ensure(title, timeout, poll_interval)
 
 
 def dismiss_popup(key: str, delay: float = 0.2) -> None:
@@ -95,10 +462,25 @@ def dismiss_popup(key: str, delay: float = 0.2) -> None:
 
 
 __all__ = [
+    "FocusLostError",
     "NetworkUnavailableError",
     "ensure_internet_connection",
     "launch_application",
+    "RegistryStats",
+    "WindowRegistry",
+    "window_registry",
+    "RunningApp",
+    "find_process",
+    "find_running_app",
+    "window_process_id",
+    "FocusStats",
+    "FocusTracker",
+    "focus_tracker",
     "focus_window",
+    "find_window",
+    "foreground_title",
+    "is_window_responsive",
+    "capture_window",
     "ensure_window_focus",
     "dismiss_popup",
 ]
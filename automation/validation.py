@@ -0,0 +1,128 @@
+"""Format validation for BPJS card numbers and NIK, plus multi-frame consensus."""
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional
+
+BPJS = "bpjs"
+NIK = "nik"
+NUMBER_KINDS = (BPJS, NIK)
+
+# Kode provinsi Dukcapil yang valid sebagai dua digit pertama NIK.
+_PROVINCE_CODES = frozenset(
+    {
+        11, 12, 13, 14, 15, 16, 17, 18, 19, 21,
+        31, 32, 33, 34, 35, 36,
+        51, 52, 53,
+        61, 62, 63, 64, 65,
+        71, 72, 73, 74, 75, 76,
+        81, 82,
+        91, 92, 93, 94, 95, 96,
+    }
+)
+
+
+class InvalidNumberError(ValueError):
+    """Raised when a scanned or typed number is not a plausible BPJS/NIK."""
+
+
+def is_valid_bpjs(value: str) -> bool:
+    """Nomor kartu BPJS/JKN: tepat 13 digit."""
+
+    return len(value) == 13 and value.isdigit()
+
+
+def is_valid_nik(value: str) -> bool:
+    """NIK: 16 digit ``PPKKCC DDMMYY SSSS`` dengan kode wilayah dan tanggal lahir yang masuk akal.
+
+    Untuk perempuan, tanggal lahir ditambah 40 sehingga hari bernilai 41-71.
+    """
+
+    if len(value) != 16 or not value.isdigit():
+        return False
+    province, regency, district = int(value[0:2]), int(value[2:4]), int(value[4:6])
+    day, month = int(value[6:8]), int(value[8:10])
+    serial = int(value[12:16])
+    if province not in _PROVINCE_CODES or regency == 0 or district == 0:
+        return False
+    if day > 40:
+        day -= 40
+    return 1 <= day <= 31 and 1 <= month <= 12 and serial > 0
+
+
+def classify_number(value: str, accepted: Iterable[str] = NUMBER_KINDS) -> Optional[str]:
+    """Return ``"bpjs"`` or ``"nik"`` when ``value`` is a valid number of an accepted kind."""
+
+    accepted = set(accepted)
+    if BPJS in accepted and is_valid_bpjs(value):
+        return BPJS
+    if NIK in accepted and is_valid_nik(value):
+        return NIK
+    return None
+
+
+_KIND_LABELS = {BPJS: "nomor BPJS (13 digit)", NIK: "NIK (16 digit)"}
+
+
+def describe_accepted(accepted: Iterable[str] = NUMBER_KINDS) -> str:
+    """Operator wording for the accepted kinds, e.g. ``"nomor BPJS (13 digit) atau NIK (16 digit)"``."""
+
+    labels = [_KIND_LABELS[kind] for kind in NUMBER_KINDS if kind in set(accepted)]
+    return " atau ".join(labels or [_KIND_LABELS[kind] for kind in NUMBER_KINDS])
+
+
+def validate_number(value: str, accepted: Iterable[str] = NUMBER_KINDS) -> str:
+    """Return the kind of ``value`` or raise :class:`InvalidNumberError` with an operator message.
+
+    The message only mentions the kinds in ``accepted``; an empty
+    ``accepted`` means every kind.
+    """
+
+    accepted = tuple(accepted) or NUMBER_KINDS
+    expected = describe_accepted(accepted)
+    value = value.strip()
+    if not value.isdigit():
+        raise InvalidNumberError(f"Isi {expected} hanya dengan angka.")
+    kind = classify_number(value, accepted)
+    if kind is not None:
+        return kind
+    if len(value) == 16 and NIK in accepted:
+        raise InvalidNumberError("NIK tidak valid. Periksa kode wilayah dan tanggal lahir pada NIK.")
+    raise InvalidNumberError(f"Nomor tidak valid. Yang diterima: {expected}.")
+
+
+class ConsensusTracker:
+    """Accept a read only after ``required`` frames agreed on the same value."""
+
+    def __init__(self, required: int = 2) -> None:
+        self.required = max(required, 1)
+        self._counts: Dict[str, int] = {}
+
+    def reset(self) -> None:
+        self._counts.clear()
+
+    @property
+    def pending(self) -> bool:
+        """True while at least one candidate is waiting for confirmation."""
+
+        return bool(self._counts)
+
+    def feed(self, value: str) -> Optional[str]:
+        count = self._counts.get(value, 0) + 1
+        self._counts[value] = count
+        if count >= self.required:
+            return value
+        return None
+
+
+__all__ = [
+    "BPJS",
+    "NIK",
+    "NUMBER_KINDS",
+    "ConsensusTracker",
+    "InvalidNumberError",
+    "classify_number",
+    "describe_accepted",
+    "is_valid_bpjs",
+    "is_valid_nik",
+    "validate_number",
+]
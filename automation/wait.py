@@ -0,0 +1,176 @@
+"""Condition-based waits that replace fixed sleeps in the automation clients.
+
+Every wait polls a readiness condition (window exists, window responsive,
+foreground title matches, window contents changed) and returns as soon as
+it holds. When a condition cannot be observed on this machine (no
+pygetwindow, not Windows, screenshots unavailable) the engine sleeps the
+old fixed delay instead, so behaviour never gets worse than before.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from . import utils
+
+Condition = Callable[[], Optional[bool]]
+
+
+@dataclass
+class WaitRecord:
+    """Outcome of waits for one condition name."""
+
+    waits: int = 0
+    satisfied: int = 0
+    timed_out: int = 0
+    unobservable: int = 0
+    total_time: float = 0.0
+    worst_case_time: float = 0.0
+
+    @property
+    def saved(self) -> float:
+        """Seconds saved compared with always sleeping the full timeout."""
+
+        return self.worst_case_time - self.total_time
+
+
+@dataclass
+class WaitStats:
+    conditions: Dict[str, WaitRecord] = field(default_factory=dict)
+
+    def record(self, name: str) -> WaitRecord:
+        return self.conditions.setdefault(name, WaitRecord())
+
+    @property
+    def total_saved(self) -> float:
+        return sum(record.saved for record in self.conditions.values())
+
+
+@dataclass
+class WindowSnapshot:
+    """Small grayscale capture of a window used as a "before" image."""
+
+    title: str
+    image: Any
+
+
+class WaitEngine:
+    """Poll readiness conditions with a timeout.
+
+    A condition returns ``True`` when satisfied, ``False`` when not yet,
+    and ``None`` when it cannot be observed at all.
+    """
+
+    def __init__(self, poll_interval: float = 0.05) -> None:
+        self.poll_interval = poll_interval
+        self.stats = WaitStats()
+
+    def until(self, name: str, condition: Condition, timeout: float, fallback: Optional[float] = None) -> bool:
+        """Wait until ``condition`` holds; sleep ``fallback`` (default ``timeout``) if unobservable."""
+
+        record = self.stats.record(name)
+        record.waits += 1
+        started = time.monotonic()
+        deadline = started + max(timeout, 0.0)
+        try:
+            while True:
+                state = condition()
+                if state is None:
+                    record.unobservable += 1
+                    delay = timeout if fallback is None else fallback
+                    remaining = started + delay - time.monotonic()
+                    if remaining > 0:
+                        time.sleep(remaining)
+                    record.worst_case_time += delay
+                    return False
+                if state:
+                    record.satisfied += 1
+                    record.worst_case_time += timeout
+                    return True
+                if time.monotonic() >= deadline:
+                    record.timed_out += 1
+                    record.worst_case_time += timeout
+                    return False
+                time.sleep(self.poll_interval)
+        finally:
+            record.total_time += time.monotonic() - started
+
+    # Window conditions ------------------------------------------------
+    def for_window(self, title: str, timeout: float, fallback: Optional[float] = None) -> bool:
+        """Wait until a window titled ``title`` exists and processes messages."""
+
+        def ready() -> Optional[bool]:
+            if utils.gw is None:
+                return None
+            window = utils.find_window(title)
+            if window is None:
+                return False
+            return utils.is_window_responsive(window) is not False
+
+        return self.until("window_ready", ready, timeout, fallback)
+
+    def for_responsive(self, title: str, timeout: float) -> bool:
+        """Wait until the app has handled all input sent so far."""
+
+        def responsive() -> Optional[bool]:
+            if utils.gw is None:
+                return None
+            window = utils.find_window(title)
+            if window is None:
+                # Jendela sudah tertutup (misalnya form login berganti), tidak ada yang ditunggu.
+                return True
+            return utils.is_window_responsive(window, timeout=min(max(timeout, 0.01), 0.25))
+
+        return self.until("window_responsive", responsive, timeout)
+
+    def for_foreground(self, title: str, timeout: float) -> bool:
+        def matches() -> Optional[bool]:
+            current = utils.foreground_title()
+            if current is None:
+                return None
+            return title.lower() in current.lower()
+
+        return self.until("foreground", matches, timeout)
+
+    def snapshot(self, title: str) -> Optional[WindowSnapshot]:
+        window = utils.find_window(title)
+        if window is None:
+            return None
+        image = utils.capture_window(window)
+        if image is None:
+            return None
+        return WindowSnapshot(title, image)
+
+    def for_change(self, snapshot: Optional[WindowSnapshot], timeout: float, threshold: float = 3.0) -> bool:
+        """Wait until the window looks different from ``snapshot`` (mean gray-level difference)."""
+
+        def changed() -> Optional[bool]:
+            if snapshot is None:
+                return None
+            window = utils.find_window(snapshot.title)
+            if window is None:
+                # Jendela tertutup atau berganti judul: tampilan jelas sudah berubah.
+                return True
+            image = utils.capture_window(window)
+            if image is None:
+                return None
+            if image.shape != snapshot.image.shape:
+                return True
+            return float(abs(image - snapshot.image).mean()) >= threshold
+
+        return self.until("screen_changed", changed, timeout)
+
+    def after_input(self, snapshot: Optional[WindowSnapshot], title: str, timeout: float) -> None:
+        """Wait for the app to react to the keys just sent, within one shared ``timeout``.
+
+        First the window has to look different from ``snapshot``, then its
+        UI thread has to be idle again.
+        """
+
+        started = time.monotonic()
+        self.for_change(snapshot, timeout)
+        self.for_responsive(title, max(timeout - (time.monotonic() - started), 0.0))
+
+
+__all__ = ["WaitEngine", "WaitRecord", "WaitStats", "WindowSnapshot"]
@@ -0,0 +1 @@
+"""Headless performance benchmarks for the APM automation helper."""
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import os
 from configparser import ConfigParser
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
@@ -77,6 +77,32 @@ def _read_float(
     return float(value)
 
 
+def _read_list(
+    parser: ConfigParser,
+    section: str,
+    option: str,
+    fallback: Optional[list[str]] = None,
+    env_key: Optional[str] = None,
+) -> list[str]:
+    value = _read_optional(parser, section, option, env_key=env_key)
+    if value is None:
+        if fallback is None:
+            raise KeyError(f"Konfigurasi daftar '{section}.{option}' tidak ditemukan dan tidak memiliki default")
+        return list(fallback)
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _read_region(parser: ConfigParser, section: str, option: str) -> Optional[list[int]]:
+    """Area ``x, y, lebar, tinggi`` dalam piksel; kosong berarti seluruh jendela."""
+
+    values = _read_list(parser, section, option, fallback=[])
+    if not values:
+        return None
+    if len(values) != 4:
+        raise ValueError(f"{section}.{option} harus berisi 4 angka: x, y, lebar, tinggi")
+    return [int(value) for value in values]
+
+
 def _read_bool(
     parser: ConfigParser,
     section: str,
@@ -89,6 +115,26 @@ def _read_bool(
         if fallback is None:
             raise KeyError(f"Konfigurasi boolean '{section}.{option}' tidak ditemukan dan tidak memiliki default")
         return fallback
+    return _parse_bool(section, option, value)
+
+
+def _read_optional_bool(parser: ConfigParser, section: str, option: str) -> Optional[bool]:
+    """Nilai kosong berarti "biarkan default driver" sehingga dikembalikan sebagai ``None``."""
+
+    value = _read_optional(parser, section, option)
+    if value is None or not value.strip():
+        return None
+    return _parse_bool(section, option, value)
+
+
+def _read_optional_float(parser: ConfigParser, section: str, option: str) -> Optional[float]:
+    value = _read_optional(parser, section, option)
+    if value is None or not value.strip():
+        return None
+    return float(value)
+
+
+def _parse_bool(section: str, option: str, value: str) -> bool:
     normalized = value.strip().lower()
     if normalized in {"1", "true", "yes", "on"}:
         return True
@@ -108,6 +154,18 @@ class ApplicationSettings:
     launch_delay: float
     submit_key: str
     working_dir: str | None = None
+    text_input: list[str] = field(default_factory=lambda: ["keys"])
+    launch_timeout: float = 30.0
+    login_timeout: float = 1.0
+    booking_timeout: float = 0.5
+    logged_in_title: str | None = None
+    timing_profile_path: str | None = "timing_profiles.json"
+    state_templates: str | None = None
+    state_region: list[int] | None = None
+    state_scale: float = 0.5
+    state_threshold: float = 0.85
+    login_script: str | None = None
+    booking_script: str | None = None
 
 
 @dataclass
@@ -122,12 +180,65 @@ class ScannerSettings:
     camera_id: int
     scan_timeout: float
     window_title: str
+    keep_warm: bool = False
+    frame_timeout: float = 3.0
+    preprocess_stages: list[str] = field(
+        default_factory=lambda: ["grayscale", "contrast", "downscale", "region_retry"]
+    )
+    downscale_width: int = 640
+    low_light_threshold: float = 70.0
+    frame_buffers: int = 3
+    gate_enabled: bool = True
+    min_sharpness: float = 60.0
+    min_change: float = 2.0
+    gate_force_every: int = 10
+    roi_tracking: bool = True
+    roi_padding: float = 0.5
+    record_path: str | None = None
+    replay_path: str | None = None
+    decoder: str = "auto"
+    accepted_formats: list[str] = field(default_factory=lambda: ["bpjs", "nik"])
+    confirm_frames: int = 2
+    preview_fps: float = 12.0
+    preview_width: int = 240
+    camera_ids: list[int] = field(default_factory=list)
+    frame_width: int = 0
+    frame_height: int = 0
+    capture_fps: float = 0.0
+    fourcc: str = ""
+    capture_buffer_size: int = 0
+    autofocus: Optional[bool] = None
+    focus: Optional[float] = None
+    auto_exposure: Optional[bool] = None
+    exposure: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if not self.camera_ids:
+            self.camera_ids = [self.camera_id]
+
+
+@dataclass
+class WedgeSettings:
+    """Scanner genggam USB yang berperilaku sebagai keyboard (keyboard wedge)."""
+
+    enabled: bool = False
+    max_interval: float = 0.05
+    min_length: int = 8
+    terminator: str = "enter"
+    device: str | None = None
 
 
 @dataclass
 class WorkflowSettings:
     post_login_delay: float
     network_timeout: float
+    continuous_cooldown: float = 10.0
+    attach_running: bool = True
+    login_schedule: str = "sequential"
+    auto_start: bool = False
+    startup_log_path: str | None = None
+    trace_log_path: str | None = None
+    session_state_path: str | None = "session_state.json"
 
 
 @dataclass
@@ -137,6 +248,7 @@ class Settings:
     camera: CameraSettings
     scanner: ScannerSettings
     workflow: WorkflowSettings
+    wedge: WedgeSettings = field(default_factory=WedgeSettings)
 
 
 def load_config(config_path: Path | str = DEFAULT_CONFIG_PATH) -> Settings:
@@ -168,6 +280,21 @@ def load_config(config_path: Path | str = DEFAULT_CONFIG_PATH) -> Settings:
         submit_key=_read_value(parser, "Frista", "submit_key", fallback="space"),
         working_dir=_read_optional(parser, "Frista", "working_dir")
         or str(Path(frista_path).parent),
+        text_input=[
+            item.lower() for item in _read_list(parser, "Frista", "text_input", fallback=["keys"])
+        ],
+        launch_timeout=_read_float(parser, "Frista", "launch_timeout", fallback=30.0),
+        login_timeout=_read_float(parser, "Frista", "login_timeout", fallback=1.0),
+        booking_timeout=_read_float(parser, "Frista", "booking_timeout", fallback=0.5),
+        logged_in_title=_read_optional(parser, "Frista", "logged_in_title") or None,
+        timing_profile_path=_read_value(parser, "Frista", "timing_profile_path", fallback="timing_profiles.json")
+        or None,
+        state_templates=_read_optional(parser, "Frista", "state_templates") or None,
+        state_region=_read_region(parser, "Frista", "state_region"),
+        state_scale=_read_float(parser, "Frista", "state_scale", fallback=0.5),
+        state_threshold=_read_float(parser, "Frista", "state_threshold", fallback=0.85),
+        login_script=_read_optional(parser, "Frista", "login_script") or None,
+        booking_script=_read_optional(parser, "Frista", "booking_script") or None,
     )
 
     after_path = _read_value(
@@ -185,6 +312,21 @@ def load_config(config_path: Path | str = DEFAULT_CONFIG_PATH) -> Settings:
         submit_key=_read_value(parser, "After", "submit_key", fallback="enter"),
         working_dir=_read_optional(parser, "After", "working_dir")
         or str(Path(after_path).parent),
+        text_input=[
+            item.lower() for item in _read_list(parser, "After", "text_input", fallback=["keys"])
+        ],
+        launch_timeout=_read_float(parser, "After", "launch_timeout", fallback=30.0),
+        login_timeout=_read_float(parser, "After", "login_timeout", fallback=1.0),
+        booking_timeout=_read_float(parser, "After", "booking_timeout", fallback=0.5),
+        logged_in_title=_read_optional(parser, "After", "logged_in_title") or None,
+        timing_profile_path=_read_value(parser, "After", "timing_profile_path", fallback="timing_profiles.json")
+        or None,
+        state_templates=_read_optional(parser, "After", "state_templates") or None,
+        state_region=_read_region(parser, "After", "state_region"),
+        state_scale=_read_float(parser, "After", "state_scale", fallback=0.5),
+        state_threshold=_read_float(parser, "After", "state_threshold", fallback=0.85),
+        login_script=_read_optional(parser, "After", "login_script") or None,
+        booking_script=_read_optional(parser, "After", "booking_script") or None,
     )
 
     camera_settings = CameraSettings(
@@ -207,11 +349,68 @@ def load_config(config_path: Path | str = DEFAULT_CONFIG_PATH) -> Settings:
             "window_title",
             fallback="Pemindai Barcode BPJS",
         ),
+        keep_warm=_read_bool(parser, "Scanner", "keep_warm", fallback=False),
+        frame_timeout=_read_float(parser, "Scanner", "frame_timeout", fallback=3.0),
+        preprocess_stages=_read_list(
+            parser,
+            "Scanner",
+            "preprocess_stages",
+            fallback=["grayscale", "contrast", "downscale", "region_retry"],
+        ),
+        downscale_width=_read_int(parser, "Scanner", "downscale_width", fallback=640),
+        low_light_threshold=_read_float(parser, "Scanner", "low_light_threshold", fallback=70.0),
+        frame_buffers=_read_int(parser, "Scanner", "frame_buffers", fallback=3),
+        gate_enabled=_read_bool(parser, "Scanner", "gate_enabled", fallback=True),
+        min_sharpness=_read_float(parser, "Scanner", "min_sharpness", fallback=60.0),
+        min_change=_read_float(parser, "Scanner", "min_change", fallback=2.0),
+        gate_force_every=_read_int(parser, "Scanner", "gate_force_every", fallback=10),
+        roi_tracking=_read_bool(parser, "Scanner", "roi_tracking", fallback=True),
+        roi_padding=_read_float(parser, "Scanner", "roi_padding", fallback=0.5),
+        record_path=_read_optional(parser, "Scanner", "record_path") or None,
+        replay_path=_read_optional(parser, "Scanner", "replay_path") or None,
+        decoder=_read_value(parser, "Scanner", "decoder", fallback="auto").strip().lower(),
+        accepted_formats=[
+            item.lower()
+            for item in _read_list(parser, "Scanner", "accepted_formats", fallback=["bpjs", "nik"])
+        ],
+        confirm_frames=_read_int(parser, "Scanner", "confirm_frames", fallback=2),
+        preview_fps=_read_float(parser, "Scanner", "preview_fps", fallback=12.0),
+        preview_width=_read_int(parser, "Scanner", "preview_width", fallback=240),
+        camera_ids=[int(item) for item in _read_list(parser, "Scanner", "camera_ids", fallback=[])],
+        frame_width=_read_int(parser, "Scanner", "frame_width", fallback=0),
+        frame_height=_read_int(parser, "Scanner", "frame_height", fallback=0),
+        capture_fps=_read_float(parser, "Scanner", "capture_fps", fallback=0.0),
+        fourcc=_read_value(parser, "Scanner", "fourcc", fallback="").strip().upper(),
+        capture_buffer_size=_read_int(parser, "Scanner", "capture_buffer_size", fallback=0),
+        autofocus=_read_optional_bool(parser, "Scanner", "autofocus"),
+        focus=_read_optional_float(parser, "Scanner", "focus"),
+        auto_exposure=_read_optional_bool(parser, "Scanner", "auto_exposure"),
+        exposure=_read_optional_float(parser, "Scanner", "exposure"),
     )
 
     workflow_settings = WorkflowSettings(
         post_login_delay=_read_float(parser, "Workflow", "post_login_delay", fallback=1.0),
         network_timeout=_read_float(parser, "Workflow", "network_timeout", fallback=5.0),
+        continuous_cooldown=_read_float(parser, "Workflow", "continuous_cooldown", fallback=10.0),
+        attach_running=_read_bool(parser, "Workflow", "attach_running", fallback=True),
+        login_schedule=_read_value(parser, "Workflow", "login_schedule", fallback="sequential").strip().lower(),
+        auto_start=_read_bool(parser, "Workflow", "auto_start", fallback=False),
+        startup_log_path=_read_optional(parser, "Workflow", "startup_log_path") or None,
+        trace_log_path=_read_optional(parser, "Workflow", "trace_log_path") or None,
+        session_state_path=_read_value(parser, "Workflow", "session_state_path", fallback="session_state.json")
+        or None,
+    )
+
+    if scanner_settings.keep_warm and camera_settings.camera_id in scanner_settings.camera_ids:
+        # Kamera Windows hanya bisa dibuka satu aplikasi; kamera wajah Frista tidak boleh ditahan scanner.
+        scanner_settings.keep_warm = False
+
+    wedge_settings = WedgeSettings(
+        enabled=_read_bool(parser, "Wedge", "enabled", fallback=False),
+        max_interval=_read_float(parser, "Wedge", "max_interval", fallback=0.05),
+        min_length=_read_int(parser, "Wedge", "min_length", fallback=8),
+        terminator=_read_value(parser, "Wedge", "terminator", fallback="enter").strip().lower(),
+        device=_read_optional(parser, "Wedge", "device") or None,
     )
 
     return Settings(
@@ -220,14 +419,47 @@ def load_config(config_path: Path | str = DEFAULT_CONFIG_PATH) -> Settings:
         camera=camera_settings,
         scanner=scanner_settings,
         workflow=workflow_settings,
+        wedge=wedge_settings,
     )
 
 
+def update_config(config_path: Path | str, section: str, values: dict[str, str]) -> None:
+    """Menulis ``values`` ke ``section`` tanpa mengubah baris lain (komentar tetap utuh)."""
+
+    path = Path(config_path)
+    lines = path.read_text(encoding="utf-8").splitlines() if path.exists() else []
+    pending = dict(values)
+
+    start = next((index for index, line in enumerate(lines) if line.strip() == f"[{section}]"), None)
+    if start is None:
+        if lines and lines[-1].strip():
+            lines.append("")
+        lines.append(f"[{section}]")
+        start = len(lines) - 1
+    end = next(
+        (index for index in range(start + 1, len(lines)) if lines[index].strip().startswith("[")),
+        len(lines),
+    )
+
+    for index in range(start + 1, end):
+        key = lines[index].split("=", 1)[0].strip()
+        if "=" in lines[index] and key in pending:
+            lines[index] = f"{key} = {pending.pop(key)}".rstrip()
+
+    insert_at = end
+    while insert_at > start + 1 and not lines[insert_at - 1].strip():
+        insert_at -= 1
+    lines[insert_at:insert_at] = [f"{key} = {value}".rstrip() for key, value in pending.items()]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
 __all__ = [
     "ApplicationSettings",
     "CameraSettings",
     "ScannerSettings",
+    "WedgeSettings",
     "WorkflowSettings",
     "Settings",
     "load_config",
+    "update_config",
 ]
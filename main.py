@@ -1,32 +1,48 @@
 """Entry point for the APM automation desktop helper."""
 from __future__ import annotations
 
+import time
 import tkinter as tk
 
-from automation import AfterClient, BarcodeScanner, FristaClient
+from automation import AfterClient, BarcodeScanner, FristaClient, KeyboardWedgeScanner
 from config.loader import load_config
 from workflow.session import SessionController
 from ui.main_window import MainWindow
 
 
 def main() -> None:
+    started_at = time.monotonic()
     settings = load_config()
 
     frista_client = FristaClient(settings.frista)
     after_client = AfterClient(settings.after)
-    controller = SessionController(frista_client, after_client, settings.workflow)
+    controller = SessionController(frista_client, after_client, settings.workflow, started_at=started_at)
 
     scanner = None
     if settings.scanner.enabled:
-        scanner = BarcodeScanner(
-            camera_id=settings.scanner.camera_id,
-            scan_timeout=settings.scanner.scan_timeout,
-            window_title=settings.scanner.window_title,
-        )
+        scanner = BarcodeScanner.from_settings(settings.scanner)
+        if settings.scanner.keep_warm:
+            # Kamera dibuka sekali di latar belakang agar pemindaian pertama tidak menunggu auto-exposure.
+            scanner.start()
+
+    wedge = None
+    if settings.wedge.enabled:
+        # Dimulai oleh MainWindow; kegagalan hook/perangkat ditampilkan di baris status.
+        wedge = KeyboardWedgeScanner.from_settings(settings.wedge, settings.scanner.accepted_formats)
 
     root = tk.Tk()
-    MainWindow(root, controller, settings, scanner=scanner)
-    root.mainloop()
+    MainWindow(root, controller, settings, scanner=scanner, wedge=wedge)
+    if settings.workflow.attach_running and not settings.workflow.auto_start:
+        # Setelah callback UI terpasang, agar tombol ikut menyesuaikan sesi yang dipulihkan.
+        # auto_start sudah memakai instance yang berjalan dengan sendirinya.
+        controller.restore_session_async()
+    try:
+        root.mainloop()
+    finally:
+        if scanner is not None:
+            scanner.stop()
+        if wedge is not None:
+            wedge.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,54 @@
+from automation.keyboard_wedge import KeystrokeBurstDetector
+
+NUMBER = "0001234567890"
+
+
+def _burst(text, start, interval=0.01):
+    return [(char, start + index * interval) for index, char in enumerate(text)]
+
+
+def _feed(detector, events):
+    return [burst for burst in (detector.feed(char, at) for char, at in events) if burst is not None]
+
+
+def test_scanner_burst_is_reported():
+    detector = KeystrokeBurstDetector()
+
+    events = _burst(NUMBER, 1.0) + [("\n", 1.0 + len(NUMBER) * 0.01)]
+
+    assert _feed(detector, events) == [NUMBER]
+    assert detector.stats.bursts == 1
+    assert not detector.pending
+
+
+def test_human_typing_is_ignored():
+    detector = KeystrokeBurstDetector()
+
+    events = _burst(NUMBER, 0.0, interval=0.2) + [("\n", len(NUMBER) * 0.2)]
+
+    assert _feed(detector, events) == []
+    assert detector.stats.bursts == 0
+
+
+def test_human_key_long_before_burst_is_dropped():
+    detector = KeystrokeBurstDetector()
+
+    events = [("x", 0.5)] + _burst(NUMBER, 1.0) + [("\n", 1.13)]
+
+    assert _feed(detector, events) == [NUMBER]
+
+
+def test_human_key_just_before_burst_is_not_glued_on():
+    detector = KeystrokeBurstDetector(max_interval=0.05)
+
+    # 40 ms lies within max_interval but is far slower than the scanner's 10 ms.
+    events = [("x", 0.96)] + _burst(NUMBER, 1.0) + [("\n", 1.13)]
+
+    assert _feed(detector, events) == [NUMBER]
+
+
+def test_human_key_just_before_burst_without_terminator():
+    detector = KeystrokeBurstDetector(max_interval=0.05, terminator="")
+
+    assert _feed(detector, [("x", 0.96)] + _burst(NUMBER, 1.0)) == []
+    assert detector.flush() == NUMBER
@@ -2,13 +2,24 @@
 from __future__ import annotations
 
 import threading
+import time
 import tkinter as tk
 from tkinter import messagebox
 from typing import Dict, Optional
 
-from automation import BarcodeScanner, BarcodeScannerError
+from automation import (
+    BarcodeScanner,
+    BarcodeScannerError,
+    InvalidNumberError,
+    KeyboardWedgeScanner,
+    ScanCancelledError,
+    describe_accepted,
+    validate_number,
+)
 from config.loader import Settings
+from workflow.continuous import ContinuousScanController, ContinuousStats
 from workflow.session import SessionController
+from ui.preview import PreviewPanel
 
 
 class MainWindow:
@@ -20,28 +31,47 @@ class MainWindow:
         controller: SessionController,
         settings: Settings,
         scanner: Optional[BarcodeScanner] = None,
+        wedge: Optional[KeyboardWedgeScanner] = None,
     ) -> None:
         self.root = root
         self.controller = controller
         self.settings = settings
         self.scanner = scanner
+        self.wedge = wedge
 
         self.status_var = tk.StringVar(value="Silakan mulai dengan login Frista.")
         self.bpjs_var = tk.StringVar()
+        self.continuous_var = tk.BooleanVar(value=False)
+        self.continuous_info_var = tk.StringVar(value="")
+
+        self.continuous: Optional[ContinuousScanController] = None
+        if scanner is not None:
+            self.continuous = ContinuousScanController(
+                scanner,
+                controller,
+                cooldown=settings.workflow.continuous_cooldown,
+            )
 
         self._latest_state: Dict[str, bool] = {"frista_ready": False, "after_ready": False}
         self._frista_busy = False
         self._after_busy = False
         self._scanner_busy = False
+        self._scan_superseded = False
+        self._scan_started: Optional[float] = None
+        self._wedge_flush_id: Optional[str] = None
 
         self._build_layout()
         self._register_callbacks()
         self._update_button_states({"frista_ready": False, "after_ready": False})
+        if scanner is not None and scanner.decoder_warning:
+            self.status_var.set(scanner.decoder_warning)
+        if settings.workflow.auto_start:
+            self._start_automatically()
 
     # UI construction -------------------------------------------------
     def _build_layout(self) -> None:
         self.root.title("APM BPJS - Otomasi Frista & After")
-        self.root.geometry("520x420")
+        self.root.geometry("520x690")
         self.root.resizable(False, False)
 
         header = tk.Label(
@@ -143,17 +173,47 @@ class MainWindow:
         )
         camera_info.pack(anchor="w", pady=(6, 0))
 
+        scan_hint_text = (
+            "Gunakan tombol 'Scan Barcode' jika scanner tersedia, atau isi nomor secara manual. "
+            "Kartu boleh dipindai selama login berjalan; nomornya dikirim otomatis saat kedua aplikasi siap."
+        )
+        if self.wedge is not None:
+            scan_hint_text += " Scanner genggam USB dapat langsung dipakai kapan saja."
         scan_hint = tk.Label(
             booking_frame,
-            text=(
-                "Gunakan tombol 'Scan Barcode' jika scanner tersedia, atau isi nomor secara manual."
-            ),
+            text=scan_hint_text,
             justify="left",
             wraplength=440,
             fg="#0f62fe",
         )
         scan_hint.pack(anchor="w", pady=(4, 0))
 
+        continuous_frame = tk.Frame(booking_frame)
+        continuous_frame.pack(fill="x", pady=(6, 0))
+
+        self.chk_continuous = tk.Checkbutton(
+            continuous_frame,
+            text="Mode kontinu (kirim otomatis setiap kartu)",
+            variable=self.continuous_var,
+            command=self._on_toggle_continuous,
+        )
+        self.chk_continuous.pack(side="left")
+
+        tk.Label(continuous_frame, textvariable=self.continuous_info_var, fg="#24a148").pack(side="left", padx=(8, 0))
+
+        # Camera preview
+        self.preview: Optional[PreviewPanel] = None
+        if self.scanner is not None:
+            self.preview = PreviewPanel(
+                self.root,
+                self.scanner,
+                on_cancel=self._on_cancel_scan,
+                title=self.settings.scanner.window_title,
+                max_fps=self.settings.scanner.preview_fps,
+                width=self.settings.scanner.preview_width,
+            )
+            self.preview.frame.pack(fill="x", padx=20, pady=6)
+
         # Status & controls
         status_frame = tk.Frame(self.root, padx=20, pady=12)
         status_frame.pack(fill="x")
@@ -175,14 +235,43 @@ class MainWindow:
         self.controller.set_state_callback(self._update_button_states)
         self.controller.set_error_callback(self._show_error)
         self.controller.set_action_callback(self._handle_action_result)
+        if self.continuous is not None:
+            self.continuous.set_status_callback(self._update_status)
+            self.continuous.set_submitted_callback(self._handle_continuous_submitted)
+            self.continuous.set_stopped_callback(self._handle_continuous_stopped)
+        if self.wedge is not None:
+            self.wedge.set_scan_callback(self._handle_wedge_scan)
+            self.wedge.set_rejected_callback(self._update_status)
+            try:
+                # Dimulai setelah callback terpasang agar pindaian pertama tidak hilang.
+                self.wedge.start()
+            except RuntimeError as exc:
+                self.status_var.set(f"Scanner genggam hanya terbaca saat jendela ini aktif: {exc}.")
+            if not self.wedge.captures_globally:
+                # bind_all menangkap ketikan scanner genggam di widget mana pun dalam jendela.
+                self.root.bind_all("<Key>", self._on_key_event, add="+")
 
     # Event handlers ---------------------------------------------------
     def _on_login_frista(self) -> None:
         self._frista_busy = True
         self.btn_frista.config(state="disabled")
         self.btn_frista_retry.config(state="disabled")
+        if self.controller.launches_in_parallel and not self.controller.is_after_ready:
+            # After ikut dibuka sekarang dan login otomatis setelah Frista.
+            self._after_busy = True
+            self.btn_after.config(state="disabled")
+            self.btn_after_retry.config(state="disabled")
+            self.controller.login_all_async()
+            return
         self.controller.login_frista_async()
 
+    def _start_automatically(self) -> None:
+        self._frista_busy = True
+        self._after_busy = True
+        self._update_button_states(self._latest_state)
+        self.status_var.set("Membuka dan login Frista serta After secara otomatis...")
+        self.controller.start_session_async()
+
     def _on_login_after(self) -> None:
         self._after_busy = True
         self.btn_after.config(state="disabled")
@@ -192,10 +281,13 @@ class MainWindow:
     def _on_submit_booking(self) -> None:
         nomor = self.bpjs_var.get().strip()
         if not nomor:
-            messagebox.showerror("Nomor BPJS kosong", "Masukkan nomor BPJS/NIK terlebih dahulu.")
+            accepted = describe_accepted(self.settings.scanner.accepted_formats)
+            messagebox.showerror("Nomor kosong", f"Masukkan {accepted} terlebih dahulu.")
             return
-        if not nomor.isdigit():
-            messagebox.showerror("Format tidak valid", "Nomor BPJS/NIK hanya boleh berisi angka.")
+        try:
+            validate_number(nomor, self.settings.scanner.accepted_formats)
+        except InvalidNumberError as exc:
+            messagebox.showerror("Format tidak valid", str(exc))
             return
 
         self.btn_submit.config(state="disabled")
@@ -215,18 +307,78 @@ class MainWindow:
             return
 
         self._scanner_busy = True
+        self._scan_superseded = False
+        self._scan_started = time.monotonic()
         self._set_scan_button_state()
         self._update_status("Mempersiapkan kamera barcode...")
 
+        if self.preview is not None:
+            self.preview.start()
+
         thread = threading.Thread(target=self._scan_barcode_task, daemon=True)
         thread.start()
 
+    def _on_cancel_scan(self) -> None:
+        if self.continuous is not None and self.continuous.is_running:
+            self.continuous.stop()
+        elif self.scanner is not None and self._scanner_busy:
+            self.scanner.cancel()
+
+    def _on_toggle_continuous(self) -> None:
+        if self.continuous is None:
+            self.continuous_var.set(False)
+            return
+        if not self.continuous_var.get():
+            self.continuous.stop()
+            return
+        if self.scanner is None or not self.scanner.is_available or self._scanner_busy:
+            self.continuous_var.set(False)
+            return
+
+        self._scanner_busy = True
+        self._set_scan_button_state()
+        self.continuous_info_var.set("")
+        if self.preview is not None:
+            self.preview.start()
+        self.continuous.start()
+
+    def _on_key_event(self, event: tk.Event) -> None:
+        if self.wedge is None:
+            return
+        if event.keysym in ("Return", "KP_Enter"):
+            char = "\n"
+        elif event.keysym == "Tab":
+            char = "\t"
+        else:
+            char = event.char
+        if not char:
+            # Tombol modifier (Shift dan sejenisnya) tidak memutus rangkaian ketikan.
+            return
+        # event.time adalah stempel waktu tombol dari sistem (ms), bukan saat event diproses.
+        self.wedge.feed_key(char, event.time / 1000.0)
+        if not self.wedge.detector.terminator:
+            if self._wedge_flush_id is not None:
+                self.root.after_cancel(self._wedge_flush_id)
+            delay = int(self.wedge.detector.max_interval * 1000) + 20
+            self._wedge_flush_id = self.root.after(delay, self._flush_wedge)
+
+    def _flush_wedge(self) -> None:
+        self._wedge_flush_id = None
+        if self.wedge is not None:
+            self.wedge.flush()
+
     def _on_reset(self) -> None:
         self.bpjs_var.set("")
         self.entry_bpjs.delete(0, tk.END)
         self._frista_busy = False
         self._after_busy = False
+        if self.continuous is not None and self.continuous.is_running:
+            self.continuous.stop()
+        elif self.scanner is not None and self._scanner_busy:
+            self.scanner.cancel()
+        self.continuous_var.set(False)
         self._scanner_busy = False
+        self._stop_preview()
         self.controller.reset()
         self._set_scan_button_state()
 
@@ -284,7 +436,8 @@ class MainWindow:
                     self.btn_after_retry.config(state="normal")
             elif action == "submit_booking":
                 self.btn_submit.config(state="normal")
-                if success:
+                # Pada mode kontinu, popup sukses akan menahan antrean; cukup tampilkan status.
+                if success and not (self.continuous is not None and self.continuous.is_running):
                     messagebox.showinfo("Berhasil", "Nomor BPJS berhasil dikirim ke Frista dan After.")
 
             if action in {"frista_login", "after_login"}:
@@ -297,6 +450,12 @@ class MainWindow:
         assert self.scanner is not None
         try:
             nomor = self.scanner.scan()
+        except ScanCancelledError as exc:
+            if self._scan_superseded:
+                self.root.after(0, self._finish_superseded_scan)
+                return
+            self._handle_scan_failure(str(exc))
+            return
         except BarcodeScannerError as exc:
             self._handle_scan_failure(str(exc))
             return
@@ -305,29 +464,103 @@ class MainWindow:
     def _handle_scan_success(self, nomor: str) -> None:
         def update_entry() -> None:
             self._scanner_busy = False
-            self.bpjs_var.set(nomor)
-            self.entry_bpjs.config(state="normal")
-            self.entry_bpjs.focus_set()
-            self.entry_bpjs.selection_range(0, tk.END)
-            self._update_status("Barcode terbaca. Periksa nomor sebelum dikirim.")
-            self._set_scan_button_state()
+            self._stop_preview()
+            if not self._session_ready():
+                self._queue_scanned_number(nomor, self._scan_started)
+                return
+            self._fill_scanned_number(
+                nomor, "Barcode terbaca. Periksa nomor sebelum dikirim." + self._scan_timing_suffix()
+            )
 
         self.root.after(0, update_entry)
 
+    def _handle_wedge_scan(self, nomor: str) -> None:
+        def apply_scan() -> None:
+            if self.continuous is not None and self.continuous.is_running:
+                # Mode kios: duplikat, jeda, dan antrean kiriman sama seperti bacaan kamera.
+                self.continuous.submit_number(nomor)
+                return
+            if self._scanner_busy and self.scanner is not None:
+                # Scanner genggam lebih cepat; pemindaian kamera yang sedang berjalan dihentikan.
+                self._scan_superseded = True
+                self.scanner.cancel()
+            self._scanner_busy = False
+            self._stop_preview()
+            if not self._session_ready():
+                self._queue_scanned_number(nomor, None)
+                return
+            self._fill_scanned_number(nomor, "Barcode terbaca dari scanner genggam. Periksa nomor sebelum dikirim.")
+
+        self.root.after(0, apply_scan)
+
+    def _finish_superseded_scan(self) -> None:
+        self._scan_superseded = False
+        self._set_scan_button_state()
+
+    def _session_ready(self) -> bool:
+        return self.controller.is_frista_ready and self.controller.is_after_ready
+
+    def _queue_scanned_number(self, nomor: str, scan_started: Optional[float]) -> None:
+        # Scan-ahead: nomor disimpan selama login berjalan dan dikirim otomatis saat sesi siap.
+        self.bpjs_var.set(nomor)
+        self.controller.queue_booking(nomor, scan_started)
+        self._set_scan_button_state()
+
+    def _fill_scanned_number(self, nomor: str, message: str) -> None:
+        self.bpjs_var.set(nomor)
+        self.entry_bpjs.config(state="normal")
+        self.entry_bpjs.focus_set()
+        self.entry_bpjs.selection_range(0, tk.END)
+        self._update_status(message)
+        self._set_scan_button_state()
+
+    def _scan_timing_suffix(self) -> str:
+        metrics = self.scanner.last_metrics if self.scanner else None
+        if metrics is None or metrics.time_to_decode is None:
+            return ""
+        kondisi = "kamera hangat" if metrics.camera_warm else "kamera dingin"
+        if self.scanner is not None and len(self.scanner.camera_ids) > 1:
+            kondisi += f", kamera {metrics.camera_id}"
+        if metrics.gate_stats is not None:
+            kondisi += f", {metrics.skip_ratio:.0%} frame dilewati"
+        return f" ({metrics.time_to_decode:.2f} dtk, {kondisi})"
+
     def _handle_scan_failure(self, message: str) -> None:
         def show_failure() -> None:
             self._scanner_busy = False
+            self._stop_preview()
             messagebox.showerror("Gagal memindai barcode", message)
             self._update_status("Pemindaian gagal. Coba ulangi atau isi manual.")
             self._set_scan_button_state()
 
         self.root.after(0, show_failure)
 
+    def _handle_continuous_submitted(self, nomor: str, stats: ContinuousStats) -> None:
+        def update_info() -> None:
+            self.bpjs_var.set(nomor)
+            self.continuous_info_var.set(f"Terkirim: {stats.submitted} | {stats.per_hour:.0f} pasien/jam")
+
+        self.root.after(0, update_info)
+
+    def _handle_continuous_stopped(self) -> None:
+        def reset_controls() -> None:
+            self.continuous_var.set(False)
+            self._scanner_busy = False
+            self._stop_preview()
+            self._set_scan_button_state()
+
+        self.root.after(0, reset_controls)
+
+    def _stop_preview(self) -> None:
+        if self.preview is not None:
+            self.preview.stop()
+
     def _set_scan_button_state(self) -> None:
         if not hasattr(self, "btn_scan"):
             return
         ready = self._latest_state.get("frista_ready", False) and self._latest_state.get("after_ready", False)
-        if not ready or self._scanner_busy:
+        # Pemindaian boleh berjalan selama login; hasilnya disimpan sampai sesi siap.
+        if self._scanner_busy:
             state = "disabled"
         elif not self.scanner or not self.scanner.is_available:
             state = "disabled"
@@ -335,5 +568,14 @@ class MainWindow:
             state = "normal"
         self.btn_scan.config(state=state)
 
+        scanner_ready = self.scanner is not None and self.scanner.is_available
+        if self.continuous is not None and self.continuous.is_running:
+            continuous_state = "normal"
+        elif ready and scanner_ready and not self._scanner_busy:
+            continuous_state = "normal"
+        else:
+            continuous_state = "disabled"
+        self.chk_continuous.config(state=continuous_state)
+
 
 __all__ = ["MainWindow"]
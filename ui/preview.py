@@ -0,0 +1,147 @@
+"""Embedded, rate-limited camera preview for the barcode scanner."""
+from __future__ import annotations
+
+import time
+import tkinter as tk
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+try:  # pragma: no cover - optional heavy dependency
+    import cv2  # type: ignore
+except Exception:  # pragma: no cover - runtime only
+    cv2 = None  # type: ignore
+
+from automation import BarcodeScanner
+
+
+@dataclass
+class PreviewStats:
+    """Render cost of the preview, measured separately from decoding."""
+
+    frames_shown: int = 0
+    render_time: float = 0.0
+    started_at: Optional[float] = None
+
+    @property
+    def average_render_ms(self) -> float:
+        return self.render_time / self.frames_shown * 1000 if self.frames_shown else 0.0
+
+    @property
+    def display_fps(self) -> float:
+        if self.started_at is None or not self.frames_shown:
+            return 0.0
+        elapsed = time.perf_counter() - self.started_at
+        return self.frames_shown / elapsed if elapsed > 0 else 0.0
+
+
+class PreviewPanel:
+    """Panel pratinjau kamera di dalam jendela utama.
+
+    Panel mengambil frame terbaru dari scanner dengan laju tetap
+    (``max_fps``) lewat ``root.after`` sehingga tidak bergantung pada laju
+    kamera maupun dekode, dan menggantikan jendela ``cv2.imshow``.
+    """
+
+    def __init__(
+        self,
+        parent: tk.Misc,
+        scanner: BarcodeScanner,
+        on_cancel: Callable[[], None],
+        title: str,
+        max_fps: float = 12.0,
+        width: int = 240,
+    ) -> None:
+        self.parent = parent
+        self.scanner = scanner
+        self.width = width
+        self.interval_ms = max(int(1000 / max(max_fps, 1.0)), 1)
+        self.stats = PreviewStats()
+
+        self._running = False
+        self._after_id: Optional[str] = None
+        self._photo: Optional[tk.PhotoImage] = None
+
+        self.frame = tk.LabelFrame(parent, text=title, padx=12, pady=8)
+        body = tk.Frame(self.frame)
+        body.pack(fill="x")
+
+        self.image_label = tk.Label(
+            body,
+            text="Pratinjau kamera muncul saat pemindaian berjalan.",
+            width=34,
+            height=8,
+            relief="sunken",
+            wraplength=220,
+        )
+        self.image_label.pack(side="left")
+
+        controls = tk.Frame(body)
+        controls.pack(side="left", padx=(12, 0), anchor="n")
+
+        self.btn_cancel = tk.Button(controls, text="Batal Scan", width=14, state="disabled", command=on_cancel)
+        self.btn_cancel.pack(anchor="w")
+
+        self.stats_var = tk.StringVar(value="")
+        tk.Label(controls, textvariable=self.stats_var, justify="left", wraplength=160).pack(anchor="w", pady=(8, 0))
+
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self.stats = PreviewStats(started_at=time.perf_counter())
+        self.btn_cancel.config(state="normal")
+        self._tick()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._after_id is not None:
+            self.parent.after_cancel(self._after_id)
+            self._after_id = None
+        self.btn_cancel.config(state="disabled")
+        self._photo = None
+        self.image_label.config(image="", text="Pratinjau kamera muncul saat pemindaian berjalan.", width=34, height=8)
+        if self.stats.frames_shown:
+            self.stats_var.set(self._describe_stats())
+
+    # ------------------------------------------------------------------
+    def _tick(self) -> None:
+        if not self._running:
+            return
+        started = time.perf_counter()
+        frame = self.scanner.preview_frame(self.width)
+        if frame is not None:
+            photo = _to_photo(frame)
+            if photo is not None:
+                self._photo = photo
+                self.image_label.config(image=photo, text="", width=photo.width(), height=photo.height())
+                self.stats.frames_shown += 1
+                self.stats.render_time += time.perf_counter() - started
+                if self.stats.frames_shown % 10 == 0:
+                    self.stats_var.set(self._describe_stats())
+        self._after_id = self.parent.after(self.interval_ms, self._tick)
+
+    def _describe_stats(self) -> str:
+        lines = [f"Pratinjau {self.stats.display_fps:.1f} fps", f"{self.stats.average_render_ms:.1f} ms/frame"]
+        if len(self.scanner.camera_ids) > 1:
+            # Menunjukkan kamera mana yang paling sering menghasilkan bacaan.
+            for camera in self.scanner.camera_stats:
+                lines.append(
+                    f"Kamera {camera.camera_id}: {camera.hits}/{camera.scans} terbaca, "
+                    f"{camera.average_decode_time * 1000:.0f} ms"
+                )
+        return "\n".join(lines)
+
+
+def _to_photo(frame: Any) -> Optional[tk.PhotoImage]:
+    """Convert a BGR frame to a Tk photo via in-memory PPM (no Pillow needed)."""
+
+    if cv2 is None:
+        return None
+    ok, encoded = cv2.imencode(".ppm", frame)
+    if not ok:
+        return None
+    return tk.PhotoImage(data=encoded.tobytes(), format="PPM")
+
+
+__all__ = ["PreviewPanel", "PreviewStats"]
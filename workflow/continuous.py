@@ -0,0 +1,149 @@
+"""Mode kios kontinu: scanner terus aktif dan setiap bacaan valid langsung dikirim."""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from automation.barcode import BarcodeScanner, BarcodeScannerError, ScanCancelledError, ScanTimeoutError
+from workflow.session import SessionController
+
+SubmittedCallback = Callable[[str, "ContinuousStats"], None]
+StatusCallback = Callable[[str], None]
+StoppedCallback = Callable[[], None]
+
+
+@dataclass
+class ContinuousStats:
+    """Jumlah kiriman dan laju pasien selama mode kontinu aktif."""
+
+    started_at: float = field(default_factory=time.monotonic)
+    submitted: int = 0
+    duplicates_skipped: int = 0
+
+    @property
+    def per_hour(self) -> float:
+        elapsed = time.monotonic() - self.started_at
+        return self.submitted / elapsed * 3600 if elapsed > 0 else 0.0
+
+
+class ContinuousScanController:
+    """Menjaga scanner tetap aktif selama Frista dan After siap.
+
+    Setiap bacaan yang lolos validasi scanner dikirim lewat
+    :meth:`SessionController.submit_booking_async`. Nomor yang sama dalam
+    rentang ``cooldown`` detik diabaikan agar kartu yang masih berada di
+    depan kamera tidak terkirim dua kali. Pemindaian pasien berikutnya
+    sudah berjalan selama nomor sebelumnya masih diketik ke aplikasi.
+    Bacaan scanner genggam masuk lewat :meth:`submit_number` dan melewati
+    aturan yang sama.
+    """
+
+    def __init__(
+        self,
+        scanner: BarcodeScanner,
+        controller: SessionController,
+        cooldown: float = 10.0,
+    ) -> None:
+        self.scanner = scanner
+        self.controller = controller
+        self.cooldown = cooldown
+        self.stats = ContinuousStats()
+
+        self._submitted_callback: SubmittedCallback = lambda number, stats: None
+        self._status_callback: StatusCallback = lambda message: None
+        self._stopped_callback: StoppedCallback = lambda: None
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Kamera dan scanner genggam bergiliran memeriksa duplikat dan mengirim.
+        self._submit_lock = threading.Lock()
+        self._last_number: Optional[str] = None
+        self._last_time = 0.0
+
+    # Callback setters -------------------------------------------------
+    def set_submitted_callback(self, callback: SubmittedCallback) -> None:
+        self._submitted_callback = callback
+
+    def set_status_callback(self, callback: StatusCallback) -> None:
+        self._status_callback = callback
+
+    def set_stopped_callback(self, callback: StoppedCallback) -> None:
+        self._stopped_callback = callback
+
+    # Public API ------------------------------------------------------
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+        self.stats = ContinuousStats()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="continuous-scan", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.scanner.cancel()
+
+    def submit_number(self, number: str) -> None:
+        """Kirim bacaan dari sumber lain (scanner genggam) seperti bacaan kamera.
+
+        Berjalan di thread tersendiri karena bisa menunggu kiriman
+        sebelumnya selesai.
+        """
+
+        threading.Thread(target=self._handle_number, args=(number,), name="continuous-submit", daemon=True).start()
+
+    # Loop ------------------------------------------------------------
+    def _run(self) -> None:
+        self._status_callback("Mode kontinu aktif. Arahkan kartu BPJS ke kamera.")
+        while not self._stop_event.is_set():
+            if not (self.controller.is_frista_ready and self.controller.is_after_ready):
+                self._stop_event.wait(0.5)
+                continue
+
+            try:
+                number = self.scanner.scan(self._stop_event)
+            except ScanTimeoutError:
+                continue
+            except ScanCancelledError:
+                break
+            except BarcodeScannerError as exc:
+                self._status_callback(f"Scanner bermasalah: {exc}")
+                self._stop_event.wait(1.0)
+                continue
+
+            self._handle_number(number)
+
+        self._status_callback("Mode kontinu dihentikan.")
+        self._stopped_callback()
+
+    def _handle_number(self, number: str) -> None:
+        with self._submit_lock:
+            if self._stop_event.is_set():
+                return
+            now = time.monotonic()
+            if number == self._last_number and now - self._last_time < self.cooldown:
+                # Kartu masih di depan kamera; perpanjang jeda agar tidak terkirim ulang.
+                self._last_time = now
+                self.stats.duplicates_skipped += 1
+                return
+
+            # Tunggu pengiriman sebelumnya selesai sebelum mengetik nomor berikutnya.
+            while self.controller.is_submitting and not self._stop_event.is_set():
+                time.sleep(0.05)
+            if self._stop_event.is_set():
+                return
+
+            self._last_number = number
+            self._last_time = time.monotonic()
+            self.controller.submit_booking_async(number)
+            self.stats.submitted += 1
+        self._submitted_callback(number, self.stats)
+
+
+__all__ = ["ContinuousScanController", "ContinuousStats"]
@@ -1,14 +1,18 @@
 """Workflow orchestration for coordinating Frista and After automation."""
 from __future__ import annotations
 
+import json
 import threading
 import time
-from typing import Callable, Dict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
 
 from automation.after import AfterClient
+from automation.app_client import AppClient
 from automation.frista import FristaClient
-from automation.utils import NetworkUnavailableError, ensure_internet_connection
+from automation.utils import NetworkUnavailableError, ensure_internet_connection, focus_tracker
 from config.loader import WorkflowSettings
+from workflow.state_store import SessionStateStore
 
 StatusCallback = Callable[[str], None]
 StateCallback = Callable[[Dict[str, bool]], None]
@@ -16,6 +20,31 @@ ErrorCallback = Callable[[str], None]
 ActionCallback = Callable[[str, bool], None]
 
 
+@dataclass
+class ScanAheadResult:
+    """Nomor yang dipindai sebelum sesi siap, beserta penghematan waktunya.
+
+    Tanpa scan-ahead pemindaian baru dimulai saat sesi siap sehingga nomor
+    terkirim pada ``ready_at + scan_duration``; dengan scan-ahead nomor
+    terkirim pada ``max(ready_at, scanned_at)``.
+    """
+
+    number: str
+    scan_started: float
+    scanned_at: float
+    ready_at: Optional[float] = None
+
+    @property
+    def scan_duration(self) -> float:
+        return self.scanned_at - self.scan_started
+
+    @property
+    def saved(self) -> float:
+        if self.ready_at is None:
+            return 0.0
+        return self.ready_at + self.scan_duration - max(self.ready_at, self.scanned_at)
+
+
 class SessionController:
     """Mengelola alur login dan input nomor BPJS untuk Frista dan After."""
 
@@ -24,13 +53,19 @@ class SessionController:
         frista: FristaClient,
         after: AfterClient,
         workflow: WorkflowSettings,
+        state_store: Optional[SessionStateStore] = None,
+        started_at: Optional[float] = None,
     ) -> None:
         self.frista = frista
         self.after = after
         self.workflow = workflow
+        self.state_store = state_store or SessionStateStore(workflow.session_state_path)
 
         self.frista_ready = False
         self.after_ready = False
+        # Detik dari helper dibuka hingga kedua aplikasi pertama kali siap menerima nomor.
+        self.started_at = time.monotonic() if started_at is None else started_at
+        self.startup_time: Optional[float] = None
 
         self._status_callback: StatusCallback = lambda message: None
         self._state_callback: StateCallback = lambda state: None
@@ -38,6 +73,11 @@ class SessionController:
         self._action_callback: ActionCallback = lambda action, success: None
 
         self._lock = threading.Lock()
+        # Hanya satu tugas yang boleh mengetik ke Frista/After pada satu waktu.
+        self._focus_lock = threading.Lock()
+        self._submitting = False
+        self._pending_booking: Optional[ScanAheadResult] = None
+        self.last_scan_ahead: Optional[ScanAheadResult] = None
 
     # Callback setters -------------------------------------------------
     def set_status_callback(self, callback: StatusCallback) -> None:
@@ -61,18 +101,87 @@ class SessionController:
         thread = threading.Thread(target=self._login_after_task, daemon=True)
         thread.start()
 
-    def submit_booking_async(self, booking_number: str) -> None:
+    def login_all_async(self) -> None:
+        """Buka Frista dan After bersamaan; pengetikan login tetap Frista lalu After.
+
+        Membuka proses tidak memerlukan fokus keyboard, sehingga waktu muat
+        After berjalan selama Frista dibuka dan login. Login After menunggu
+        hasil login Frista lalu bergiliran memakai fokus.
+        """
+
+        frista_attempt = threading.Event()
+
+        def login_frista() -> None:
+            try:
+                self._login_frista_task()
+            finally:
+                frista_attempt.set()
+
+        threading.Thread(target=login_frista, daemon=True).start()
+        threading.Thread(target=self._login_after_task, args=(frista_attempt,), daemon=True).start()
+
+    def start_session_async(self) -> None:
+        """Jalankan kedua langkah login tanpa menunggu operator (``auto_start``)."""
+
+        if self.launches_in_parallel:
+            self.login_all_async()
+            return
+
+        def login_both() -> None:
+            self._login_frista_task()
+            if self.frista_ready:
+                self._login_after_task()
+            else:
+                self._emit_action("after_login", False)
+
+        threading.Thread(target=login_both, daemon=True).start()
+
+    def restore_session_async(self) -> None:
+        """Kenali Frista/After yang sudah berjalan dan login saat helper dibuka ulang."""
+
+        thread = threading.Thread(target=self._restore_session_task, daemon=True)
+        thread.start()
+
+    def submit_booking_async(self, booking_number: str, scan_ahead: Optional[ScanAheadResult] = None) -> None:
+        with self._lock:
+            self._submitting = True
         thread = threading.Thread(
             target=self._submit_booking_task,
-            args=(booking_number,),
+            args=(booking_number, scan_ahead),
             daemon=True,
         )
         thread.start()
 
+    def queue_booking(self, booking_number: str, scan_started: Optional[float] = None) -> bool:
+        """Kirim nomor hasil pindaian, atau simpan bila Frista/After masih login.
+
+        Mengembalikan ``True`` bila nomor disimpan; nomor tersebut dikirim
+        otomatis begitu kedua aplikasi siap. Pindaian baru menggantikan
+        nomor yang masih tersimpan.
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            ready = self.frista_ready and self.after_ready
+            if not ready:
+                self._pending_booking = ScanAheadResult(
+                    number=booking_number,
+                    scan_started=now if scan_started is None else scan_started,
+                    scanned_at=now,
+                )
+        if ready:
+            self.submit_booking_async(booking_number)
+            return False
+        self._update_status(
+            f"Nomor {booking_number} tersimpan dan akan dikirim otomatis setelah Frista dan After siap."
+        )
+        return True
+
     def reset(self) -> None:
         with self._lock:
             self.frista_ready = False
             self.after_ready = False
+            self._pending_booking = None
         self._notify_state()
         self._update_status("Status direset. Silakan mulai dengan login Frista.")
         self._emit_action("reset", True)
@@ -82,8 +191,8 @@ class SessionController:
         self._update_status("Membuka aplikasi Frista...")
         try:
             self._ensure_network_connection()
-            self.frista.launch()
-            self.frista.login()
+            logged_in = self._prepare_app("frista", self.frista, "Frista")
+            self._login_app("frista", self.frista, logged_in)
         except NetworkUnavailableError as exc:
             self._handle_error(str(exc))
             self._emit_action("frista_login", False)
@@ -102,9 +211,10 @@ class SessionController:
         self._notify_state()
         self._update_status("Frista siap. Lanjutkan ke login After.")
         self._emit_action("frista_login", True)
+        self._submit_pending_booking()
 
-    def _login_after_task(self) -> None:
-        if not self.frista_ready:
+    def _login_after_task(self, frista_attempt: Optional[threading.Event] = None) -> None:
+        if frista_attempt is None and not self.frista_ready:
             self._handle_error("Frista belum siap. Selesaikan langkah pertama terlebih dahulu.")
             self._emit_action("after_login", False)
             return
@@ -112,8 +222,16 @@ class SessionController:
         self._update_status("Membuka aplikasi After...")
         try:
             self._ensure_network_connection()
-            self.after.launch()
-            self.after.login()
+            logged_in = self._prepare_app("after", self.after, "After")
+            if frista_attempt is not None:
+                frista_attempt.wait()
+                if not self.frista_ready:
+                    # Login berikutnya memakai jendela After ini, tidak membuka instance kedua.
+                    self.state_store.mark_launched("after", self.after.find_running())
+                    self._handle_error("Frista gagal login. After sudah dibuka dan dapat dilogin setelah Frista siap.")
+                    self._emit_action("after_login", False)
+                    return
+            self._login_app("after", self.after, logged_in)
         except NetworkUnavailableError as exc:
             self._handle_error(str(exc))
             self._emit_action("after_login", False)
@@ -130,10 +248,94 @@ class SessionController:
         with self._lock:
             self.after_ready = True
         self._notify_state()
-        self._update_status("After siap. Anda bisa memasukkan nomor BPJS.")
+        self._update_status("After siap. Anda bisa memasukkan nomor BPJS." + self._startup_suffix())
         self._emit_action("after_login", True)
+        self._submit_pending_booking()
+
+    def _prepare_app(self, key: str, client: AppClient, label: str) -> bool:
+        """Pakai instance yang sudah berjalan atau buka aplikasinya, tanpa mengambil fokus.
+
+        Mengembalikan ``True`` bila instance tersebut sudah login.
+        """
+
+        running = client.find_running()
+        if running is not None and not (self.workflow.attach_running or self.state_store.is_known(key, running)):
+            # attach_running = false hanya menolak instance yang dibuka sendiri oleh operator.
+            running = None
+        if running is None:
+            client.start()
+            return False
+        logged_in = client.shows_logged_in(running) or self.state_store.is_logged_in(key, running)
+        if logged_in:
+            self._update_status(f"{label} sudah berjalan dan login, memakai jendela yang ada...")
+        else:
+            self._update_status(f"{label} sudah berjalan, login tanpa membuka ulang...")
+        client.attach(running)
+        return logged_in
+
+    def _login_app(self, key: str, client: AppClient, logged_in: bool) -> None:
+        if logged_in:
+            # Tidak ada yang diketik: jangan menunggu giliran fokus atau memindahkan jendela ke depan.
+            return
+        try:
+            # Satu kali ambil fokus untuk seluruh login; langkah focus di skrip tidak berpindah jendela lagi.
+            # Pada jadwal paralel jendela aplikasi lain bisa muncul kapan saja, jadi fokus diperiksa tiap ketikan.
+            verify = self.launches_in_parallel
+            with self._focus_lock, focus_tracker.batch(client.settings.window_title, verify=verify):
+                client.login()
+        finally:
+            self._append_trace_log(client, "login")
+        self.state_store.mark_logged_in(key, client.find_running())
+
+    def _restore_session_task(self) -> None:
+        restored = []
+        # Urutan Frista lalu After sama dengan alur login biasa.
+        for key, client, label in (("frista", self.frista, "Frista"), ("after", self.after, "After")):
+            if key == "after" and not self.frista_ready:
+                break
+            try:
+                running = client.find_running()
+            except Exception:  # pragma: no cover - runtime interaction
+                running = None
+            if running is None or not (client.shows_logged_in(running) or self.state_store.is_logged_in(key, running)):
+                break
+            with self._lock:
+                if key == "frista":
+                    self.frista_ready = True
+                else:
+                    self.after_ready = True
+            restored.append(label)
+        if not restored:
+            return
+        self._notify_state()
+        if len(restored) == 2:
+            self._update_status(
+                "Frista dan After sudah login sebelumnya. Anda bisa memasukkan nomor BPJS." + self._startup_suffix()
+            )
+        else:
+            self._update_status("Frista sudah login sebelumnya. Lanjutkan ke login After.")
+        for label in restored:
+            self._emit_action(f"{label.lower()}_login", True)
+        self._submit_pending_booking()
+
+    def _submit_pending_booking(self) -> None:
+        with self._lock:
+            pending = self._pending_booking
+            if pending is None or not (self.frista_ready and self.after_ready):
+                return
+            self._pending_booking = None
+        pending.ready_at = time.monotonic()
+        self.last_scan_ahead = pending
+        self.submit_booking_async(pending.number, scan_ahead=pending)
+
+    def _submit_booking_task(self, booking_number: str, scan_ahead: Optional[ScanAheadResult] = None) -> None:
+        try:
+            self._submit_booking(booking_number, scan_ahead)
+        finally:
+            with self._lock:
+                self._submitting = False
 
-    def _submit_booking_task(self, booking_number: str) -> None:
+    def _submit_booking(self, booking_number: str, scan_ahead: Optional[ScanAheadResult] = None) -> None:
         if not self.frista_ready or not self.after_ready:
             self._handle_error("Pastikan Frista dan After sudah login sebelum memasukkan nomor BPJS.")
             self._emit_action("submit_booking", False)
@@ -142,9 +344,16 @@ class SessionController:
         self._update_status("Mengirim nomor BPJS ke Frista dan After...")
         try:
             self._ensure_network_connection()
-            self.frista.enter_booking(booking_number)
-            time.sleep(self.workflow.post_login_delay)
-            self.after.enter_booking(booking_number)
+            try:
+                with self._focus_lock:
+                    self.frista.enter_booking(booking_number)
+                    # Pindah ke After begitu layar hasil Frista terlihat; tanpa template, tunggu post_login_delay.
+                    self.frista.wait_for_booking_result(self.workflow.post_login_delay)
+                    self.after.enter_booking(booking_number)
+            finally:
+                # Ditulis setelah fokus dilepas agar tidak menunda pengetikan ke After.
+                self._append_trace_log(self.frista, "booking")
+                self._append_trace_log(self.after, "booking")
         except NetworkUnavailableError as exc:
             self._handle_error(str(exc))
             self._emit_action("submit_booking", False)
@@ -154,10 +363,57 @@ class SessionController:
             self._emit_action("submit_booking", False)
             return
 
-        self._update_status("Nomor BPJS berhasil dikirim ke kedua aplikasi.")
+        if scan_ahead is not None:
+            self._update_status(
+                "Nomor BPJS yang dipindai lebih awal berhasil dikirim ke kedua aplikasi "
+                f"(hemat {scan_ahead.saved:.1f} dtk)."
+            )
+        else:
+            self._update_status("Nomor BPJS berhasil dikirim ke kedua aplikasi.")
         self._emit_action("submit_booking", True)
 
     # Helpers ---------------------------------------------------------
+    def _startup_suffix(self) -> str:
+        """Catat waktu siap pertama sejak helper dibuka dan kembalikan teks statusnya."""
+
+        with self._lock:
+            if self.startup_time is not None or not (self.frista_ready and self.after_ready):
+                return ""
+            self.startup_time = time.monotonic() - self.started_at
+        self._append_startup_log(self.startup_time)
+        return f" (siap {self.startup_time:.1f} dtk sejak helper dibuka)"
+
+    def _append_startup_log(self, startup_time: float) -> None:
+        path = self.workflow.startup_log_path
+        if not path:
+            return
+        entry = {
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "startup_time": round(startup_time, 3),
+            "login_schedule": self.workflow.login_schedule,
+            "auto_start": self.workflow.auto_start,
+        }
+        try:
+            with open(path, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry) + "\n")
+        except OSError:
+            pass
+
+    def _append_trace_log(self, client: AppClient, flow: str) -> None:
+        """Tambahkan waktu per langkah dari eksekusi skrip terakhir dan statistik input teks ke ``trace_log_path``."""
+
+        path = self.workflow.trace_log_path
+        trace = client.last_trace
+        if not path or trace is None:
+            return
+        client.last_trace = None
+        header = f"{time.strftime('%Y-%m-%dT%H:%M:%S')} {client.app_name} {flow}"
+        try:
+            with open(path, "a", encoding="utf-8") as handle:
+                handle.write(f"{header}\n{trace.format()}\n{client.injector.stats.describe()}\n\n")
+        except OSError:
+            pass
+
     def _notify_state(self) -> None:
         state = {"frista_ready": self.frista_ready, "after_ready": self.after_ready}
         self._state_callback(state)
@@ -183,5 +439,18 @@ class SessionController:
     def is_after_ready(self) -> bool:
         return self.after_ready
 
+    @property
+    def launches_in_parallel(self) -> bool:
+        return self.workflow.login_schedule == "parallel"
+
+    @property
+    def is_submitting(self) -> bool:
+        return self._submitting
+
+    @property
+    def pending_booking(self) -> Optional[str]:
+        pending = self._pending_booking
+        return pending.number if pending is not None else None
+
 
-__all__ = ["SessionController"]
+__all__ = ["ScanAheadResult", "SessionController"]
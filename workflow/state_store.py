@@ -0,0 +1,105 @@
+"""Penyimpanan status login Frista/After agar helper bisa dibuka ulang tanpa login ulang."""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from automation.utils import RunningApp
+
+
+@dataclass
+class AppSessionRecord:
+    """Proses aplikasi yang terakhir kali dibuka atau berhasil login lewat helper."""
+
+    pid: Optional[int]
+    hwnd: Optional[int]
+    logged_in_at: float
+    # False: dibuka helper tetapi belum login (misalnya After saat login Frista gagal).
+    logged_in: bool = True
+
+    def matches(self, running: RunningApp) -> bool:
+        """Sama dengan instance yang sedang berjalan (PID lebih diutamakan dari handle jendela)."""
+
+        if self.pid is not None and running.pid is not None:
+            return self.pid == running.pid
+        return self.hwnd is not None and self.hwnd == running.hwnd
+
+
+class SessionStateStore:
+    """Berkas JSON kecil berisi :class:`AppSessionRecord` per aplikasi.
+
+    Status login hanya dipercaya selama proses yang sama masih berjalan:
+    begitu aplikasi ditutup, PID barunya tidak cocok lagi dan helper login
+    seperti biasa. ``path=None`` menonaktifkan penyimpanan.
+    """
+
+    def __init__(self, path: Optional[Path | str]) -> None:
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._records: Dict[str, AppSessionRecord] = self._load()
+
+    def is_logged_in(self, app: str, running: RunningApp) -> bool:
+        with self._lock:
+            record = self._records.get(app)
+        return record is not None and record.logged_in and record.matches(running)
+
+    def is_known(self, app: str, running: RunningApp) -> bool:
+        """Instance ini dibuka atau dilogin oleh helper, bukan dibuka sendiri oleh operator."""
+
+        with self._lock:
+            record = self._records.get(app)
+        return record is not None and record.matches(running)
+
+    def mark_logged_in(self, app: str, running: Optional[RunningApp]) -> None:
+        if running is None:
+            # Instance tidak bisa dikenali (misalnya bukan Windows); tidak ada yang bisa dicocokkan nanti.
+            self.forget(app)
+            return
+        with self._lock:
+            self._records[app] = AppSessionRecord(running.pid, running.hwnd, time.time())
+            self._save()
+
+    def mark_launched(self, app: str, running: Optional[RunningApp]) -> None:
+        """Catat instance yang sudah dibuka tetapi belum login agar dipakai lagi, bukan dibuka ulang."""
+
+        if running is None:
+            self.forget(app)
+            return
+        with self._lock:
+            self._records[app] = AppSessionRecord(running.pid, running.hwnd, time.time(), logged_in=False)
+            self._save()
+
+    def forget(self, app: str) -> None:
+        with self._lock:
+            if self._records.pop(app, None) is not None:
+                self._save()
+
+    # ------------------------------------------------------------------
+    def _load(self) -> Dict[str, AppSessionRecord]:
+        if self.path is None or not self.path.exists():
+            return {}
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            return {app: AppSessionRecord(**record) for app, record in raw.items()}
+        except (OSError, ValueError, TypeError):
+            # Berkas rusak atau format lama: anggap belum ada sesi.
+            return {}
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        data = {app: asdict(record) for app, record in self._records.items()}
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        try:
+            temporary.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            os.replace(temporary, self.path)
+        except OSError:
+            pass
+
+
+__all__ = ["AppSessionRecord", "SessionStateStore"]